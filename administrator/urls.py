@@ -38,4 +38,5 @@ urlpatterns = [
         name="admin_invites_reject",
     ),
     path("logs/", include("client.activity_logs.urls")),
+    path("emails/", include("client.outbox.urls")),
 ]
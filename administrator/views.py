@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import reverse
 from django.contrib.auth.models import Group
 
@@ -8,6 +9,8 @@ from rest_framework.permissions import IsAuthenticated
 
 from client.permissions import IsRoleAdmin
 from client.models import MyUser
+from client.outbox.sender import queue_email
+from client.reset_codes import issue_reset_code
 from administrator.permissions import IsRoleAdminOrReadOnly
 from administrator.models import Speciality, AdminInvite
 from administrator.serializers import (
@@ -16,9 +19,11 @@ from administrator.serializers import (
 )
 
 from mylib import token
-from mylib.common import MySendEmail
 
-from random import randint
+import logging
+
+
+logger = logging.getLogger(__name__)
 
 
 class ListCreateSpeciality(generics.ListCreateAPIView):
@@ -92,9 +97,9 @@ class ListCreateAdminInviteAPIView(generics.ListCreateAPIView):
 
             Good DAY.
             """
-            MySendEmail("Clinic Invite", message, [email])
-        except Exception as e:
-            print(e)
+            queue_email("Clinic Invite", message, [email])
+        except Exception:
+            logger.exception("Failed to queue the admin invite email.")
 
             # invite.status = "NOT_SENT"
             # invite.save()
@@ -175,10 +180,10 @@ class AcceptAdminInviteAPIView(APIView):
                 # Check if its a new user
                 if user.password in ["", None]:
                     # redirect to set a new password if a new user
-                    reset_code = randint(111111, 999999)
-
-                    user.reset_code = reset_code
                     user.save()
+                    reset_code = issue_reset_code(
+                        user, lifetime=settings.SETUP_CODE_LIFETIME
+                    )
 
                     try:
                         message = f"""
@@ -191,10 +196,10 @@ class AcceptAdminInviteAPIView(APIView):
                         Good DAY.
                         """
 
-                        MySendEmail("Password Reset Code", message, [email])
+                        queue_email("Password Reset Code", message, [email])
 
-                    except Exception as e:
-                        print(e)
+                    except Exception:
+                        logger.exception("Failed to queue the reset code email.")
 
                     # TODO
                     # Send Notification/Email to invited_by admin
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,11 +29,132 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['*']
 
+# True when running the test suite (python manage.py test)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 # Logging user activity
 ACTIVATE_LOGS = True
 LOG_AUTHENTICATED_USERS_ONLY = False
 IP_ADDRESS_HEADERS = ('HTTP_X_REAL_IP', 'HTTP_CLIENT_IP', 'HTTP_X_FORWARDED_FOR', 'REMOTE_ADDR')
 
+# Buffer activity logs in memory and bulk insert them from a background thread.
+# ACTIVITY_LOG_FULL_POLICY: 'drop' discards new logs when the buffer is full,
+# 'block' waits up to ACTIVITY_LOG_BLOCK_TIMEOUT seconds for space first.
+ACTIVITY_LOG_BUFFERED = not TESTING
+ACTIVITY_LOG_BUFFER_SIZE = 10000
+ACTIVITY_LOG_BATCH_SIZE = 500
+ACTIVITY_LOG_FLUSH_INTERVAL = 5
+ACTIVITY_LOG_FULL_POLICY = 'drop'
+ACTIVITY_LOG_BLOCK_TIMEOUT = 1
+
+# Coalesce user last_activity writes: skip users seen within
+# LAST_ACTIVITY_STALENESS seconds and batch the rest every flush interval.
+LAST_ACTIVITY_COALESCED = not TESTING
+LAST_ACTIVITY_STALENESS = 60
+LAST_ACTIVITY_FLUSH_INTERVAL = 30
+
+# Parsed User-Agent cache. USER_AGENT_CACHE_WARM_UP is the number of recent
+# activity logs to seed it from when the middleware loads (0 to disable).
+USER_AGENT_CACHE_SIZE = 4096
+USER_AGENT_CACHE_WARM_UP = 5000
+
+# Resolved auth tokens (with user and role) kept in memory per process.
+# Entries are dropped when the token, user or role changes, or after the TTL.
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL = 300
+
+# Signed access/refresh tokens issued at /api-token-auth/signed/, lifetimes in
+# seconds. SIGNED_TOKEN_AUTH swaps BearerAuthentication for
+# SignedTokenAuthentication, which accepts both signed and database tokens.
+SIGNED_TOKEN_AUTH = True
+ACCESS_TOKEN_LIFETIME = 60 * 5
+REFRESH_TOKEN_LIFETIME = 60 * 60 * 24 * 7
+
+# Verified Basic auth credentials are cached for BASIC_AUTH_CACHE_TTL seconds
+# under an HMAC of the username and password, so the password hash is not
+# recomputed on every request. BASIC_AUTH_ISSUE_TOKEN returns the user's API
+# token in an X-Auth-Token header, for the client to use as a Bearer token.
+BASIC_AUTH_CACHE_SIZE = 1024
+BASIC_AUTH_CACHE_TTL = 60
+BASIC_AUTH_ISSUE_TOKEN = False
+
+# API tokens stop working TOKEN_IDLE_TIMEOUT seconds after their last use or
+# TOKEN_MAX_AGE seconds after they were issued (None disables either limit).
+# Last-used times are kept in memory, written at most once per
+# TOKEN_USAGE_STALENESS seconds per token in a batch every
+# TOKEN_USAGE_FLUSH_INTERVAL seconds by a background thread (TOKEN_USAGE_AUTOFLUSH),
+# and expired tokens are swept in bulk every TOKEN_SWEEP_INTERVAL seconds.
+TOKEN_IDLE_TIMEOUT = 60 * 60 * 24 * 7
+TOKEN_MAX_AGE = 60 * 60 * 24 * 30
+TOKEN_USAGE_AUTOFLUSH = not TESTING
+TOKEN_USAGE_STALENESS = 60
+TOKEN_USAGE_FLUSH_INTERVAL = 30
+TOKEN_SWEEP_INTERVAL = 60 * 60
+
+# Password reset codes expire after RESET_CODE_LIFETIME seconds, account
+# setup codes sent with accepted invites after SETUP_CODE_LIFETIME, and a
+# code is dropped after RESET_CODE_MAX_ATTEMPTS wrong guesses for its user's
+# email, which resetting a password requires.
+RESET_CODE_LIFETIME = 60 * 60
+SETUP_CODE_LIFETIME = 60 * 60 * 24 * 7
+RESET_CODE_MAX_ATTEMPTS = 5
+
+# Outgoing email is queued in the OutboxEmail table and sent by a background
+# thread (EMAIL_OUTBOX_ASYNC) or 'manage.py send_outbox_emails'. A failed send
+# is retried up to EMAIL_OUTBOX_MAX_ATTEMPTS times in all, waiting
+# EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1) seconds, at most
+# EMAIL_OUTBOX_MAX_RETRY_DELAY, in between. An email claimed by a sender that
+# died is picked up again after EMAIL_OUTBOX_LOCK_TIMEOUT seconds. Bodies are
+# blanked once sent or failed, and those emails are deleted after
+# EMAIL_OUTBOX_RETENTION_DAYS by 'manage.py purge_outbox_emails'.
+EMAIL_OUTBOX_ASYNC = not TESTING
+EMAIL_OUTBOX_POLL_INTERVAL = 10
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+EMAIL_OUTBOX_LOCK_TIMEOUT = 60 * 10
+EMAIL_OUTBOX_RETENTION_DAYS = 30
+
+# Background activity log exports: worker threads per process and
+# seconds an export file is kept before it is garbage-collected. Files are
+# written to EXPORT_ROOT, outside MEDIA_ROOT, and only served to admins.
+EXPORT_JOBS_ASYNC = not TESTING
+EXPORT_JOB_WORKERS = 2
+EXPORT_JOB_TTL = 60 * 60 * 24
+EXPORT_ROOT = os.path.join(os.path.dirname(BASE_DIR), 'exports')
+
+# Doctor availability search: days searched when ?to= is not given, the
+# longest range one request may search, and the default and largest ?limit=
+AVAILABILITY_DEFAULT_DAYS = 7
+AVAILABILITY_MAX_DAYS = 31
+AVAILABILITY_DEFAULT_LIMIT = 10
+AVAILABILITY_MAX_LIMIT = 100
+
+# Bookable slots are kept in the SlotInstance table for this many days ahead,
+# regenerated when a doctor's schedule changes and daily by
+# 'manage.py generate_slot_inventory'. Later dates are generated on demand.
+SLOT_INVENTORY_DAYS = 60
+
+# Patients can hold a slot place for SLOT_HOLD_LIFETIME seconds before booking
+# it, at most SLOT_HOLD_MAX_PER_PATIENT at a time. Expired holds are released
+# by 'manage.py release_expired_holds', SLOT_HOLD_SWEEP_BATCH_SIZE per
+# transaction, or when their slot is found full.
+SLOT_HOLD_LIFETIME = 60 * 10
+SLOT_HOLD_MAX_PER_PATIENT = 3
+SLOT_HOLD_SWEEP_BATCH_SIZE = 500
+
+# Doctors' month calendars (capacity, bookings and holds per day) kept in
+# memory per process. Entries are dropped when the doctor's appointments, slot
+# holds or schedule change, or after the TTL.
+CALENDAR_CACHE_SIZE = 1024
+CALENDAR_CACHE_TTL = 60 * 15
+
+# Activity logs older than this many days are rolled up per hour and deleted,
+# ACTIVITY_LOG_RETENTION_BATCH_SIZE rows per transaction
+ACTIVITY_LOG_RETENTION_DAYS = 30
+ACTIVITY_LOG_RETENTION_BATCH_SIZE = 1000
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -62,6 +184,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'client.middleware.UserLoggerMiddleware',
+    'client.middleware.BasicAuthTokenMiddleware',
 ]
 
 ROOT_URLCONF = 'appointment_api.urls'
@@ -89,8 +212,9 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ('django_filters.rest_framework.DjangoFilterBackend',),
     'DEFAULT_AUTHENTICATION_CLASSES': (
         # 'rest_framework.authentication.TokenAuthentication',
-        'client.authentication.BearerAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'client.authentication.SignedTokenAuthentication' if SIGNED_TOKEN_AUTH
+        else 'client.authentication.BearerAuthentication',
+        'client.authentication.CachedBasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
 
@@ -123,6 +247,53 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = os.getenv("EMAIL_PORT")
 DEFAULT_FROM_EMAIL = os.getenv("EMAIL_HOST")
 
+# Logging
+# Records are put on a queue and written as JSON lines by a listener thread
+# (mylib.log), so request threads never wait on formatting or stdout.
+# Levels are set per app, e.g. LOG_LEVEL=WARNING to leave out the sent emails.
+LOG_LEVEL = 'WARNING' if TESTING else os.getenv('LOG_LEVEL', 'INFO')
+# Tests make 4xx responses on purpose, which django.request logs as warnings
+DJANGO_LOG_LEVEL = 'ERROR' if TESTING else os.getenv('DJANGO_LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'mylib.log.JSONFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+        'queue': {
+            'class': 'mylib.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue'],
+            'level': DJANGO_LOG_LEVEL,
+            'propagate': False,
+        },
+        **{
+            name: {
+                'handlers': ['queue'],
+                'level': LOG_LEVEL,
+                'propagate': False,
+            }
+            for name in ('administrator', 'client', 'clinic', 'mylib')
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -3,9 +3,13 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.conf.urls.static import static
 from django.conf import settings
 
-from rest_framework.authtoken import views
 from rest_framework.schemas import get_schema_view
 
+from client.views import (
+    ObtainExpiringAuthTokenAPIView, RotateAuthTokenAPIView, ObtainSignedTokenAPIView,
+    RefreshSignedTokenAPIView, RevokeSignedTokenAPIView
+)
+
 
 schema_view = get_schema_view(
     title='Clinic Appointment APIs',
@@ -29,7 +33,17 @@ apiversions_urlsparterns = [
 
 urlpatterns = [
     path('apiauth/', include('rest_framework.urls')),
-    path('api-token-auth/', views.obtain_auth_token, name="api-token"),
+    path('api-token-auth/', ObtainExpiringAuthTokenAPIView.as_view(), name="api-token"),
+    path('api-token-auth/rotate/', RotateAuthTokenAPIView.as_view(), name="api-token-rotate"),
+    path('api-token-auth/signed/', ObtainSignedTokenAPIView.as_view(), name="api-token-signed"),
+    path(
+        'api-token-auth/signed/refresh/', RefreshSignedTokenAPIView.as_view(),
+        name="api-token-signed-refresh"
+    ),
+    path(
+        'api-token-auth/signed/revoke/', RevokeSignedTokenAPIView.as_view(),
+        name="api-token-signed-revoke"
+    ),
     path('api/', include(apiversions_urlsparterns)),
     path('', schema_view),
 ]
@@ -0,0 +1,127 @@
+from django.conf import settings
+from django.db import DatabaseError
+
+from client.models import ActivityLog
+from mylib.flusher import PeriodicFlusher
+
+import logging
+import queue
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+FULL_POLICIES = ("drop", "block")
+
+
+class ActivityLogBuffer(PeriodicFlusher):
+    """
+    Collects unsaved ActivityLog rows in a bounded queue and writes them
+    with bulk_create from a background thread, either when BATCH_SIZE
+    rows are waiting or every FLUSH_INTERVAL seconds.
+
+    When the queue is full new logs are dropped ('drop') or the caller
+    waits up to block_timeout seconds for space ('block').
+    """
+
+    thread_name = "activity-log-buffer"
+
+    def __init__(
+        self,
+        max_size=10000,
+        batch_size=500,
+        flush_interval=5,
+        full_policy="drop",
+        block_timeout=1,
+    ):
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(
+                f"Invalid full_policy '{full_policy}'. Choose one of {FULL_POLICIES}."
+            )
+
+        super().__init__(flush_interval=flush_interval)
+
+        self.batch_size = batch_size
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._flush_lock = threading.Lock()
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def put(self, log):
+        """
+        Queue an unsaved ActivityLog. Returns False if it was dropped.
+        """
+        try:
+            if self.full_policy == "block":
+                self._queue.put(log, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(log)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        if self._queue.qsize() >= self.batch_size:
+            self.wakeup()
+
+        return True
+
+    def flush(self):
+        """
+        Write every queued log in batches of batch_size.
+        Returns the number of rows written.
+        """
+        written = 0
+
+        with self._flush_lock:
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    break
+
+                try:
+                    ActivityLog.objects.bulk_create(batch)
+                    written += len(batch)
+                except DatabaseError:
+                    logger.exception("Failed to write %s activity logs.", len(batch))
+
+        return written
+
+    def _take(self, count):
+        batch = []
+        while len(batch) < count:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_activity_log_buffer():
+    """
+    Return the process-wide buffer configured from settings,
+    starting its background thread on first use.
+    """
+    global _buffer
+
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ActivityLogBuffer(
+                    max_size=settings.ACTIVITY_LOG_BUFFER_SIZE,
+                    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+                    flush_interval=settings.ACTIVITY_LOG_FLUSH_INTERVAL,
+                    full_policy=settings.ACTIVITY_LOG_FULL_POLICY,
+                    block_timeout=settings.ACTIVITY_LOG_BLOCK_TIMEOUT,
+                )
+                _buffer.start()
+
+    return _buffer
@@ -0,0 +1,24 @@
+from mylib.cache import LRUCache
+
+
+class DimensionCache(object):
+    """
+    In-memory map of device, browser or os strings to the id of their
+    lookup table row, creating the row the first time a string is seen.
+    """
+
+    def __init__(self, model, max_size=4096):
+        self.model = model
+        self.max_length = model._meta.get_field("name").max_length
+        self.cache = LRUCache(max_size=max_size)
+
+    def get_id(self, name):
+        if not name:
+            return None
+
+        name = name[: self.max_length]
+        return self.cache.get_or_set(name, lambda: self._fetch_id(name))
+
+    def _fetch_id(self, name):
+        obj, created = self.model.objects.get_or_create(name=name)
+        return obj.id
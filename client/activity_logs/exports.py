@@ -0,0 +1,145 @@
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.utils import timezone
+
+from client.models import ActivityLog, ExportJob
+from client.activity_logs.filters import LogsFilter
+from mylib.queryset2excel import streamcsv, exportxlsx
+
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
+import json
+import logging
+import tempfile
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+# (Header, values_list lookup) of each exported column
+EXPORT_COLUMNS = (
+    ("Id", "id"),
+    ("User", "user__username"),
+    ("Request Url", "request_url"),
+    ("Request Method", "request_method"),
+    ("Response Code", "response_code"),
+    ("Datetime", "datetime"),
+    ("Device", "device__name"),
+    ("Browser", "browser__name"),
+    ("Os", "os__name"),
+    ("Extra Data", "extra_data"),
+    ("Ip Address", "ip_address"),
+)
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+CHUNK_SIZE = 2000
+
+
+def get_export_headers():
+    return [{"name": name, "value": value} for name, value in EXPORT_COLUMNS]
+
+
+def run_export_job(job_id):
+    """
+    Produce the export file of a pending job from its LogsFilter parameters.
+    """
+    job = ExportJob.objects.get(id=job_id)
+    job.status = "RUNNING"
+    job.date_started = timezone.now()
+    job.save(update_fields=["status", "date_started"])
+
+    try:
+        filters = json.loads(job.filters or "{}")
+        queryset = LogsFilter(filters, queryset=ActivityLog.objects.all()).qs
+        headers = get_export_headers()
+        filename = f"user_logs_{job.id}.{job.export_format}"
+
+        if job.export_format == "xlsx":
+            output = exportxlsx(
+                headers=headers,
+                title="User Logs",
+                queryset=queryset,
+                chunk_size=CHUNK_SIZE,
+            )
+        else:
+            output = tempfile.TemporaryFile(mode="w+b")
+            for line in streamcsv(
+                headers=headers, queryset=queryset, chunk_size=CHUNK_SIZE
+            ):
+                output.write(line.encode("utf-8"))
+            output.seek(0)
+
+        with output:
+            job.file.save(filename, File(output), save=False)
+
+        job.rows = queryset.count()
+        job.status = "COMPLETED"
+        job.expires_at = timezone.now() + dt.timedelta(seconds=settings.EXPORT_JOB_TTL)
+    except Exception as e:
+        logger.exception("Export job %s failed.", job.id)
+        job.status = "FAILED"
+        job.error = str(e)[:500]
+
+    job.date_finished = timezone.now()
+    job.save()
+
+    return job
+
+
+def purge_expired_export_jobs(now=None):
+    """
+    Delete expired export jobs and their files.
+    Returns the number of jobs deleted.
+    """
+    now = now or timezone.now()
+    jobs = ExportJob.objects.filter(expires_at__lt=now)
+
+    deleted = 0
+    for job in jobs.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        deleted += 1
+
+    return deleted
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.EXPORT_JOB_WORKERS,
+                    thread_name_prefix="export-job",
+                )
+
+    return _executor
+
+
+def _run_in_worker(job_id):
+    try:
+        run_export_job(job_id)
+        purge_expired_export_jobs()
+    finally:
+        # Worker threads own their connections, close them between jobs
+        connection.close()
+
+
+def submit_export_job(job):
+    """
+    Queue the job on the export worker pool once the job row is committed,
+    or run it inline when EXPORT_JOBS_ASYNC is off.
+    """
+    if not settings.EXPORT_JOBS_ASYNC:
+        return run_export_job(job.id)
+
+    transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job.id))
+    return job
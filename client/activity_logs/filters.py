@@ -7,6 +7,9 @@ from client.models import ActivityLog
 
 class LogsFilter(FilterSet):
     search = django_filters.CharFilter(label="Search", method="filter_name")
+    device = django_filters.CharFilter(field_name="device__name")
+    browser = django_filters.CharFilter(field_name="browser__name")
+    os = django_filters.CharFilter(field_name="os__name")
 
     class Meta:
         model = ActivityLog
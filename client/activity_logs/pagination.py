@@ -0,0 +1,9 @@
+from mylib.pagination import KeysetPagination
+
+
+class ActivityLogPagination(KeysetPagination):
+    ordering = ("-datetime", "-id")
+
+
+class ActivityLogRollupPagination(KeysetPagination):
+    ordering = ("-hour", "-id")
@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.utils import timezone
+
+from client.models import ActivityLog, ActivityLogRollup
+
+from collections import Counter
+import datetime as dt
+import json
+
+
+def get_resource(extra_data):
+    try:
+        return json.loads(extra_data).get("resources", None)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def rollup_batch(rows):
+    """
+    Add the counts of a batch of (datetime, user_id, method, code, extra_data)
+    rows to the hourly rollups.
+    """
+    counts = Counter(
+        (
+            created.replace(minute=0, second=0, microsecond=0),
+            user_id,
+            get_resource(extra_data),
+            method,
+            code,
+        )
+        for created, user_id, method, code, extra_data in rows
+    )
+
+    existing = {
+        (r.hour, r.user_id, r.resource, r.request_method, r.response_code): r
+        for r in ActivityLogRollup.objects.filter(hour__in={key[0] for key in counts})
+    }
+
+    new_rollups = []
+    updated_rollups = []
+    for key, count in counts.items():
+        if key in existing:
+            existing[key].count += count
+            updated_rollups.append(existing[key])
+        else:
+            hour, user_id, resource, method, code = key
+            new_rollups.append(
+                ActivityLogRollup(
+                    hour=hour,
+                    user_id=user_id,
+                    resource=resource,
+                    request_method=method,
+                    response_code=code,
+                    count=count,
+                )
+            )
+
+    ActivityLogRollup.objects.bulk_update(updated_rollups, ["count"])
+    ActivityLogRollup.objects.bulk_create(new_rollups)
+
+
+def rollup_activity_logs(days=30, batch_size=1000, now=None):
+    """
+    Roll activity logs older than `days` into hourly ActivityLogRollup rows
+    and delete them, batch_size rows per transaction so no single write
+    holds the table for long.
+    Returns the number of raw logs deleted.
+    """
+    cutoff = (now or timezone.now()) - dt.timedelta(days=days)
+    old_logs = ActivityLog.objects.filter(datetime__lt=cutoff).order_by("id")
+
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                old_logs.values_list(
+                    "id",
+                    "datetime",
+                    "user_id",
+                    "request_method",
+                    "response_code",
+                    "extra_data",
+                )[:batch_size]
+            )
+            if not batch:
+                break
+
+            rollup_batch([row[1:] for row in batch])
+            ActivityLog.objects.filter(id__in=[row[0] for row in batch]).delete()
+
+        deleted += len(batch)
+
+    return deleted
@@ -1,20 +1,60 @@
+from django.urls import reverse
+
 from rest_framework import serializers
 
-from client.models import ActivityLog
+from client.models import ActivityLog, ActivityLogRollup, ExportJob
 from client.serializers import MyUserSerializer
 
+import json
+
 
 class ActivityLogSerializer(serializers.ModelSerializer):
     user = MyUserSerializer(read_only=True)
+    device = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    browser = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    os = serializers.SlugRelatedField(slug_field="name", read_only=True)
 
     class Meta:
         model = ActivityLog
-        fields = ("__all__")
+        exclude = ("user_agent_hash",)
 
 
 class ExportActivityLogSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
+    device = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    browser = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    os = serializers.SlugRelatedField(slug_field="name", read_only=True)
 
     class Meta:
         model = ActivityLog
-        fields = ("__all__")
+        exclude = ("user_agent_hash",)
+
+
+class ActivityLogRollupSerializer(serializers.ModelSerializer):
+    user = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = ActivityLogRollup
+        fields = "__all__"
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    user = serializers.StringRelatedField(read_only=True)
+    filters = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        exclude = ("file",)
+
+    def get_filters(self, obj):
+        return json.loads(obj.filters or "{}")
+
+    def get_download_url(self, obj):
+        if obj.status != "COMPLETED" or not obj.file:
+            return None
+
+        url = reverse("activity_log_export_job_download", args=(obj.id,))
+        request = self.context.get("request", None)
+
+        return request.build_absolute_uri(url) if request else url
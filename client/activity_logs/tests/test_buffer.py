@@ -0,0 +1,63 @@
+from django.test import TestCase
+
+from client.models import ActivityLog
+from client.activity_logs.buffer import ActivityLogBuffer
+
+
+def make_log(code="200"):
+    return ActivityLog(
+        request_url="http://testserver/api/v1/users/",
+        request_method="GET",
+        response_code=code,
+    )
+
+
+class ActivityLogBufferTests(TestCase):
+    def test_flush_writes_queued_logs(self):
+        """
+        Ensure queued logs are only written on flush,
+        in batches, and the buffer is emptied.
+        """
+        buffer = ActivityLogBuffer(max_size=10, batch_size=2)
+
+        for x in range(5):
+            self.assertTrue(buffer.put(make_log()))
+
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(len(buffer), 5)
+
+        self.assertEqual(buffer.flush(), 5)
+        self.assertEqual(ActivityLog.objects.count(), 5)
+        self.assertEqual(len(buffer), 0)
+
+    def test_full_buffer_drops_logs(self):
+        """
+        Ensure logs are dropped and counted once the buffer is full
+        """
+        for policy in ["drop", "block"]:
+            buffer = ActivityLogBuffer(
+                max_size=2, batch_size=2, full_policy=policy, block_timeout=0.01
+            )
+
+            self.assertTrue(buffer.put(make_log()))
+            self.assertTrue(buffer.put(make_log()))
+            self.assertFalse(buffer.put(make_log()))
+            self.assertEqual(buffer.dropped, 1)
+            self.assertEqual(len(buffer), 2)
+
+        with self.assertRaises(ValueError):
+            ActivityLogBuffer(full_policy="ignore")
+
+    def test_close_flushes_remaining_logs(self):
+        """
+        Ensure closing the buffer writes the logs still queued
+        """
+        buffer = ActivityLogBuffer(max_size=10, batch_size=5)
+        buffer.put(make_log("201"))
+        buffer.put(make_log("404"))
+
+        self.assertEqual(buffer.close(), 2)
+        self.assertEqual(
+            sorted(ActivityLog.objects.values_list("response_code", flat=True)),
+            ["201", "404"],
+        )
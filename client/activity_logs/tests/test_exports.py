@@ -0,0 +1,111 @@
+from django.urls import reverse
+from django.contrib.auth.models import Group
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from client.models import MyUser, ActivityLog, ExportJob
+from client.activity_logs.exports import purge_expired_export_jobs
+
+import datetime as dt
+import shutil
+import tempfile
+
+
+EXPORT_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(EXPORT_ROOT=EXPORT_ROOT, EXPORT_JOBS_ASYNC=False)
+class ExportJobViewTests(APITestCase):
+    def setUp(self):
+        """
+        Create roles and users Objects to be used
+        through-out this Export Jobs Tests Case.
+        """
+        admin_role, created = Group.objects.get_or_create(name="ADMIN")
+        patient_role, created = Group.objects.get_or_create(name="PATIENT")
+
+        for username, role in [("adminuser1", admin_role), ("p.user1", patient_role)]:
+            user = MyUser.objects.create(
+                role=role,
+                phone="0712345678",
+                verified=True,
+                email=f"{username}@myapp.com",
+                password="Pass1234",
+                username=username,
+            )
+            user.set_password(user.password)
+            user.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(EXPORT_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_create_and_download_export_job(self):
+        """
+        Ensure an admin can queue an export, poll it and download the file,
+        and non-admin users cannot
+        """
+        url = reverse("activity_log_export")
+
+        self.client.login(username="p.user1", password="Pass1234")
+        response = self.client.post(url, {"format": "csv"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(ExportJob.objects.count(), 0)
+        self.client.logout()
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.post(
+            url, {"format": "csv", "search": "p.user1"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json()["filters"], {"search": "p.user1"})
+
+        job_url = reverse("activity_log_export_job", args=(response.json()["id"],))
+        response = self.client.get(job_url, format="json")
+        self.assertEqual(response.json()["status"], "COMPLETED")
+        self.assertEqual(
+            response.json()["rows"],
+            ActivityLog.objects.filter(user__username="p.user1").count(),
+        )
+
+        job_id = response.json()["id"]
+        response = self.client.get(response.json()["download_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(f"user_logs_{job_id}.csv", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        self.assertTrue(content.startswith("Id,User,Request Url"))
+
+        # Stored outside MEDIA_ROOT under a random name
+        path = ExportJob.objects.get(id=job_id).file.path
+        self.assertTrue(path.startswith(EXPORT_ROOT))
+        self.assertNotIn(f"user_logs_{job_id}", path)
+
+        response = self.client.post(url, {"format": "pdf"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
+
+    def test_purge_expired_export_jobs(self):
+        """
+        Ensure expired jobs and their files are deleted
+        """
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.post(
+            reverse("activity_log_export"), {"format": "xlsx"}, format="json"
+        )
+        self.client.logout()
+
+        job = ExportJob.objects.get(id=response.json()["id"])
+        storage, name = job.file.storage, job.file.name
+        self.assertTrue(storage.exists(name))
+
+        self.assertEqual(purge_expired_export_jobs(), 0)
+        self.assertEqual(
+            purge_expired_export_jobs(now=job.expires_at + dt.timedelta(seconds=1)), 1
+        )
+        self.assertFalse(ExportJob.objects.filter(id=job.id).exists())
+        self.assertFalse(storage.exists(name))
+        self.assertLess(job.expires_at, timezone.now() + dt.timedelta(days=2))
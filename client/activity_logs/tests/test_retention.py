@@ -0,0 +1,94 @@
+from django.urls import reverse
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from client.models import MyUser, ActivityLog, ActivityLogRollup
+from client.activity_logs.retention import rollup_activity_logs
+
+from io import StringIO
+import datetime as dt
+import json
+
+
+class ActivityLogRetentionTests(APITestCase):
+    def setUp(self):
+        """
+        Create a user and a mix of old and recent activity logs
+        to be used through-out this Retention Tests Case.
+        """
+        admin_role, created = Group.objects.get_or_create(name="ADMIN")
+        self.user = MyUser.objects.create(
+            role=admin_role,
+            phone="0712345678",
+            verified=True,
+            email="adminuser1@myapp.com",
+            password="Pass1234",
+            username="adminuser1",
+        )
+        self.user.set_password(self.user.password)
+        self.user.save()
+        ActivityLog.objects.all().delete()
+
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        self.old = self.now - dt.timedelta(days=40)
+        self.create_logs(5, self.old, "doctors")
+        self.create_logs(2, self.old, "patients")
+        self.create_logs(3, self.now, "doctors")
+
+    def create_logs(self, count, datetime, resources):
+        for _ in range(count):
+            ActivityLog.objects.create(
+                user=self.user,
+                datetime=datetime,
+                request_url=f"/api/v1/{resources}/",
+                request_method="GET",
+                response_code=200,
+                extra_data=json.dumps({"resources": resources}),
+            )
+
+    def test_rollup_activity_logs(self):
+        """
+        Ensure old logs are counted into hourly rollups and deleted in batches,
+        recent logs are kept and re-runs merge into the same rollups
+        """
+        self.assertEqual(rollup_activity_logs(days=30, batch_size=3, now=self.now), 7)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertFalse(ActivityLog.objects.filter(datetime__lt=self.now).exists())
+
+        hour = self.old.replace(minute=0)
+        counts = dict(
+            ActivityLogRollup.objects.filter(hour=hour).values_list("resource", "count")
+        )
+        self.assertEqual(counts, {"doctors": 5, "patients": 2})
+
+        self.create_logs(4, self.old, "doctors")
+        call_command("rollup_activity_logs", days=0, stdout=StringIO())
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(
+            ActivityLogRollup.objects.get(hour=hour, resource="doctors").count, 9
+        )
+        self.assertEqual(
+            ActivityLogRollup.objects.filter(hour=self.now.replace(minute=0))
+            .get()
+            .count,
+            3,
+        )
+
+    def test_list_activity_log_rollups(self):
+        """
+        Ensure admins can list the rollups
+        """
+        rollup_activity_logs(days=30, now=self.now)
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.get(
+            reverse("activity_log_rollup_list"), {"resource": "doctors"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertEqual(response.json()["results"][0]["count"], 5)
+        self.assertEqual(response.json()["results"][0]["user"], "adminuser1")
@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from client.models import ActivityLog, Device, Browser, OperatingSystem
+from client.activity_logs.ua_cache import UserAgentCache, get_user_agent_hash
+
+
+CHROME_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36"
+)
+
+
+class UserAgentCacheTests(TestCase):
+    def test_parse_is_cached(self):
+        """
+        Ensure a user agent is parsed once and then served from the cache
+        """
+        ua_cache = UserAgentCache(max_size=10)
+
+        parsed = ua_cache.parse(CHROME_UA)
+        self.assertEqual(parsed["device"], "PC / Windows 10 / Chrome 90.0.4430")
+        self.assertEqual(parsed["hash"], get_user_agent_hash(CHROME_UA))
+        self.assertEqual(ua_cache.cache.info()["misses"], 1)
+
+        self.assertEqual(ua_cache.parse(CHROME_UA), parsed)
+        self.assertEqual(ua_cache.cache.info()["hits"], 1)
+        self.assertEqual(len(ua_cache.cache), 1)
+
+    def test_warm_up_from_activity_logs(self):
+        """
+        Ensure warm up loads parsed user agents from recent logs, only once
+        """
+        ua_hash = get_user_agent_hash(CHROME_UA)
+        ActivityLog.objects.create(
+            request_url="http://testserver/api/v1/users/",
+            request_method="GET",
+            response_code="200",
+            os=OperatingSystem.objects.create(name="Windows"),
+            browser=Browser.objects.create(name="Chrome"),
+            device=Device.objects.create(name="PC / Windows 10 / Chrome 90.0.4430"),
+            user_agent_hash=ua_hash,
+        )
+
+        ua_cache = UserAgentCache(max_size=10)
+        self.assertEqual(ua_cache.warm_up(), 1)
+        self.assertEqual(ua_cache.warm_up(), 0)
+
+        self.assertEqual(ua_cache.parse(CHROME_UA)["browser"], "Chrome")
+        self.assertEqual(ua_cache.cache.info()["hits"], 1)
+        self.assertEqual(ua_cache.cache.info()["misses"], 0)
@@ -1,11 +1,19 @@
 from django.urls import reverse
 from django.contrib.auth.models import Group
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from client.models import MyUser, ActivityLog
 
+from base64 import urlsafe_b64encode
+import csv
+import datetime as dt
+import io
+import json
+import openpyxl
+
 
 class ListExportActivityLogsViewTests(APITestCase):
     def setUp(self):
@@ -82,6 +90,88 @@ class ListExportActivityLogsViewTests(APITestCase):
         self.assertEqual(len(response.json()["results"]), logs_count)
         self.client.logout()
 
+    def test_list_activity_logs_dimensions(self):
+        """
+        Ensure device, browser and os are listed and filtered as strings
+        """
+        url = reverse("activity_log_list")
+        user_agent = (
+            "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0"
+        )
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        self.client.get(url, format="json", HTTP_USER_AGENT=user_agent)
+
+        log = ActivityLog.objects.last()
+        self.assertEqual(log.device.name, "PC / Linux / Firefox 115.0")
+
+        response = self.client.get(
+            url, {"device": "PC / Linux / Firefox 115.0"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["id"], log.id)
+        self.assertEqual(
+            response.json()["results"][0]["device"], "PC / Linux / Firefox 115.0"
+        )
+        self.assertEqual(response.json()["results"][0]["browser"], log.browser.name)
+        self.assertEqual(response.json()["results"][0]["os"], log.os.name)
+
+        response = self.client.get(url, {"device": "Unknown"}, format="json")
+        self.assertEqual(len(response.json()["results"]), 0)
+        self.client.logout()
+
+    def test_list_activity_logs_cursor_pagination(self):
+        """
+        Ensure activity logs are paged newest first by (datetime, id) cursors,
+        forwards and backwards, without skipping rows that share a datetime
+        """
+        url = reverse("activity_log_list")
+        user = MyUser.objects.get(username="p.user1")
+        now = timezone.now()
+        for i in range(25):
+            ActivityLog.objects.create(
+                user=user,
+                datetime=now - dt.timedelta(minutes=i // 3),
+                request_url="/api/v1/",
+                request_method="GET",
+                response_code=200,
+            )
+        expected = list(
+            ActivityLog.objects.filter(user=user)
+            .order_by("-datetime", "-id")
+            .values_list("id", flat=True)
+        )
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.get(url, {"user": user.id, "page_size": 10})
+        self.assertNotIn("count", response.json())
+        self.assertIsNone(response.json()["previous"])
+
+        pages = [[log["id"] for log in response.json()["results"]]]
+        while response.json()["next"]:
+            response = self.client.get(response.json()["next"])
+            pages.append([log["id"] for log in response.json()["results"]])
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), expected)
+
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual([log["id"] for log in response.json()["results"]], pages[1])
+        response = self.client.get(response.json()["previous"])
+        self.assertEqual([log["id"] for log in response.json()["results"]], pages[0])
+        self.assertIsNone(response.json()["previous"])
+
+        for cursor in [
+            "invalid",
+            {"position": ["garbage", "1"]},
+            {"position": [None, "1"]},
+            {"position": "ab"},
+        ]:
+            if isinstance(cursor, dict):
+                cursor = urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.logout()
+
     def test_export_activity_logs(self):
         """
         Ensure Admin user can list activity logs,
@@ -113,3 +203,54 @@ class ListExportActivityLogsViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.headers["Content-Type"], "application/vnd.ms-excel")
         self.client.logout()
+
+    def test_export_activity_logs_csv_rows(self):
+        """
+        Ensure the export streams a header and one CSV row per filtered log
+        """
+        url = reverse("activity_log_export")
+
+        self.client.login(username="p.user1", password="Pass1234")
+        self.client.get(reverse("users_list"), format="json")
+        self.client.logout()
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.get(url, {"search": "p.user1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = list(
+            csv.reader(io.StringIO(b"".join(response.streaming_content).decode()))
+        )
+        logs = ActivityLog.objects.filter(user__username="p.user1")
+
+        self.assertEqual(rows[0][:3], ["Id", "User", "Request Url"])
+        self.assertEqual(len(rows), logs.count() + 1)
+        self.assertEqual(rows[1][0], str(logs.first().id))
+        self.assertEqual(rows[1][1], "p.user1")
+        self.client.logout()
+
+    def test_export_activity_logs_xlsx(self):
+        """
+        Ensure ?format=xlsx returns a workbook with a header and one row per log,
+        and an unknown format is rejected
+        """
+        url = reverse("activity_log_export")
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        self.client.get(reverse("users_list"), format="json")
+        logs_count = ActivityLog.objects.count()
+
+        response = self.client.get(url, {"format": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(".xlsx", response.headers["Content-Disposition"])
+
+        workbook = openpyxl.load_workbook(
+            io.BytesIO(b"".join(response.streaming_content))
+        )
+        rows = list(workbook["User Logs"].values)
+        self.assertEqual(rows[0][:2], ("Id", "User"))
+        self.assertEqual(len(rows), logs_count + 1)
+
+        response = self.client.get(url, {"format": "pdf"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import DatabaseError
+
+from user_agents import parse
+
+from client.models import ActivityLog
+from mylib.cache import LRUCache
+
+from hashlib import md5
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_user_agent_hash(ua_string):
+    return md5(ua_string.encode("utf-8")).hexdigest()
+
+
+class UserAgentCache(object):
+    """
+    Bounded LRU of parsed User-Agent strings keyed by their MD5 hash,
+    so ua-parser's regex cascade only runs once per distinct agent.
+    """
+
+    def __init__(self, max_size=4096):
+        self.cache = LRUCache(max_size=max_size)
+        self._warmed_up = False
+        self._warm_up_lock = threading.Lock()
+
+    def parse(self, ua_string):
+        """
+        Return the os, browser and device strings logged for ua_string,
+        plus the hash they are cached under.
+        """
+        ua_hash = get_user_agent_hash(ua_string or "")
+        return self.cache.get_or_set(ua_hash, lambda: self._parse(ua_string, ua_hash))
+
+    def warm_up(self, limit=5000):
+        """
+        Seed the cache from the most recent activity logs.
+        Only the first call per process does any work.
+        Returns the number of user agents loaded.
+        """
+        with self._warm_up_lock:
+            if self._warmed_up:
+                return 0
+            self._warmed_up = True
+
+        rows = (
+            ActivityLog.objects.exclude(user_agent_hash=None)
+            .order_by("-id")
+            .values_list(
+                "user_agent_hash", "os__name", "browser__name", "device__name"
+            )[:limit]
+        )
+
+        loaded = 0
+        try:
+            for ua_hash, os, browser, device in rows:
+                if ua_hash not in self.cache:
+                    self.cache.set(
+                        ua_hash,
+                        {
+                            "os": os,
+                            "browser": browser,
+                            "device": device,
+                            "hash": ua_hash,
+                        },
+                    )
+                    loaded += 1
+        except DatabaseError:
+            logger.exception("Failed to warm up the user agent cache.")
+
+        return loaded
+
+    def _parse(self, ua_string, ua_hash):
+        user_agent = parse(ua_string or "")
+        return {
+            "os": str(user_agent.os),
+            "browser": str(user_agent.browser),
+            "device": str(user_agent),
+            "hash": ua_hash,
+        }
+
+
+user_agent_cache = UserAgentCache(max_size=settings.USER_AGENT_CACHE_SIZE)
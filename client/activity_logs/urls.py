@@ -1,8 +1,16 @@
 from django.urls import path
 
-from client.activity_logs.views import ListActivityLogs, ExportActivityLogs
+from client.activity_logs.views import (
+    ListActivityLogs, ListActivityLogRollups, ExportActivityLogs, ListExportJobs, RetrieveDestroyExportJob, DownloadExportJob
+)
 
 urlpatterns = [
     path('', ListActivityLogs.as_view(), name="activity_log_list"),
+    path('rollups/', ListActivityLogRollups.as_view(), name="activity_log_rollup_list"),
     path('export/', ExportActivityLogs.as_view(), name="activity_log_export"),
+    path('export/jobs/', ListExportJobs.as_view(), name="activity_log_export_job_list"),
+    path('export/jobs/<int:pk>/', RetrieveDestroyExportJob.as_view(), name="activity_log_export_job"),
+    path(
+        'export/jobs/<int:pk>/download/', DownloadExportJob.as_view(), name="activity_log_export_job_download"
+    ),
 ]
@@ -1,61 +1,169 @@
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 
 from rest_framework import generics, status
-from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from client.permissions import IsRoleAdmin
+from client.activity_logs.exports import (
+    CHUNK_SIZE,
+    EXPORT_FORMATS,
+    get_export_headers,
+    submit_export_job,
+)
 from client.activity_logs.filters import LogsFilter
+from client.activity_logs.pagination import (
+    ActivityLogPagination,
+    ActivityLogRollupPagination,
+)
 from client.activity_logs.serializers import (
     ActivityLogSerializer,
+    ActivityLogRollupSerializer,
     ExportActivityLogSerializer,
+    ExportJobSerializer,
 )
-from client.models import ActivityLog
-from mylib.queryset2excel import exportcsv
+from client.models import ActivityLog, ActivityLogRollup, ExportJob
+from mylib.common import MyCustomException
+from mylib.queryset2excel import streamcsv, exportxlsx
+
+import json
+
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def get_export_format(value):
+    export_format = str(value).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise MyCustomException(
+            f"Error: Invalid format. Choose one of {', '.join(EXPORT_FORMATS)}."
+        )
+    return export_format
 
 
 class ListActivityLogs(generics.ListAPIView):
-    queryset = ActivityLog.objects.all().select_related("user")
+    queryset = ActivityLog.objects.all().select_related(
+        "user", "device", "browser", "os"
+    )
     serializer_class = ActivityLogSerializer
-    filter_class = LogsFilter
+    filterset_class = LogsFilter
+    pagination_class = ActivityLogPagination
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
+
+
+class ListActivityLogRollups(generics.ListAPIView):
+    """
+    Hourly activity counts kept after old logs are deleted.
+    """
+
+    queryset = ActivityLogRollup.objects.all().select_related("user")
+    serializer_class = ActivityLogRollupSerializer
+    filterset_fields = ("user", "resource", "request_method", "response_code")
+    pagination_class = ActivityLogRollupPagination
     permission_classes = [IsAuthenticated, IsRoleAdmin]
 
 
 class ExportActivityLogs(generics.ListAPIView):
-    queryset = ActivityLog.objects.all().select_related("user")
+    """
+    GET streams the filtered logs as CSV or XLSX.
+    POST queues the same export as a background ExportJob.
+    """
+
+    queryset = ActivityLog.objects.all()
     serializer_class = ExportActivityLogSerializer
-    filter_class = LogsFilter
+    filterset_class = LogsFilter
     permission_classes = [IsAuthenticated, IsRoleAdmin]
 
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export file type, not a renderer, so fall back
+        # to the default renderer (for error responses) instead of a 404
+        return super().perform_content_negotiation(request, force=True)
+
     def list(self, request, *args, **kwargs):
         filename = "user_logs"
-        fields = [s.name for s in self.get_queryset().model._meta.fields]
-        headers = [
-            {"name": "%s" % (k.replace("_", " ").title()), "value": k} for k in fields
-        ]
-        queryset = self.get_serializer(self.get_queryset(), many=True).data
-        path = exportcsv(
-            filename=filename,
-            queryset=queryset,
-            headers=headers,
-            title="User Logs",
-            export_csv=True,
-            request=self.request,
+        export_format = get_export_format(request.query_params.get("format", "csv"))
+        headers = get_export_headers()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if export_format == "xlsx":
+            output = exportxlsx(
+                headers=headers,
+                title="User Logs",
+                queryset=queryset,
+                chunk_size=CHUNK_SIZE,
+            )
+            # FileResponse closes, and so deletes, the spooled file once sent
+            return FileResponse(
+                output,
+                as_attachment=True,
+                filename=f"{filename}.xlsx",
+                content_type=XLSX_CONTENT_TYPE,
+            )
+
+        response = StreamingHttpResponse(
+            streamcsv(headers=headers, queryset=queryset, chunk_size=CHUNK_SIZE),
+            content_type="application/vnd.ms-excel",
         )
+        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
 
-        try:
-            with open(path, "r") as f:
-                file_data = f.read()
+        return response
+
+    def post(self, request, *args, **kwargs):
+        params = request.query_params.dict()
+        params.update(
+            request.data.dict() if hasattr(request.data, "dict") else request.data
+        )
+        export_format = get_export_format(params.get("format", "csv"))
+
+        filters = {k: v for k, v in params.items() if k in LogsFilter.base_filters}
+        filterset = LogsFilter(filters, queryset=self.get_queryset())
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        job = ExportJob.objects.create(
+            user=request.user, export_format=export_format, filters=json.dumps(filters)
+        )
+        submit_export_job(job)
+        job.refresh_from_db()
+
+        serializer = ExportJobSerializer(job, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ListExportJobs(generics.ListAPIView):
+    queryset = ExportJob.objects.all().select_related("user")
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
 
-            # sending response
-            response = HttpResponse(file_data, content_type="application/vnd.ms-excel")
-            response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
 
-        except IOError as e:
-            print(e)
-            response = Response(
-                {"detail": "Error Occured"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+class RetrieveDestroyExportJob(generics.RetrieveDestroyAPIView):
+    queryset = ExportJob.objects.all().select_related("user")
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
+
+    def perform_destroy(self, instance):
+        if instance.file:
+            instance.file.delete(save=False)
+        instance.delete()
+
+
+class DownloadExportJob(generics.RetrieveAPIView):
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+
+        if job.status != "COMPLETED" or not job.file:
+            raise MyCustomException(
+                f"Error: Export is not available, its status is {job.status}.",
+                code=404,
             )
 
-        return response
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=f"user_logs_{job.id}.{job.export_format}",
+        )
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ClientConfig(AppConfig):
     name = 'client'
+
+    def ready(self):
+        # Connect the token cache invalidation signals
+        import client.authentication  # noqa: F401
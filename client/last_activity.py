@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from client.models import MyUser
+from mylib.flusher import PeriodicFlusher
+
+import datetime as dt
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class LastActivityTracker(PeriodicFlusher):
+    """
+    Coalesces MyUser.last_activity writes.
+
+    Requests only record a last-seen time in memory. Users whose stored
+    last_activity is older than the staleness window are marked dirty
+    and written together in one UPDATE per flush, so writes grow with
+    the number of active users rather than the number of requests.
+    """
+
+    thread_name = "last-activity-tracker"
+
+    def __init__(self, staleness=60, flush_interval=30, batch_size=500):
+        super().__init__(flush_interval=flush_interval)
+
+        self.staleness = dt.timedelta(seconds=staleness)
+        self.batch_size = batch_size
+
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def touch(self, user, now=None):
+        """
+        Record activity for `user`. Returns True if the user was
+        marked for the next flush.
+        """
+        now = now or timezone.now()
+
+        with self._lock:
+            if user.id in self._pending:
+                self._pending[user.id] = now
+                return True
+
+            last_activity = getattr(user, "last_activity", None)
+            if last_activity is not None and now - last_activity < self.staleness:
+                return False
+
+            self._pending[user.id] = now
+
+        return True
+
+    def flush(self):
+        """
+        Write pending timestamps with one UPDATE per batch_size users.
+        Returns the number of users updated.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        items = list(pending.items())
+        updated = 0
+
+        for start in range(0, len(items), self.batch_size):
+            end = start + self.batch_size
+            batch = items[start:end]
+            last_activity = Case(
+                *[When(id=user_id, then=Value(seen)) for user_id, seen in batch],
+                output_field=DateTimeField(),
+            )
+
+            try:
+                updated += MyUser.objects.filter(
+                    id__in=[user_id for user_id, seen in batch]
+                ).update(last_activity=last_activity)
+            except DatabaseError:
+                logger.exception(
+                    "Failed to update last activity of %s users.", len(batch)
+                )
+
+        return updated
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_last_activity_tracker():
+    """
+    Return the process-wide tracker configured from settings,
+    starting its background thread on first use.
+    """
+    global _tracker
+
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = LastActivityTracker(
+                    staleness=settings.LAST_ACTIVITY_STALENESS,
+                    flush_interval=settings.LAST_ACTIVITY_FLUSH_INTERVAL,
+                )
+                _tracker.start()
+
+    return _tracker
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from client.token_usage import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete API tokens past their idle timeout or maximum age."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from client.activity_logs.exports import purge_expired_export_jobs
+
+
+class Command(BaseCommand):
+    help = "Delete expired activity log export jobs and their files."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_export_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired export jobs."))
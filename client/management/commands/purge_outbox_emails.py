@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from client.outbox.sender import purge_outbox_emails
+
+
+class Command(BaseCommand):
+    help = "Delete sent and failed outbox emails past their retention."
+
+    def handle(self, *args, **options):
+        deleted = purge_outbox_emails()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} outbox emails."))
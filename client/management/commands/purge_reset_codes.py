@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from client.reset_codes import purge_expired_reset_codes
+
+
+class Command(BaseCommand):
+    help = "Delete expired and exhausted password reset codes."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_reset_codes()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} reset codes."))
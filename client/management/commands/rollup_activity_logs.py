@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from client.activity_logs.retention import rollup_activity_logs
+
+
+class Command(BaseCommand):
+    help = "Roll up activity logs older than --days into hourly counts and delete them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.ACTIVITY_LOG_RETENTION_DAYS
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ACTIVITY_LOG_RETENTION_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        deleted = rollup_activity_logs(
+            days=options["days"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rolled up and deleted {deleted} activity logs.")
+        )
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from client.outbox.sender import send_pending_emails
+
+import time
+
+
+class Command(BaseCommand):
+    help = "Send due outbox emails, once or with --loop every poll interval."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument(
+            "--interval", type=int, default=settings.EMAIL_OUTBOX_POLL_INTERVAL
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_pending_emails()
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} emails."))
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -1,25 +1,59 @@
-from django_user_agents.utils import get_user_agent
-
-from client.models import ActivityLog
+from client.models import ActivityLog, Device, Browser, OperatingSystem
+from client.activity_logs.buffer import get_activity_log_buffer
+from client.activity_logs.dimensions import DimensionCache
+from client.activity_logs.ua_cache import user_agent_cache
+from client.last_activity import get_last_activity_tracker
 
 import json
 import re
 
-from appointment_api.settings import ACTIVATE_LOGS, LOG_AUTHENTICATED_USERS_ONLY, IP_ADDRESS_HEADERS
+from mylib.cache import LRUCache
+
+from appointment_api.settings import (
+    ACTIVATE_LOGS, LOG_AUTHENTICATED_USERS_ONLY, IP_ADDRESS_HEADERS, ACTIVITY_LOG_BUFFERED,
+    LAST_ACTIVITY_COALESCED, USER_AGENT_CACHE_WARM_UP,
+)
 
 
 API_URLS = ["/api/", "/o/to"]
 
-url = r"^/api/([v1,v2]*)/(\w{0,20})/?$"
-url1 = r"^/api/([v1,v2]*)/(\w{0,20})/(\w{0,20})/?$"
-url2 = r"^/api/([v1,v2]*)/(\w{0,20})/([0-9]+)/?$"
-url3 = r"^/api/([v1,v2]*)/(\w{0,20})/([0-9]+)/(\w{0,50})/?$"
-patterns = [
-    {"values": ["version", "resources", "extra_resource"], "pattern":url1},
-    {"values": ["version", "resources"], "pattern":url},
-    {"values": ["version", "resources", "id"], "pattern": url2},
-    {"values": ["version", "resources", "id", "extra_resource"], "pattern": url3}
-]
+# Path converters (<int:pk>) and regex groups ((?P<pk>[^/.]+)) in a route
+ROUTE_PARAM = re.compile(r"<(?:\w+:)?(\w+)>|\(\?P<(\w+)>[^)]*\)")
+API_VERSION = re.compile(r"^v\d+$")
+
+# Classified routes, keyed by the route template
+ROUTE_CACHE = LRUCache(max_size=512)
+
+
+def classify_route(route):
+    """
+    Split a route template like 'api/v1/doctors/<int:doctor_pk>/appointments/'
+    into its version, resource, id parameter and sub-resource parts.
+    """
+    template = ROUTE_PARAM.sub(lambda m: "{%s}" % (m.group(1) or m.group(2)), route)
+    segments = [s.strip("^$") for s in template.split("/")]
+    segments = [s for s in segments if s]
+
+    if segments and segments[0] == "api":
+        segments = segments[1:]
+
+    parts = {"version": None, "resources": None, "id_param": None}
+    if segments and API_VERSION.match(segments[0]):
+        parts["version"] = segments.pop(0)
+
+    extra_resources = []
+    for segment in segments:
+        if segment.startswith("{"):
+            if parts["id_param"] is None:
+                parts["id_param"] = segment[1:-1]
+        elif parts["resources"] is None:
+            parts["resources"] = segment
+        else:
+            extra_resources.append(segment)
+
+    parts["extra_resource"] = "/".join(extra_resources) or None
+
+    return parts
 
 
 def get_ip_address(request):
@@ -33,6 +67,12 @@ class UserLoggerMiddleware(object):
     def __init__(self, get_response):
         self.get_response = get_response
         # One-time configuration and initialization.
+        self.device_ids = DimensionCache(Device)
+        self.browser_ids = DimensionCache(Browser)
+        self.os_ids = DimensionCache(OperatingSystem)
+
+        if ACTIVATE_LOGS and USER_AGENT_CACHE_WARM_UP:
+            user_agent_cache.warm_up(limit=USER_AGENT_CACHE_WARM_UP)
 
     def __call__(self, request):
         # Code to be executed for each request before the view (and later middleware) are called.
@@ -52,7 +92,10 @@ class UserLoggerMiddleware(object):
 
         # Update user activity
         if request.user.is_authenticated:
-            getattr(request.user, 'update_last_activity', lambda: 1)()
+            if LAST_ACTIVITY_COALESCED:
+                get_last_activity_tracker().touch(request.user)
+            else:
+                getattr(request.user, 'update_last_activity', lambda: 1)()
 
         # Add log for the user
         user = request.user.id
@@ -62,55 +105,72 @@ class UserLoggerMiddleware(object):
 
     def writelog(self, user, request, response):
         os_br_dev = self.get_browser_os_device(request)
-        ActivityLog.objects.create(
+        log = ActivityLog(
             user_id=user,
             request_url=request.build_absolute_uri()[:255],
             request_method=request.method,
             response_code=response.status_code,
             ip_address=get_ip_address(request),
-            extra_data=self.parse_url(request.path),
-            os=os_br_dev["os"],
-            device=os_br_dev["device"],
-            browser=os_br_dev["browser"]
+            extra_data=self.parse_url(request.path, getattr(request, 'resolver_match', None)),
+            os_id=self.os_ids.get_id(os_br_dev["os"]),
+            device_id=self.device_ids.get_id(os_br_dev["device"]),
+            browser_id=self.browser_ids.get_id(os_br_dev["browser"]),
+            user_agent_hash=os_br_dev["hash"],
         )
 
+        # Hand the row to the background writer instead of an INSERT per request
+        if ACTIVITY_LOG_BUFFERED:
+            get_activity_log_buffer().put(log)
+        else:
+            log.save()
+
     def get_action_message(self, request, response):
         pass
 
-    def get_models_from_urls(self):
-        '''
-        api/v1/stuffs
-        api/v1/stuffs/id
-        api/v1/stufffs/id/sutff
-        :return:
-        '''
-        test_url = "/api/v1/stuffs"
-        test_url2 = "/api/v1/stuffs/2"
-        test_url3 = "/api/v1/stufffs/3/sutff"
-        tests = [test_url, test_url2, test_url3]
-        for test_urla in tests:
-            print(self.parse_url(test_urla))
-
-    def parse_url_by_value(self, value, transaction):
-        pattern = re.compile(value, flags=re.IGNORECASE)
-        return pattern.findall(transaction)
-
-    def parse_url(self, url):
-        results_all = [{"results": self.parse_url_by_value(d["pattern"], url), "name": d["values"]} for d in patterns]
-        results = filter(lambda x: len(x["results"]) > 0, results_all)
-        # print(dir(results))
-        try:
-            if len(results) > 0:
-                res = results[0]
-                return json.dumps({res["name"][i]: k for i, k in enumerate(res["results"][0])})
-
-            return None
-        except Exception:
-            return None
-
-    def parse_result_as_string(self, res):
-        pass
+    def parse_url(self, url, resolver_match=None):
+        """
+        Describe the requested resource as JSON using the route Django matched,
+        falling back to treating numeric path segments as ids for unresolved urls.
+        """
+        if resolver_match is not None:
+            route = resolver_match.route
+            kwargs = resolver_match.kwargs
+            view = resolver_match.view_name
+        else:
+            segments = url.strip("/").split("/")
+            route = "/".join("{%s}" % i if s.isdigit() else s for i, s in enumerate(segments))
+            kwargs = {str(i): s for i, s in enumerate(segments) if s.isdigit()}
+            view = None
+
+        parts = ROUTE_CACHE.get_or_set(route, lambda: classify_route(route))
+
+        id_param = parts["id_param"]
+        return json.dumps({
+            "view": view,
+            "version": parts["version"],
+            "resources": parts["resources"],
+            "id": str(kwargs[id_param]) if id_param in kwargs else None,
+            "extra_resource": parts["extra_resource"],
+            "kwargs": {k: str(v) for k, v in kwargs.items()},
+        })
 
     def get_browser_os_device(self, request):
-        user_agent = get_user_agent(request)
-        return {"os": user_agent.os, "browser": user_agent.browser, "device": str(user_agent)}
+        return user_agent_cache.parse(request.META.get("HTTP_USER_AGENT", ""))
+
+
+class BasicAuthTokenMiddleware(object):
+    """
+    Return the API token of users who signed in with Basic auth in an
+    X-Auth-Token header, when BASIC_AUTH_ISSUE_TOKEN is on.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        token_key = getattr(request, 'basic_auth_token', None)
+        if token_key and response.status_code < 400:
+            response['X-Auth-Token'] = token_key
+
+        return response
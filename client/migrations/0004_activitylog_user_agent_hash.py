@@ -0,0 +1,20 @@
+# Generated by Django 3.2.18 on 2026-10-16 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0003_auto_20230303_1111"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activitylog",
+            name="user_agent_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+    ]
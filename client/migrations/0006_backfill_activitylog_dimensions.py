@@ -0,0 +1,75 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 2000
+
+DIMENSIONS = (
+    ("device", "Device"),
+    ("browser", "Browser"),
+    ("os", "OperatingSystem"),
+)
+
+
+def backfill_dimensions(apps, schema_editor):
+    """
+    Move the device, browser and os strings of existing activity logs
+    into their lookup tables, one id range at a time.
+    """
+    ActivityLog = apps.get_model("client", "ActivityLog")
+    lookups = {
+        field: (apps.get_model("client", model), {}) for field, model in DIMENSIONS
+    }
+
+    last_id = 0
+    while True:
+        rows = list(
+            ActivityLog.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "device", "browser", "os")[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+
+        first_id, last_id = rows[0][0], rows[-1][0]
+        batch = ActivityLog.objects.filter(id__gte=first_id, id__lte=last_id)
+
+        for index, (field, model) in enumerate(DIMENSIONS, start=1):
+            Model, ids = lookups[field]
+            names = {row[index] for row in rows if row[index]}
+            missing = names - ids.keys()
+
+            if missing:
+                Model.objects.bulk_create(
+                    [Model(name=name) for name in missing], ignore_conflicts=True
+                )
+                ids.update(
+                    Model.objects.filter(name__in=missing).values_list("name", "id")
+                )
+
+            for name in names:
+                batch.filter(**{field: name}).update(**{f"{field}_ref": ids[name]})
+
+
+def restore_dimensions(apps, schema_editor):
+    ActivityLog = apps.get_model("client", "ActivityLog")
+
+    for field, model in DIMENSIONS:
+        Model = apps.get_model("client", model)
+
+        for lookup in Model.objects.all().iterator():
+            ActivityLog.objects.filter(**{f"{field}_ref": lookup.id}).update(
+                **{field: lookup.name}
+            )
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so the log table isn't locked for the whole backfill
+    atomic = False
+
+    dependencies = [
+        ("client", "0005_activitylog_dimension_tables"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_dimensions, restore_dimensions),
+    ]
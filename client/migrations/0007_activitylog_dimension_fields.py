@@ -0,0 +1,69 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0006_backfill_activitylog_dimensions"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="activitylog",
+            name="browser",
+        ),
+        migrations.RemoveField(
+            model_name="activitylog",
+            name="device",
+        ),
+        migrations.RemoveField(
+            model_name="activitylog",
+            name="os",
+        ),
+        migrations.RenameField(
+            model_name="activitylog",
+            old_name="browser_ref",
+            new_name="browser",
+        ),
+        migrations.RenameField(
+            model_name="activitylog",
+            old_name="device_ref",
+            new_name="device",
+        ),
+        migrations.RenameField(
+            model_name="activitylog",
+            old_name="os_ref",
+            new_name="os",
+        ),
+        migrations.AlterField(
+            model_name="activitylog",
+            name="browser",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="client.browser",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="activitylog",
+            name="device",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="client.device",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="activitylog",
+            name="os",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="client.operatingsystem",
+            ),
+        ),
+    ]
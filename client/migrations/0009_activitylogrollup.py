@@ -0,0 +1,46 @@
+# Generated by Django 3.2.18 on 2026-10-16 20:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0008_exportjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityLogRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(db_index=True)),
+                ("resource", models.CharField(blank=True, max_length=100, null=True)),
+                ("request_method", models.CharField(max_length=10)),
+                ("response_code", models.CharField(max_length=3)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("hour", "id"),
+            },
+        ),
+    ]
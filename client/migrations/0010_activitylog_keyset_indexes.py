@@ -0,0 +1,25 @@
+# Generated by Django 3.2.18 on 2026-10-16 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0009_activitylogrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["datetime", "id"], name="activitylog_datetime_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["user", "datetime"], name="activitylog_user_dt_idx"
+            ),
+        ),
+    ]
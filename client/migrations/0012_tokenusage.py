@@ -0,0 +1,31 @@
+# Generated by Django 3.2.18 on 2026-10-16 21:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authtoken", "0003_tokenproxy"),
+        ("client", "0011_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TokenUsage",
+            fields=[
+                (
+                    "token",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="usage",
+                        serialize=False,
+                        to="authtoken.token",
+                    ),
+                ),
+                ("last_used", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
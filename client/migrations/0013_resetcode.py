@@ -0,0 +1,87 @@
+# Generated by Django 3.2.18 on 2026-10-16 21:06
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+import django.db.models.deletion
+
+import datetime as dt
+
+
+def move_reset_codes(apps, schema_editor):
+    """
+    Hash the reset codes held on MyUser into ResetCode. Codes held by more
+    than one user are dropped, those users have to request a new one.
+    """
+    MyUser = apps.get_model("client", "MyUser")
+    ResetCode = apps.get_model("client", "ResetCode")
+
+    users_by_code = {}
+    for user_id, code in MyUser.objects.filter(reset_code__isnull=False).values_list(
+        "id", "reset_code"
+    ):
+        users_by_code.setdefault(code, []).append(user_id)
+
+    expires_at = timezone.now() + dt.timedelta(seconds=settings.RESET_CODE_LIFETIME)
+    ResetCode.objects.bulk_create(
+        [
+            ResetCode(
+                user_id=user_ids[0],
+                # Same hash as client.reset_codes.hash_code
+                code_hash=salted_hmac("client.reset_codes", str(code)).hexdigest(),
+                expires_at=expires_at,
+            )
+            for code, user_ids in users_by_code.items()
+            if len(user_ids) == 1
+        ]
+    )
+
+
+def restore_reset_codes(apps, schema_editor):
+    # Only hashes are stored, the codes cannot be restored
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0012_tokenusage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResetCode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code_hash", models.CharField(max_length=64, unique=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("date_created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reset_codes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("id",),
+            },
+        ),
+        migrations.RunPython(move_reset_codes, restore_reset_codes),
+        migrations.RemoveField(
+            model_name="myuser",
+            name="reset_code",
+        ),
+    ]
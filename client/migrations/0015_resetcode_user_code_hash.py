@@ -0,0 +1,24 @@
+# Generated by Django 3.2.18 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0014_outboxemail"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="resetcode",
+            name="code_hash",
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="resetcode",
+            constraint=models.UniqueConstraint(
+                fields=("user", "code_hash"), name="resetcode_user_code_hash_uniq"
+            ),
+        ),
+    ]
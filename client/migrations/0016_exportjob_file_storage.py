@@ -0,0 +1,39 @@
+# Generated by Django 3.2.18 on 2026-10-17 10:02
+
+import client.storage
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def delete_public_exports(apps, schema_editor):
+    """
+    Delete the export files written under MEDIA_ROOT, where they are served
+    without auth, with their jobs. Exports are temporary, admins export again.
+    """
+    ExportJob = apps.get_model("client", "ExportJob")
+
+    jobs = ExportJob.objects.exclude(file="").exclude(file__isnull=True)
+    for name in jobs.values_list("file", flat=True):
+        default_storage.delete(name)
+    jobs.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0015_resetcode_user_code_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_public_exports, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="exportjob",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=client.storage.ExportStorage(),
+                upload_to=client.storage.export_file_name,
+            ),
+        ),
+    ]
@@ -13,6 +13,7 @@ from rest_framework.authtoken.models import Token
 from imagekit.models import ImageSpecField
 from pilkit.processors import ResizeToFit
 
+from client.storage import ExportStorage, export_file_name
 from mylib.image import scramble
 
 
@@ -40,7 +41,6 @@ class MyUser(UserMixin, AbstractUser):
     )
     confirm_code = models.IntegerField(null=True, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
-    reset_code = models.IntegerField(null=True, blank=True)
     old_password = models.CharField(null=True, blank=True, max_length=55, editable=False)
     changed_password = models.BooleanField(default=False)
     verified = models.BooleanField(default=False)
@@ -60,20 +60,168 @@ class MyUser(UserMixin, AbstractUser):
         ordering = ('id',)
 
 
+class ActivityLogDimension(models.Model):
+    """
+    A distinct device, browser or os string shared by many activity logs.
+    """
+    name = models.CharField(max_length=1000, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        abstract = True
+        ordering = ('id',)
+
+
+class Device(ActivityLogDimension):
+    pass
+
+
+class Browser(ActivityLogDimension):
+    pass
+
+
+class OperatingSystem(ActivityLogDimension):
+    pass
+
+
 class ActivityLog(models.Model):
     user = models.ForeignKey(MyUser, null=True, blank=True, on_delete=models.SET_NULL)
     request_url = models.URLField(max_length=256)
     request_method = models.CharField(max_length=10)
     response_code = models.CharField(max_length=3)
     datetime = models.DateTimeField(default=timezone.now)
-    device = models.CharField(max_length=1000, null=True, blank=True)
-    browser = models.CharField(max_length=1000, null=True, blank=True)
-    os = models.CharField(max_length=1000, null=True, blank=True)
+    device = models.ForeignKey(Device, null=True, blank=True, on_delete=models.PROTECT)
+    browser = models.ForeignKey(Browser, null=True, blank=True, on_delete=models.PROTECT)
+    os = models.ForeignKey(OperatingSystem, null=True, blank=True, on_delete=models.PROTECT)
     extra_data = models.TextField(blank=True, null=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent_hash = models.CharField(max_length=32, null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            # Keyset pagination of the log list and per-user history
+            models.Index(fields=['datetime', 'id'], name='activitylog_datetime_id_idx'),
+            models.Index(fields=['user', 'datetime'], name='activitylog_user_dt_idx'),
+        ]
+
+
+class ActivityLogRollup(models.Model):
+    """
+    Number of activity logs per hour, user, resource, method and status code,
+    kept after the raw logs are deleted by the retention job.
+    """
+    hour = models.DateTimeField(db_index=True)
+    user = models.ForeignKey(MyUser, null=True, blank=True, on_delete=models.SET_NULL)
+    resource = models.CharField(max_length=100, null=True, blank=True)
+    request_method = models.CharField(max_length=10)
+    response_code = models.CharField(max_length=3)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ('hour', 'id')
+
+
+class ExportJob(models.Model):
+    STATUS = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    )
+    FORMATS = (("csv", "CSV"), ("xlsx", "XLSX"))
+
+    user = models.ForeignKey(MyUser, null=True, blank=True, on_delete=models.SET_NULL)
+    export_format = models.CharField(max_length=10, choices=FORMATS, default="csv")
+    filters = models.TextField(blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS, default="PENDING")
+    file = models.FileField(
+        upload_to=export_file_name, storage=ExportStorage(), null=True, blank=True
+    )
+    rows = models.IntegerField(default=0)
+    error = models.CharField(max_length=500, null=True, blank=True)
+    date_created = models.DateTimeField(default=timezone.now)
+    date_started = models.DateTimeField(null=True, blank=True)
+    date_finished = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('id',)
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be sent, or sent, by client.outbox.sender.
+    """
+    STATUS = (
+        ("PENDING", "Pending"),
+        ("SENDING", "Sending"),
+        ("SENT", "Sent"),
+        ("FAILED", "Failed"),
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=255, null=True, blank=True)
+    # JSON list of addresses
+    recipients = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS, default="PENDING")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_sent = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('id',)
+        indexes = [
+            # The sender's scan for due emails
+            models.Index(fields=['status', 'next_attempt_at'], name='outboxemail_due_idx'),
+        ]
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked signed refresh token, kept until it would have expired.
+    """
+    jti = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ('id',)
+
+
+class ResetCode(models.Model):
+    """
+    A one-time code for setting a user's password, stored as a keyed hash.
+    See client.reset_codes.
+    """
+    user = models.ForeignKey(MyUser, on_delete=models.CASCADE, related_name='reset_codes')
+    code_hash = models.CharField(max_length=64)
+    expires_at = models.DateTimeField(db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'code_hash'], name='resetcode_user_code_hash_uniq'
+            ),
+        ]
+
+
+class TokenUsage(models.Model):
+    """
+    When an auth token was last used, for sliding token expiry.
+    Written in batches by client.token_usage.TokenUsageTracker.
+    """
+    token = models.OneToOneField(
+        Token, primary_key=True, on_delete=models.CASCADE, related_name='usage'
+    )
+    last_used = models.DateTimeField(db_index=True)
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from client.models import OutboxEmail
+from mylib.common import MySendBulkEmail
+from mylib.flusher import PeriodicFlusher
+
+import datetime as dt
+import json
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, message, recipients, from_email=None):
+    """
+    Store an email in the outbox for the sender, instead of sending it
+    within the request. Sent right away when EMAIL_OUTBOX_ASYNC is off.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        recipients=json.dumps(list(recipients)),
+        from_email=from_email,
+    )
+
+    if not settings.EMAIL_OUTBOX_ASYNC:
+        send_pending_emails()
+    else:
+        transaction.on_commit(get_outbox_sender().wakeup)
+
+    return email
+
+
+def get_retry_delay(attempts):
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return dt.timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_due_emails(now=None, limit=50):
+    """
+    Mark up to `limit` due emails as SENDING and return them.
+
+    They are claimed with one conditional UPDATE that also pushes their
+    next attempt EMAIL_OUTBOX_LOCK_TIMEOUT ahead, so concurrent senders never
+    take the same email, and one whose sender died is retried later.
+    """
+    now = now or timezone.now()
+    due = OutboxEmail.objects.filter(
+        status__in=("PENDING", "SENDING"), next_attempt_at__lte=now
+    )
+    ids = list(
+        due.order_by("next_attempt_at", "id").values_list("id", flat=True)[:limit]
+    )
+    if not ids:
+        return []
+
+    locked_until = now + dt.timedelta(seconds=settings.EMAIL_OUTBOX_LOCK_TIMEOUT)
+    due.filter(id__in=ids).update(status="SENDING", next_attempt_at=locked_until)
+
+    return list(
+        OutboxEmail.objects.filter(
+            id__in=ids, status="SENDING", next_attempt_at=locked_until
+        )
+    )
+
+
+def send_emails(emails, now=None):
+    """
+    Send claimed emails over one connection and record each outcome,
+    scheduling a retry with exponential backoff on failure.
+    Returns the number of emails sent.
+    """
+    results = MySendBulkEmail(
+        [
+            EmailMessage(
+                email.subject,
+                email.message,
+                email.from_email or settings.DEFAULT_FROM_EMAIL,
+                json.loads(email.recipients),
+            )
+            for email in emails
+        ]
+    )
+
+    now = now or timezone.now()
+    sent = 0
+    for email, error in zip(emails, results):
+        email.attempts += 1
+        if error is None:
+            email.status = "SENT"
+            email.date_sent = timezone.now()
+            sent += 1
+        else:
+            email.last_error = str(error)[:1000]
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = "FAILED"
+            else:
+                email.status = "PENDING"
+                email.next_attempt_at = now + get_retry_delay(email.attempts)
+            logger.warning("Failed to send email %s: %s", email.id, error)
+
+        if email.status in ("SENT", "FAILED"):
+            # Not needed any more, and may hold a reset code
+            email.message = ""
+
+        email.save(
+            update_fields=[
+                "message",
+                "attempts",
+                "status",
+                "next_attempt_at",
+                "last_error",
+                "date_sent",
+            ]
+        )
+
+    return sent
+
+
+def send_pending_emails(now=None, batch_size=None):
+    """
+    Send every due email, batch_size at a time over one connection.
+    Returns the number of emails sent.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    now = now or timezone.now()
+    sent = 0
+
+    while True:
+        emails = claim_due_emails(now=now, limit=batch_size)
+        if not emails:
+            break
+
+        sent += send_emails(emails, now=now)
+
+    return sent
+
+
+def purge_outbox_emails(now=None):
+    """
+    Delete sent and failed emails older than EMAIL_OUTBOX_RETENTION_DAYS.
+    Returns the number of emails deleted.
+    """
+    now = now or timezone.now()
+    deleted, _ = OutboxEmail.objects.filter(
+        status__in=("SENT", "FAILED"),
+        date_created__lt=now - dt.timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS),
+    ).delete()
+    return deleted
+
+
+class OutboxSender(PeriodicFlusher):
+    """
+    Sends due outbox emails from a background thread every poll interval,
+    or as soon as `wakeup()` is called for a newly queued email.
+    """
+
+    thread_name = "email-outbox-sender"
+
+    def flush(self):
+        try:
+            return send_pending_emails()
+        except DatabaseError:
+            logger.exception("Failed to send outbox emails.")
+            return 0
+
+
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def get_outbox_sender():
+    """
+    Return the process-wide sender, starting its background thread
+    on first use.
+    """
+    global _sender
+
+    if _sender is None:
+        with _sender_lock:
+            if _sender is None:
+                _sender = OutboxSender(
+                    flush_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL
+                )
+                _sender.start()
+
+    return _sender
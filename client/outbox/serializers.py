@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from client.models import OutboxEmail
+
+import json
+
+
+class OutboxEmailSerializer(serializers.ModelSerializer):
+    recipients = serializers.SerializerMethodField()
+
+    class Meta:
+        model = OutboxEmail
+        # Bodies hold reset codes and invite links, not for other users' eyes
+        exclude = ("message",)
+
+    def get_recipients(self, obj):
+        return json.loads(obj.recipients)
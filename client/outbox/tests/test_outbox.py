@@ -0,0 +1,202 @@
+from django.urls import reverse
+from django.contrib.auth.models import Group
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from client.models import MyUser, OutboxEmail
+from client.outbox.sender import (
+    purge_outbox_emails,
+    queue_email,
+    send_pending_emails,
+)
+from mylib.common import MySendBulkEmail
+
+from smtplib import SMTPException, SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+import datetime as dt
+
+
+class OutboxTests(APITestCase):
+    def setUp(self):
+        """
+        Create roles and users Objects to be used
+        through-out this Outbox Tests Case.
+        """
+        admin_role, created = Group.objects.get_or_create(name="ADMIN")
+        patient_role, created = Group.objects.get_or_create(name="PATIENT")
+
+        for username, role in [("adminuser1", admin_role), ("p.user1", patient_role)]:
+            user = MyUser.objects.create(
+                role=role,
+                phone="0712345678",
+                verified=True,
+                email=f"{username}@myapp.com",
+                password="Pass1234",
+                username=username,
+            )
+            user.set_password(user.password)
+            user.save()
+
+    @override_settings(EMAIL_OUTBOX_ASYNC=True)
+    @mock.patch("client.outbox.sender.get_outbox_sender")
+    def test_queue_and_send_emails(self, get_outbox_sender):
+        """
+        Ensure queued emails are only stored, then sent by the sender
+        """
+        response = self.client.post(
+            reverse("client_forgot_password"),
+            {"email": "p.user1@myapp.com"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queue_email("Subject", "Message", ["adminuser1@myapp.com"])
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(status="PENDING").count(), 2)
+
+        self.assertEqual(send_pending_emails(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ["p.user1@myapp.com"])
+        self.assertEqual(mail.outbox[0].subject, "Password Reset Code")
+        self.assertEqual(OutboxEmail.objects.filter(status="SENT").count(), 2)
+        # Sent bodies, e.g. with reset codes, are not kept
+        self.assertEqual(OutboxEmail.objects.exclude(message="").count(), 0)
+        self.assertEqual(send_pending_emails(), 0)
+
+    @override_settings(
+        EMAIL_OUTBOX_ASYNC=False,
+        EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+        EMAIL_OUTBOX_RETRY_DELAY=30,
+    )
+    def test_failed_emails_are_retried_with_backoff(self):
+        """
+        Ensure failed sends are retried after growing delays, then marked failed
+        """
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=SMTPException("Down"),
+        ):
+            email = queue_email("Subject", "Message", ["p.user1@myapp.com"])
+            email.refresh_from_db()
+            self.assertEqual(email.status, "PENDING")
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, "Down")
+
+            # Not due yet
+            self.assertEqual(send_pending_emails(), 0)
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, 1)
+
+            first_retry = email.next_attempt_at
+            send_pending_emails(now=first_retry)
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, 2)
+            self.assertEqual(
+                email.next_attempt_at - first_retry, dt.timedelta(seconds=60)
+            )
+
+            send_pending_emails(now=email.next_attempt_at)
+            email.refresh_from_db()
+            self.assertEqual(email.status, "FAILED")
+            self.assertEqual(email.attempts, 3)
+            self.assertEqual(email.message, "")
+
+        self.assertEqual(
+            send_pending_emails(now=timezone.now() + dt.timedelta(days=1)), 0
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_bulk_email(self):
+        """
+        Ensure many emails are sent over one connection, which is opened
+        again when it drops, with a result for each email
+        """
+        connection = get_connection()
+        messages = [
+            (f"Subject {i}", "Message", [f"user{i}@myapp.com"]) for i in range(4)
+        ]
+
+        with mock.patch.object(connection, "open") as open_connection:
+            results = MySendBulkEmail(messages, connection=connection)
+        self.assertEqual(results, [None] * 4)
+        self.assertEqual(open_connection.call_count, 4)
+        self.assertEqual([email.to for email in mail.outbox], [m[2] for m in messages])
+        mail.outbox = []
+
+        refused = SMTPRecipientsRefused({})
+        with mock.patch.object(
+            connection, "send_messages", side_effect=[1, refused, 1]
+        ):
+            results = MySendBulkEmail(messages[:3], connection=connection)
+        self.assertEqual(results, [None, refused, None])
+
+        with mock.patch.object(connection, "close") as close_connection:
+            with mock.patch.object(
+                connection,
+                "send_messages",
+                side_effect=[SMTPServerDisconnected("Lost"), 1, 1, 1, 1],
+            ):
+                results = MySendBulkEmail(messages, connection=connection)
+        self.assertEqual(results, [None] * 4)
+        # Once to reconnect, once when done
+        self.assertEqual(close_connection.call_count, 2)
+
+        lost = SMTPServerDisconnected("Lost")
+        with mock.patch.object(
+            connection, "send_messages", side_effect=[1, lost, lost]
+        ):
+            results = MySendBulkEmail(messages, connection=connection)
+        self.assertEqual(results, [None, lost, lost, lost])
+
+    def test_list_outbox_emails(self):
+        """
+        Ensure only admins can see the outbox
+        """
+        queue_email("Subject", "Message", ["p.user1@myapp.com"])
+        url = reverse("outbox_email_list")
+
+        self.client.login(username="p.user1", password="Pass1234")
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.logout()
+
+        self.client.login(username="adminuser1", password="Pass1234")
+        response = self.client.get(url, {"status": "SENT"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(
+            response.json()["results"][0]["recipients"], ["p.user1@myapp.com"]
+        )
+        self.assertNotIn("message", response.json()["results"][0])
+
+        response = self.client.get(
+            reverse(
+                "outbox_email_retrieve", args=(response.json()["results"][0]["id"],)
+            )
+        )
+        self.assertEqual(response.json()["status"], "SENT")
+        self.assertEqual(response.json()["attempts"], 1)
+        self.client.logout()
+
+    @override_settings(EMAIL_OUTBOX_RETENTION_DAYS=30)
+    def test_purge_outbox_emails(self):
+        """
+        Ensure only sent and failed emails past the retention are deleted
+        """
+        for status_ in ["SENT", "FAILED", "PENDING"]:
+            OutboxEmail.objects.create(
+                subject="Subject",
+                message="",
+                recipients="[]",
+                status=status_,
+            )
+        now = timezone.now()
+
+        self.assertEqual(purge_outbox_emails(now=now), 0)
+        self.assertEqual(purge_outbox_emails(now=now + dt.timedelta(days=31)), 2)
+        self.assertEqual(OutboxEmail.objects.get().status, "PENDING")
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from client.outbox.views import ListOutboxEmails, RetrieveOutboxEmail
+
+urlpatterns = [
+    path("", ListOutboxEmails.as_view(), name="outbox_email_list"),
+    path("<int:pk>/", RetrieveOutboxEmail.as_view(), name="outbox_email_retrieve"),
+]
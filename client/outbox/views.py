@@ -0,0 +1,23 @@
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from client.models import OutboxEmail
+from client.outbox.serializers import OutboxEmailSerializer
+from client.permissions import IsRoleAdmin
+
+
+class ListOutboxEmails(generics.ListAPIView):
+    """
+    Queued, sent and failed emails, newest first.
+    """
+
+    queryset = OutboxEmail.objects.all().order_by("-id")
+    serializer_class = OutboxEmailSerializer
+    filterset_fields = ("status",)
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
+
+
+class RetrieveOutboxEmail(generics.RetrieveAPIView):
+    queryset = OutboxEmail.objects.all()
+    serializer_class = OutboxEmailSerializer
+    permission_classes = [IsAuthenticated, IsRoleAdmin]
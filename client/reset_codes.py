@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from client.models import ResetCode
+
+from random import randint
+import datetime as dt
+
+
+def hash_code(code):
+    """
+    Keyed hash of a reset code. Codes are stored and looked up by this only.
+    """
+    return salted_hmac("client.reset_codes", str(code)).hexdigest()
+
+
+def issue_reset_code(user, lifetime=None):
+    """
+    Replace the user's reset codes with a new 6-digit one and return it.
+    """
+    lifetime = lifetime or settings.RESET_CODE_LIFETIME
+    code = randint(111111, 999999)
+
+    with transaction.atomic():
+        ResetCode.objects.filter(user=user).delete()
+        ResetCode.objects.create(
+            user=user,
+            code_hash=hash_code(code),
+            expires_at=timezone.now() + dt.timedelta(seconds=lifetime),
+        )
+    return code
+
+
+def get_reset_code(code, email, now=None):
+    """
+    Return the live ResetCode `code` of the user with `email`, with its
+    user, or None. A wrong code counts as a failed attempt against that
+    user's code, which is deleted after RESET_CODE_MAX_ATTEMPTS.
+    """
+    now = now or timezone.now()
+    reset_code = (
+        ResetCode.objects.select_related("user")
+        .filter(
+            user__email=email,
+            code_hash=hash_code(code),
+            expires_at__gt=now,
+            attempts__lt=settings.RESET_CODE_MAX_ATTEMPTS,
+        )
+        .first()
+    )
+
+    if reset_code is None:
+        ResetCode.objects.filter(user__email=email).update(attempts=F("attempts") + 1)
+        ResetCode.objects.filter(
+            user__email=email, attempts__gte=settings.RESET_CODE_MAX_ATTEMPTS
+        ).delete()
+
+    return reset_code
+
+
+def purge_expired_reset_codes(now=None):
+    """
+    Delete expired and exhausted reset codes in one query.
+    Returns the number of codes deleted.
+    """
+    now = now or timezone.now()
+    deleted, _ = (
+        ResetCode.objects.filter(expires_at__lte=now)
+        | ResetCode.objects.filter(attempts__gte=settings.RESET_CODE_MAX_ATTEMPTS)
+    ).delete()
+    return deleted
@@ -3,13 +3,13 @@ from django.contrib.auth.models import Group, Permission
 from rest_framework import serializers
 
 from client.models import MyUser
+from client.reset_codes import get_reset_code
 
 
 class MyUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = MyUser
         exclude = (
-            "reset_code",
             "confirm_code",
             "changed_password",
             "user_permissions",
@@ -54,7 +54,6 @@ class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = MyUser
         exclude = (
-            "reset_code",
             "confirm_code",
             "changed_password",
             "user_permissions",
@@ -89,13 +88,23 @@ class ForgotPasswordSerializer(serializers.Serializer):
 
 
 class ResetPasswordserializer(serializers.Serializer):
+    email = serializers.EmailField(required=True)
     reset_code = serializers.IntegerField(required=True)
     new_password = serializers.CharField(required=True)
 
-    def validate_reset_code(self, value):
-        if not MyUser.objects.filter(reset_code=value).exists():
-            raise serializers.ValidationError("Reset code Invalid or Expired")
-        return value
+    def validate(self, attrs):
+        reset_code = get_reset_code(attrs["reset_code"], attrs["email"])
+        if reset_code is None:
+            raise serializers.ValidationError(
+                {"reset_code": ["Reset code Invalid or Expired"]}
+            )
+
+        attrs["user"] = reset_code.user
+        return attrs
+
+
+class SignedRefreshTokenSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
 
 
 class PermissionSerializer(serializers.ModelSerializer):
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+import os
+import uuid
+
+
+class ExportStorage(FileSystemStorage):
+    """
+    Activity log export files, kept in EXPORT_ROOT outside MEDIA_ROOT so they
+    are only served by DownloadExportJob, to admins.
+    """
+
+    @property
+    def base_location(self):
+        return settings.EXPORT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+def export_file_name(instance, filename):
+    # Random, so one export's name does not give away the others'
+    return f"{uuid.uuid4().hex}{os.path.splitext(filename)[1]}"
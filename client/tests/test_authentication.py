@@ -1,10 +1,21 @@
 from django.urls import reverse
+from django.contrib.auth import authenticate
 from django.contrib.auth.models import Group
+from django.test import override_settings
 
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.test import APITestCase
 
+from client.authentication import CREDENTIAL_CACHE, TOKEN_CACHE, BearerAuthentication
 from client.models import MyUser
+from client.tokens import get_access_token_user
+from mylib import token
+
+from base64 import b64encode
+from unittest import mock
+import datetime as dt
 
 
 class BearerAuthenticationTests(APITestCase):
@@ -78,3 +89,176 @@ class BearerAuthenticationTests(APITestCase):
 
             self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
             self.assertIsNone(response.json().get("results", None))
+
+    def test_cached_token_authentication(self):
+        """
+        Ensure resolved tokens are cached with the user's role loaded and
+        dropped when the token, user or role changes.
+        """
+        TOKEN_CACHE.clear()
+        auth = BearerAuthentication()
+        key = Token.objects.get(user__username="adminuser1").key
+
+        with self.assertNumQueries(1):
+            user, token = auth.authenticate_credentials(key)
+            self.assertEqual(user.role.name, "ADMIN")
+
+        with self.assertNumQueries(0):
+            user, token = auth.authenticate_credentials(key)
+            self.assertEqual(user.role.name, "ADMIN")
+        self.assertIsNot(user, auth.authenticate_credentials(key)[0])
+
+        # last_activity writes keep the entry, other user changes drop it
+        user.update_last_activity()
+        self.assertIn(key, TOKEN_CACHE)
+        user.first_name = "changed"
+        user.save()
+        self.assertNotIn(key, TOKEN_CACHE)
+        self.assertEqual(auth.authenticate_credentials(key)[0].first_name, "changed")
+
+        Group.objects.filter(id=user.role_id).get().save()
+        self.assertNotIn(key, TOKEN_CACHE)
+        auth.authenticate_credentials(key)
+
+        Token.objects.get(key=key).delete()
+        self.assertNotIn(key, TOKEN_CACHE)
+        with self.assertRaises(AuthenticationFailed):
+            auth.authenticate_credentials(key)
+
+    def test_signed_token_authentication(self):
+        """
+        Ensure signed access tokens authenticate without a query,
+        and refresh tokens rotate and can be revoked.
+        """
+        url = reverse("api-token-signed")
+        data = {"username": "adminuser1", "password": "Pass1234"}
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        access, refresh = response.json()["access"], response.json()["refresh"]
+
+        with self.assertNumQueries(0):
+            user = get_access_token_user(access)
+            self.assertEqual(user.role.name, "ADMIN")
+            self.assertIs(user.is_staff, False)
+            self.assertIs(user.is_active, True)
+            self.assertIsInstance(user.last_activity, dt.datetime)
+        self.assertEqual(user.username, "adminuser1")
+
+        response = self.client.get(
+            reverse("groups_list_create"), HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # refresh tokens are not access tokens, nor are invite tokens
+        for invalid in [refresh, token.encode("adminuser1@myapp.com"), "a.b.c"]:
+            response = self.client.get(
+                reverse("groups_list_create"), HTTP_AUTHORIZATION=f"Bearer {invalid}"
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # a refresh token can be used once
+        url = reverse("api-token-signed-refresh")
+        response = self.client.post(url, {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_refresh = response.json()["refresh"]
+        response = self.client.post(url, {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(
+            reverse("api-token-signed-revoke"), {"refresh": new_refresh}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {"refresh": new_refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # changing the password invalidates outstanding refresh tokens
+        response = self.client.post(reverse("api-token-signed"), data, format="json")
+        access, refresh = response.json()["access"], response.json()["refresh"]
+        response = self.client.put(
+            reverse("client_change_password"),
+            {"old_password": "Pass1234", "new_password": "NewPass1234"},
+            HTTP_AUTHORIZATION=f"Bearer {access}",
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = MyUser.objects.get(username="adminuser1")
+        self.assertTrue(user.check_password("NewPass1234"))
+        self.assertEqual(user.first_name, "admin")
+        self.assertEqual(user.role.name, "ADMIN")
+        response = self.client.post(url, {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(BASIC_AUTH_ISSUE_TOKEN=True)
+    def test_signed_token_permissions(self):
+        """
+        Ensure a signed access token of a non-admin user
+        is refused on admin endpoints.
+        """
+        role, created = Group.objects.get_or_create(name="PATIENT")
+        user = MyUser.objects.create(
+            role=role,
+            phone="0712345679",
+            verified=True,
+            email="patientuser1@myapp.com",
+            username="patientuser1",
+            first_name="patient",
+            last_name="user1",
+        )
+        user.set_password("Pass1234")
+        user.save()
+
+        data = {"username": "patientuser1", "password": "Pass1234"}
+        response = self.client.post(reverse("api-token-signed"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {response.json()['access']}"}
+
+        response = self.client.get(reverse("groups_list_create"), **headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(
+            reverse("groups_list_create"), {"name": "STAFF"}, format="json", **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Group.objects.filter(name="STAFF").exists())
+
+    def test_cached_basic_authentication(self):
+        """
+        Ensure Basic auth verifies a password once per cache entry,
+        forgets it when the password changes and hands out a token.
+        """
+        CREDENTIAL_CACHE.clear()
+        url = reverse("groups_list_create")
+
+        def basic(password):
+            credentials = b64encode(f"adminuser1:{password}".encode()).decode()
+            return f"Basic {credentials}"
+
+        with mock.patch(
+            "rest_framework.authentication.authenticate", wraps=authenticate
+        ) as verify:
+            for _ in range(3):
+                response = self.client.get(url, HTTP_AUTHORIZATION=basic("Pass1234"))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(verify.call_count, 1)
+
+            response = self.client.get(url, HTTP_AUTHORIZATION=basic("Wrong1234"))
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(verify.call_count, 2)
+
+        self.assertNotIn("X-Auth-Token", response)
+        response = self.client.get(url, HTTP_AUTHORIZATION=basic("Pass1234"))
+        self.assertEqual(
+            response["X-Auth-Token"],
+            Token.objects.get(user__username="adminuser1").key,
+        )
+
+        response = self.client.put(
+            reverse("client_change_password"),
+            {"old_password": "Pass1234", "new_password": "NewPass1234"},
+            HTTP_AUTHORIZATION=basic("Pass1234"),
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url, HTTP_AUTHORIZATION=basic("Pass1234"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(url, HTTP_AUTHORIZATION=basic("NewPass1234"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
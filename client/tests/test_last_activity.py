@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from client.models import MyUser
+from client.last_activity import LastActivityTracker
+
+import datetime as dt
+
+
+class LastActivityTrackerTests(TestCase):
+    def setUp(self):
+        """
+        Create users to be used through-out this Tracker Tests Case.
+        """
+        self.long_ago = timezone.now() - dt.timedelta(hours=1)
+
+        for name in ["user1", "user2", "user3"]:
+            MyUser.objects.create(
+                phone="0723456781",
+                email=f"{name}@myapp.com",
+                username=name,
+                last_activity=self.long_ago,
+            )
+
+    def test_recently_active_user_is_skipped(self):
+        """
+        Ensure no write is queued when last_activity is within the staleness window
+        """
+        tracker = LastActivityTracker(staleness=60)
+        user = MyUser.objects.get(username="user1")
+
+        self.assertTrue(tracker.touch(user))
+        tracker.flush()
+
+        user.refresh_from_db()
+        self.assertFalse(tracker.touch(user))
+        self.assertEqual(len(tracker), 0)
+
+    def test_flush_updates_dirty_users_in_one_query(self):
+        """
+        Ensure repeated touches are coalesced and all dirty
+        users are written with a single UPDATE
+        """
+        tracker = LastActivityTracker(staleness=60)
+        users = list(MyUser.objects.all())
+        now = timezone.now()
+
+        for x in range(5):
+            for user in users:
+                tracker.touch(user, now=now)
+
+        self.assertEqual(len(tracker), len(users))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(tracker.flush(), len(users))
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(tracker), 0)
+
+        for user in MyUser.objects.all():
+            self.assertEqual(user.last_activity, now)
@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase
+
+from mylib.log import JSONFormatter, QueueListenerHandler
+
+import io
+import json
+import logging
+
+
+class LoggingTests(SimpleTestCase):
+    def test_queue_handler_writes_json(self):
+        """
+        Ensure records are written as JSON by the listener thread,
+        with extra values as fields
+        """
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(JSONFormatter())
+        handler = QueueListenerHandler([target])
+
+        logger = logging.getLogger("client.tests.queue")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning("Sent %s emails.", 3, extra={"recipients": ["a@b.com"]})
+            try:
+                raise ValueError("Bad")
+            except ValueError:
+                logger.exception("Failed.")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["message"], "Sent 3 emails.")
+        self.assertEqual(lines[0]["level"], "WARNING")
+        self.assertEqual(lines[0]["logger"], "client.tests.queue")
+        self.assertEqual(lines[0]["recipients"], ["a@b.com"])
+        self.assertIn("ValueError: Bad", lines[1]["exception"])
+
+        with self.assertRaises(ValueError):
+            QueueListenerHandler([{"class": "logging.StreamHandler"}])
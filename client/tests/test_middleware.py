@@ -5,6 +5,8 @@ from rest_framework.test import APITestCase
 
 from client.models import ActivityLog, MyUser
 
+import json
+
 
 class UserLoggerMiddlewareTests(APITestCase):
     def setUp(self):
@@ -56,3 +58,39 @@ class UserLoggerMiddlewareTests(APITestCase):
         self.assertEqual(username, latest_log.user.username)
 
         self.client.logout()
+
+    def test_user_logs_extra_data(self):
+        """
+        Ensure the middleware stores the version, resource, id
+        and sub-resource of the requested url
+        """
+        user = MyUser.objects.get(username="p.user1")
+        url = reverse("users_retrieve_destroy", args=(user.id,))
+
+        self.client.get(url, format="json")
+        extra_data = json.loads(ActivityLog.objects.last().extra_data)
+
+        self.assertEqual(extra_data["view"], "users_retrieve_destroy")
+        self.assertEqual(extra_data["version"], "v1")
+        self.assertEqual(extra_data["resources"], "users")
+        self.assertEqual(extra_data["id"], str(user.id))
+        self.assertIsNone(extra_data["extra_resource"])
+
+        # Ensure sub-resources are stored for nested routes
+        url = reverse("doctor:appointment-cancel", args=(3, 5))
+        self.client.delete(url, format="json")
+        extra_data = json.loads(ActivityLog.objects.last().extra_data)
+
+        self.assertEqual(extra_data["resources"], "doctors")
+        self.assertEqual(extra_data["id"], "3")
+        self.assertEqual(extra_data["extra_resource"], "appointments/cancel")
+        self.assertEqual(extra_data["kwargs"], {"doctor_pk": "3", "pk": "5"})
+
+        # Ensure unresolved urls are still classified
+        self.client.get("/api/v1/unknown/7/things/", format="json")
+        extra_data = json.loads(ActivityLog.objects.last().extra_data)
+
+        self.assertIsNone(extra_data["view"])
+        self.assertEqual(extra_data["resources"], "unknown")
+        self.assertEqual(extra_data["id"], "7")
+        self.assertEqual(extra_data["extra_resource"], "things")
@@ -0,0 +1,128 @@
+from django.urls import reverse
+from django.contrib.auth.models import Group
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+
+from client.authentication import TOKEN_CACHE, BearerAuthentication
+from client.models import MyUser, TokenUsage
+from client.token_usage import TokenUsageTracker, purge_expired_tokens
+
+import datetime as dt
+
+
+class TokenUsageTests(APITestCase):
+    def setUp(self):
+        """
+        Create users, and so tokens, to be used
+        through-out this Token Usage Tests Case.
+        """
+        role, created = Group.objects.get_or_create(name="ADMIN")
+
+        for name in ["user1", "user2", "user3"]:
+            user = MyUser.objects.create(
+                role=role,
+                phone="0723456781",
+                email=f"{name}@myapp.com",
+                username=name,
+                password="Pass1234",
+            )
+            user.set_password(user.password)
+            user.save()
+
+        TOKEN_CACHE.clear()
+        self.long_ago = timezone.now() - dt.timedelta(days=60)
+
+    def get_key(self, username):
+        return Token.objects.get(user__username=username).key
+
+    def test_last_used_writes_are_batched(self):
+        """
+        Ensure uses are kept in memory and written together,
+        and recently written tokens are skipped
+        """
+        tracker = TokenUsageTracker(staleness=60)
+        keys = [self.get_key(name) for name in ["user1", "user2", "user3"]]
+
+        for key in keys + keys:
+            tracker.touch(key)
+        self.assertEqual(len(tracker), 3)
+        self.assertEqual(TokenUsage.objects.count(), 0)
+
+        with self.assertNumQueries(4):
+            self.assertEqual(tracker.flush(now=timezone.now()), 3)
+        self.assertEqual(TokenUsage.objects.count(), 3)
+
+        usage = TokenUsage.objects.get(token_id=keys[0])
+        self.assertFalse(tracker.touch(keys[0], last_used=usage.last_used))
+        self.assertEqual(len(tracker), 0)
+
+    def test_expired_tokens_are_refused(self):
+        """
+        Ensure tokens past their idle timeout or maximum age are refused and
+        deleted, and a new token is issued on the next sign in
+        """
+        auth = BearerAuthentication()
+
+        key = self.get_key("user1")
+        Token.objects.filter(key=key).update(created=self.long_ago)
+        with self.assertRaisesMessage(AuthenticationFailed, "Token expired."):
+            auth.authenticate_credentials(key)
+        self.assertFalse(Token.objects.filter(key=key).exists())
+
+        key = self.get_key("user2")
+        TokenUsage.objects.create(
+            token_id=key, last_used=timezone.now() - dt.timedelta(days=8)
+        )
+        with self.assertRaises(AuthenticationFailed):
+            auth.authenticate_credentials(key)
+
+        key = self.get_key("user3")
+        user, token = auth.authenticate_credentials(key)
+        self.assertEqual(user.username, "user3")
+
+        response = self.client.post(
+            reverse("api-token"),
+            {"username": "user1", "password": "Pass1234"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["token"], self.get_key("user1"))
+
+    def test_rotate_token(self):
+        """
+        Ensure a token can be replaced by a new one
+        """
+        key = self.get_key("user1")
+        response = self.client.post(
+            reverse("api-token-rotate"), HTTP_AUTHORIZATION=f"Bearer {key}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.json()["token"], key)
+        self.assertEqual(response.json()["token"], self.get_key("user1"))
+
+        response = self.client.post(
+            reverse("api-token-rotate"), HTTP_AUTHORIZATION=f"Bearer {key}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purge_expired_tokens(self):
+        """
+        Ensure expired tokens are deleted in bulk and others kept
+        """
+        Token.objects.filter(user__username="user1").update(created=self.long_ago)
+        TokenUsage.objects.create(
+            token_id=self.get_key("user2"),
+            last_used=timezone.now() - dt.timedelta(days=8),
+        )
+        TokenUsage.objects.create(
+            token_id=self.get_key("user3"), last_used=timezone.now()
+        )
+
+        self.assertEqual(purge_expired_tokens(), 2)
+        self.assertEqual(
+            list(Token.objects.values_list("user__username", flat=True)), ["user3"]
+        )
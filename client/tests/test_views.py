@@ -4,9 +4,10 @@ from django.contrib.auth.models import Group
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from client.models import MyUser
+from client.models import MyUser, ResetCode
+from client.reset_codes import issue_reset_code, purge_expired_reset_codes
 
-from random import randint
+import datetime as dt
 
 
 class ListRetrieveDestroyUsersViewTests(APITestCase):
@@ -321,36 +322,75 @@ class ForgotAndResetPasswordViewTests(APITestCase):
         user = MyUser.objects.get(email=email)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsNotNone(user.reset_code)
+        self.assertEqual(user.reset_codes.count(), 1)
+
+        # A new request replaces the previous code
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(user.reset_codes.count(), 1)
 
     def test_reset_password(self):
         url = reverse("client_reset_password")
         user = MyUser.objects.get(username="p.user1")
+        reset_code = issue_reset_code(user)
 
-        if user.reset_code in [None, ""]:
-            reset_code = randint(111111, 999999)
-            user.reset_code = reset_code
-            user.save()
-
+        # The email is required
         data = {"new_password": "Secret1234", "reset_code": reset_code}
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+        data = dict(data, email=user.email)
         response = self.client.post(url, data, format="json")
         user = MyUser.objects.get(username="p.user1")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsNone(user.reset_code)
+        self.assertEqual(user.reset_codes.count(), 0)
         self.assertIs(user.check_password("Pass1234"), False)
         self.assertIs(user.check_password("Secret1234"), True)
         self.assertIs(user.check_password("RandPass1234"), False)
 
         # Send wrong reset code
-        data = {"new_password": "Secret1234", "reset_code": reset_code}
-
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-        # TODO
-        # Two accounts with same reset code
+    def test_reset_code_attempts_and_expiry(self):
+        """
+        Ensure codes only work with their user's email, stop working after
+        too many wrong guesses, or once expired, and expired codes are purged
+        """
+        url = reverse("client_reset_password")
+        user = MyUser.objects.get(username="p.user1")
+        reset_code = issue_reset_code(user)
+        self.assertNotEqual(ResetCode.objects.get(user=user).code_hash, str(reset_code))
+
+        wrong_code = 111111 if reset_code != 111111 else 111112
+        data = {"email": "notfound@myapp.com", "new_password": "Secret1234"}
+        response = self.client.post(
+            url, dict(data, reset_code=reset_code), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        data = dict(data, email=user.email)
+        for _ in range(5):
+            response = self.client.post(
+                url, dict(data, reset_code=wrong_code), format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            url, dict(data, reset_code=reset_code), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ResetCode.objects.filter(user=user).exists())
+
+        issue_reset_code(user, lifetime=60)
+        self.assertEqual(purge_expired_reset_codes(), 0)
+        self.assertEqual(
+            purge_expired_reset_codes(
+                now=ResetCode.objects.get(user=user).expires_at
+                + dt.timedelta(seconds=1)
+            ),
+            1,
+        )
 
 
 class ListCreateRetrieveUpdateDestroyGroupViewTests(APITestCase):
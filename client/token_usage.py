@@ -0,0 +1,226 @@
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Case, DateTimeField, Q, Value, When
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from client.models import TokenUsage
+from mylib.flusher import PeriodicFlusher
+
+import datetime as dt
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_expiry(token, last_used):
+    """
+    When `token` stops working: TOKEN_IDLE_TIMEOUT after `last_used`
+    (or its creation), capped at TOKEN_MAX_AGE after its creation.
+    Returns None if it never expires.
+    """
+    limits = []
+    if settings.TOKEN_IDLE_TIMEOUT is not None:
+        limits.append(
+            (last_used or token.created)
+            + dt.timedelta(seconds=settings.TOKEN_IDLE_TIMEOUT)
+        )
+    if settings.TOKEN_MAX_AGE is not None:
+        limits.append(token.created + dt.timedelta(seconds=settings.TOKEN_MAX_AGE))
+
+    return min(limits) if limits else None
+
+
+def get_expired_tokens(now=None):
+    now = now or timezone.now()
+    expired = Q(pk__in=[])
+
+    if settings.TOKEN_IDLE_TIMEOUT is not None:
+        idle_since = now - dt.timedelta(seconds=settings.TOKEN_IDLE_TIMEOUT)
+        expired |= Q(usage__last_used__lt=idle_since)
+        expired |= Q(usage__isnull=True, created__lt=idle_since)
+    if settings.TOKEN_MAX_AGE is not None:
+        expired |= Q(created__lt=now - dt.timedelta(seconds=settings.TOKEN_MAX_AGE))
+
+    return Token.objects.filter(expired)
+
+
+def purge_expired_tokens(now=None):
+    """
+    Delete every expired token in bulk.
+    Returns the number of tokens deleted.
+    """
+    _, deleted = get_expired_tokens(now).delete()
+    return deleted.get(Token._meta.label, 0)
+
+
+def rotate_token(user):
+    """
+    Replace the user's token with a new one.
+    """
+    Token.objects.filter(user=user).delete()
+    return Token.objects.create(user=user)
+
+
+def get_valid_token(user, now=None):
+    """
+    Return the user's token, or a new one if it has expired or is missing.
+    """
+    now = now or timezone.now()
+    token = Token.objects.select_related("usage").filter(user=user).first()
+    if token is None:
+        return Token.objects.create(user=user)
+
+    try:
+        last_used = token.usage.last_used
+    except TokenUsage.DoesNotExist:
+        last_used = None
+    last_used = get_token_usage_tracker().last_used(token.key, last_used)
+
+    expiry = get_expiry(token, last_used)
+    if expiry is not None and expiry <= now:
+        return rotate_token(user)
+
+    return token
+
+
+class TokenUsageTracker(PeriodicFlusher):
+    """
+    Coalesces TokenUsage.last_used writes.
+
+    Requests only record a last-used time in memory. Tokens whose stored
+    last_used is older than the staleness window are marked dirty and
+    written together each flush, which also sweeps expired tokens every
+    sweep_interval seconds.
+    """
+
+    thread_name = "token-usage-tracker"
+
+    def __init__(
+        self, staleness=60, flush_interval=30, sweep_interval=3600, batch_size=500
+    ):
+        super().__init__(flush_interval=flush_interval)
+
+        self.staleness = dt.timedelta(seconds=staleness)
+        self.sweep_interval = sweep_interval
+        self.batch_size = batch_size
+
+        self._pending = {}
+        self._last_sweep = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def last_used(self, key, default=None):
+        """
+        The pending last-used time of the token, or default.
+        """
+        return self._pending.get(key, default)
+
+    def touch(self, key, last_used=None, now=None):
+        """
+        Record a use of the token `key` whose stored last-used time is
+        `last_used`. Returns True if it was marked for the next flush.
+        """
+        now = now or timezone.now()
+
+        with self._lock:
+            if key in self._pending:
+                self._pending[key] = now
+                return True
+
+            if last_used is not None and now - last_used < self.staleness:
+                return False
+
+            self._pending[key] = now
+
+        return True
+
+    def discard(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def flush(self, now=None):
+        """
+        Write pending last-used times, one INSERT of missing rows and one
+        UPDATE per batch_size tokens, then sweep expired tokens if due.
+        Returns the number of tokens updated.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        items = list(pending.items())
+        updated = 0
+
+        for start in range(0, len(items), self.batch_size):
+            end = start + self.batch_size
+            batch = dict(items[start:end])
+
+            try:
+                # Tokens may have been deleted since they were used
+                keys = list(
+                    Token.objects.filter(key__in=batch).values_list("key", flat=True)
+                )
+                TokenUsage.objects.bulk_create(
+                    [TokenUsage(token_id=key, last_used=batch[key]) for key in keys],
+                    ignore_conflicts=True,
+                )
+                last_used = Case(
+                    *[When(token_id=key, then=Value(batch[key])) for key in keys],
+                    output_field=DateTimeField(),
+                )
+                updated += TokenUsage.objects.filter(token_id__in=keys).update(
+                    last_used=last_used
+                )
+            except DatabaseError:
+                logger.exception("Failed to update last use of %s tokens.", len(batch))
+
+        self.sweep(now)
+
+        return updated
+
+    def sweep(self, now=None):
+        """
+        Purge expired tokens if sweep_interval has passed since the last sweep.
+        """
+        now = now or timezone.now()
+        if self._last_sweep is not None and (
+            now - self._last_sweep < dt.timedelta(seconds=self.sweep_interval)
+        ):
+            return 0
+
+        self._last_sweep = now
+        try:
+            return purge_expired_tokens(now)
+        except DatabaseError:
+            logger.exception("Failed to purge expired tokens.")
+            return 0
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_token_usage_tracker():
+    """
+    Return the process-wide tracker configured from settings, starting its
+    background thread on first use when TOKEN_USAGE_AUTOFLUSH is on.
+    """
+    global _tracker
+
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = TokenUsageTracker(
+                    staleness=settings.TOKEN_USAGE_STALENESS,
+                    flush_interval=settings.TOKEN_USAGE_FLUSH_INTERVAL,
+                    sweep_interval=settings.TOKEN_SWEEP_INTERVAL,
+                )
+                if settings.TOKEN_USAGE_AUTOFLUSH:
+                    _tracker.start()
+
+    return _tracker
@@ -0,0 +1,195 @@
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import IntegrityError, router
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from rest_framework import exceptions
+
+from client.models import MyUser, RevokedToken
+from mylib import token as signing
+
+import datetime as dt
+import threading
+import uuid
+
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class RevocationList(object):
+    """
+    Revoked refresh token ids.
+
+    Ids revoked or seen by this process are answered from memory, others
+    with one indexed lookup, so a token revoked by another process is still
+    refused. Entries are forgotten once the token would have expired anyway.
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti):
+        with self._lock:
+            if jti in self._revoked:
+                return True
+
+        expires_at = (
+            RevokedToken.objects.filter(jti=jti)
+            .values_list("expires_at", flat=True)
+            .first()
+        )
+        if expires_at is None:
+            return False
+
+        with self._lock:
+            self._revoked[jti] = expires_at
+        return True
+
+    def add(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+        try:
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            pass
+
+        self.purge()
+
+    def purge(self, now=None):
+        now = now or timezone.now()
+
+        with self._lock:
+            self._revoked = {
+                jti: expires_at
+                for jti, expires_at in self._revoked.items()
+                if expires_at > now
+            }
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+
+
+revoked_tokens = RevocationList()
+
+
+def get_password_fingerprint(user):
+    # Changes when the password does, so refresh tokens die with the old one
+    return salted_hmac("client.tokens", user.password).hexdigest()[:16]
+
+
+def issue_token_pair(user):
+    """
+    Sign a short-lived access token carrying the user's id, role and the
+    flags permissions check, and a refresh token to get the next one.
+    """
+    role = user.role
+    access = signing.encode(
+        {
+            "type": ACCESS,
+            "user_id": user.id,
+            "role_id": role.id if role else None,
+            "role": role.name if role else None,
+            "is_staff": user.is_staff,
+            "is_active": user.is_active,
+        },
+        expiration_seconds=settings.ACCESS_TOKEN_LIFETIME,
+    )
+    refresh = signing.encode(
+        {
+            "type": REFRESH,
+            "user_id": user.id,
+            "jti": uuid.uuid4().hex,
+            "pwd": get_password_fingerprint(user),
+        },
+        expiration_seconds=settings.REFRESH_TOKEN_LIFETIME,
+    )
+
+    return {
+        "access": access,
+        "refresh": refresh,
+        "expires_in": settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def decode_token(str_token, token_type):
+    payload = signing.decode(str_token)
+    data = payload.get("data")
+
+    if "error" in payload or not isinstance(data, dict):
+        raise exceptions.AuthenticationFailed(payload.get("error", "Invalid token."))
+    if data.get("type") != token_type:
+        raise exceptions.AuthenticationFailed("Invalid token type.")
+
+    return payload
+
+
+def get_access_token_user(str_token):
+    """
+    Build the request user from a signed access token without a query.
+
+    Only the id, the role, is_staff, is_active and last_activity (the token's
+    issue time) are loaded, so permission checks need no query. Other fields
+    load on first access, and save() only writes the fields that were loaded
+    or set, so claims cannot overwrite newer data.
+    """
+    payload = decode_token(str_token, ACCESS)
+    data = payload["data"]
+
+    loaded = {
+        "id": data["user_id"],
+        "last_activity": dt.datetime.fromtimestamp(payload["iat"], dt.timezone.utc),
+    }
+    for name in ["is_staff", "is_active"]:
+        # Tokens signed before these claims were added load them on access
+        if name in data:
+            loaded[name] = data[name]
+
+    # from_db() takes the values in the model's field order
+    field_names = [
+        f.attname for f in MyUser._meta.concrete_fields if f.attname in loaded
+    ]
+    values = [loaded[name] for name in field_names]
+
+    user = MyUser.from_db(router.db_for_read(MyUser), field_names, values)
+    role = None
+    if data.get("role_id") is not None:
+        role = Group(id=data["role_id"], name=data["role"])
+    MyUser.role.field.set_cached_value(user, role)
+
+    return user
+
+
+def refresh_token_pair(str_token):
+    """
+    Revoke a refresh token and issue a new pair for its user.
+    """
+    payload = decode_token(str_token, REFRESH)
+    data = payload["data"]
+
+    if data["jti"] in revoked_tokens:
+        raise exceptions.AuthenticationFailed("Token revoked.")
+
+    user = (
+        MyUser.objects.select_related("role")
+        .filter(id=data["user_id"], is_active=True)
+        .first()
+    )
+    if user is None or data.get("pwd") != get_password_fingerprint(user):
+        raise exceptions.AuthenticationFailed("Token revoked.")
+
+    revoke_refresh_token(str_token, payload=payload)
+    return issue_token_pair(user)
+
+
+def revoke_refresh_token(str_token, payload=None):
+    payload = payload or decode_token(str_token, REFRESH)
+    revoked_tokens.add(
+        payload["data"]["jti"],
+        dt.datetime.fromtimestamp(payload["exp"], dt.timezone.utc),
+    )
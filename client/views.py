@@ -1,6 +1,9 @@
 from django.contrib.auth.models import Group
 
 from rest_framework import generics, status
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.serializers import AuthTokenSerializer
+from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -14,10 +17,18 @@ from client.serializers import (
     ChangePasswordSerializer,
     ForgotPasswordSerializer,
     ResetPasswordserializer,
+    SignedRefreshTokenSerializer,
 )
-from mylib.common import MySendEmail, MyCustomException
+from client.outbox.sender import queue_email
+from client.reset_codes import issue_reset_code
+from client.token_usage import get_valid_token, rotate_token
+from client.tokens import issue_token_pair, refresh_token_pair, revoke_refresh_token
+from mylib.common import MyCustomException
 
-from random import randint
+import logging
+
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
 
@@ -114,11 +125,8 @@ class ForgotPasswordAPIView(APIView):
         if users.count() == 0:
             raise MyCustomException("No account associated with email.")
 
-        reset_code = randint(111111, 999999)
-
         user = users[0]
-        user.reset_code = reset_code
-        user.save()
+        reset_code = issue_reset_code(user)
 
         name = user.first_name
 
@@ -130,14 +138,14 @@ class ForgotPasswordAPIView(APIView):
             Good DAY.
             """
 
-            MySendEmail("Password Reset Code", message, [email])
+            queue_email("Password Reset Code", message, [email])
 
             return Response(
                 {"detail": "Reset code sent successfully."}, status=status.HTTP_200_OK
             )
 
-        except Exception as e:
-            print(e)
+        except Exception:
+            logger.exception("Failed to queue the reset code email.")
 
             return Response(
                 {"detail": "Failed to send email."},
@@ -153,25 +161,92 @@ class ResetPasswordAPIView(generics.UpdateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        cls = list(
-            MyUser.objects.filter(
-                reset_code=serializer.validated_data.get("reset_code")
-            )
+        user = serializer.validated_data["user"]
+        self.object = user.id
+
+        user.set_password(serializer.validated_data["new_password"])
+        user.save()
+        user.reset_codes.all().delete()
+
+        return Response(
+            {"detail": "Password reset successful."}, status=status.HTTP_200_OK
         )
 
-        if not len(cls) > 0:
-            raise MyCustomException("User not Found")
 
-        self.object = cls[0].id
-        new_password = serializer.data.get("new_password")
+class ObtainExpiringAuthTokenAPIView(ObtainAuthToken):
+    """
+    Exchange a username and password for the user's API token,
+    replacing it first if it has expired.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        cls[0].set_password(new_password)
-        cls[0].reset_code = None
-        cls[0].save()
+        token = get_valid_token(serializer.validated_data["user"])
+        return Response({"token": token.key})
 
-        return Response(
-            {"detail": "Password reset successful."}, status=status.HTTP_200_OK
+
+class RotateAuthTokenAPIView(APIView):
+    """
+    Replace the API token used for this request with a new one.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    def post(self, request, format=None):
+        if not isinstance(request.auth, Token):
+            raise MyCustomException("Only API tokens can be rotated.")
+
+        token = rotate_token(request.user)
+        return Response({"token": token.key})
+
+
+class SignedTokenAPIView(APIView):
+    # Credentials come in the body, ignore any (possibly expired) auth header
+    authentication_classes = []
+    permission_classes = []
+
+    def get_authenticate_header(self, request):
+        # Answer bad tokens with 401 rather than 403
+        return "Bearer"
+
+
+class ObtainSignedTokenAPIView(SignedTokenAPIView):
+    """
+    Exchange a username and password for a signed access and refresh token.
+    """
+
+    def post(self, request, format=None):
+        serializer = AuthTokenSerializer(
+            data=request.data, context={"request": request}
         )
+        serializer.is_valid(raise_exception=True)
+
+        return Response(issue_token_pair(serializer.validated_data["user"]))
+
+
+class RefreshSignedTokenAPIView(SignedTokenAPIView):
+    """
+    Exchange a refresh token for a new token pair, revoking the old one.
+    """
+
+    def post(self, request, format=None):
+        serializer = SignedRefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(refresh_token_pair(serializer.validated_data["refresh"]))
+
+
+class RevokeSignedTokenAPIView(SignedTokenAPIView):
+    def post(self, request, format=None):
+        serializer = SignedRefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        revoke_refresh_token(serializer.validated_data["refresh"])
+        return Response({"detail": "Token revoked."})
 
 
 class ListCreateGroupAPIView(generics.ListCreateAPIView):
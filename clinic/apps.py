@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ClinicConfig(AppConfig):
     name = 'clinic'
+
+    def ready(self):
+        # Connect the slot inventory regeneration and calendar cache signals
+        import clinic.slot_inventory  # noqa: F401
+        import clinic.month_calendar  # noqa: F401
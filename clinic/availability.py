@@ -0,0 +1,312 @@
+from django.db.models import Count, F
+from django.utils import timezone
+
+from clinic.models import Appointment, DoctorSchedule, SlotHold, TimeSlot
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+import heapq
+import datetime as dt
+
+
+# Appointments can only be booked this far ahead of now
+BOOKING_NOTICE = dt.timedelta(hours=3)
+
+
+def earliest_appointment_time():
+    return timezone.now() + BOOKING_NOTICE
+
+
+class SlotAvailability(object):
+    """
+    A doctor's time slot on one date, with the number of places already
+    taken in it by appointments or slot holds.
+    """
+
+    def __init__(self, slot, start, end, booked=0):
+        self.slot = slot
+        self.start = start
+        self.end = end
+        self.booked = booked
+
+    @property
+    def doctor(self):
+        return self.slot.doctor_id
+
+    @property
+    def capacity(self):
+        return self.slot.number_of_appointments
+
+    @property
+    def remaining(self):
+        return max(self.capacity - self.booked, 0)
+
+    @property
+    def is_full(self):
+        return self.remaining == 0
+
+    def __repr__(self):
+        return f"<SlotAvailability {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M} {self.booked}/{self.capacity}>"
+
+
+def has_schedule(doctor):
+    return DoctorSchedule.objects.filter(doctor=doctor).exists()
+
+
+def get_doctors_weekly_slots(doctors):
+    """
+    Return the time slots of each of `doctors` keyed by doctor id, then by
+    lowercase schedule day, each list in start time order, from one query.
+    """
+    slots = (
+        TimeSlot.objects.filter(doctorschedule__doctor__in=doctors)
+        .annotate(
+            day=F("doctorschedule__day"), schedule_doctor=F("doctorschedule__doctor")
+        )
+        .order_by("start_time", "id")
+    )
+
+    weekly = defaultdict(lambda: defaultdict(list))
+    for slot in slots:
+        weekly[slot.schedule_doctor][slot.day.lower()].append(slot)
+
+    return weekly
+
+
+def get_weekly_slots(doctor):
+    """
+    Return the doctor's time slots keyed by lowercase schedule day, each
+    list in start time order, from one query.
+    """
+    doctor = getattr(doctor, "pk", doctor)
+    return get_doctors_weekly_slots([doctor])[doctor]
+
+
+def get_booked_rows(doctors, start, end, exclude=None):
+    """
+    Count the places taken in the slots of `doctors`, ids, from `start` to
+    `end`, both included: their appointments, except canceled ones and the
+    appointment `exclude`, and their unexpired slot holds. Returns
+    {"doctor", "date_of_appointment", "booked"} rows grouped by date, in
+    doctor then date order, from one query.
+    """
+    appointments = Appointment.objects.filter(
+        doctor__in=doctors,
+        date_of_appointment__gte=start,
+        date_of_appointment__lte=end,
+    ).exclude(status="CANCELED")
+    if exclude is not None:
+        appointments = appointments.exclude(id=exclude)
+    holds = SlotHold.objects.filter(
+        doctor__in=doctors,
+        date_of_appointment__gte=start,
+        date_of_appointment__lte=end,
+        expires_at__gt=timezone.now(),
+    )
+
+    return (
+        appointments.order_by()
+        .values("doctor", "date_of_appointment")
+        .annotate(booked=Count("id"))
+        .union(
+            holds.order_by()
+            .values("doctor", "date_of_appointment")
+            .annotate(booked=Count("id")),
+            all=True,
+        )
+        .order_by("doctor", "date_of_appointment")
+    )
+
+
+def _count_windows(rows, windows):
+    """
+    Count the places taken of `rows`, (date, booked) pairs in date order,
+    in each (start, end) window, both ends included.
+    """
+    dates = []
+    totals = [0]
+    for date, booked in rows:
+        dates.append(date)
+        totals.append(totals[-1] + booked)
+
+    return [
+        totals[bisect_right(dates, end)] - totals[bisect_left(dates, start)]
+        for start, end in windows
+    ]
+
+
+def count_in_windows(doctor, windows, exclude=None):
+    """
+    Count the places taken, by appointments or slot holds, in each
+    (start, end) window, both ends included. Those in the whole range are
+    grouped by their date in one query and the windows counted against the
+    sorted dates, so the query stays the same however many windows there are.
+    """
+    if not windows:
+        return []
+
+    rows = get_booked_rows(
+        [getattr(doctor, "pk", doctor)],
+        min(start for start, end in windows),
+        max(end for start, end in windows),
+        exclude=exclude,
+    )
+
+    return _count_windows(
+        [(row["date_of_appointment"], row["booked"]) for row in rows], windows
+    )
+
+
+def _expand(weekly, start_date, end_date):
+    availability = []
+    date = start_date
+    while date <= end_date:
+        for slot in weekly.get(f"{date:%A}".lower(), []):
+            availability.append(
+                SlotAvailability(
+                    slot,
+                    timezone.make_aware(dt.datetime.combine(date, slot.start_time)),
+                    timezone.make_aware(dt.datetime.combine(date, slot.end_time)),
+                )
+            )
+        date += dt.timedelta(days=1)
+
+    return availability
+
+
+def expand_schedule(doctor, start_date, end_date):
+    """
+    Expand the doctor's weekly schedule into the concrete time slots from
+    `start_date` to `end_date`, both included, in time order, with nothing
+    booked yet. Times are in the current time zone. One query.
+    """
+    return _expand(get_weekly_slots(doctor), start_date, end_date)
+
+
+def get_range_availability(doctor, start_date, end_date, exclude=None):
+    """
+    Return the doctor's time slots from `start_date` to `end_date`, as
+    expand_schedule does, with their booked counts. Two queries.
+    """
+    availability = expand_schedule(doctor, start_date, end_date)
+    counts = count_in_windows(
+        doctor, [(slot.start, slot.end) for slot in availability], exclude=exclude
+    )
+    for slot, booked in zip(availability, counts):
+        slot.booked = booked
+
+    return availability
+
+
+def get_doctors_availability(doctors, start_date, end_date):
+    """
+    get_range_availability for many doctors at once: the time slots of each
+    of `doctors`, ids, keyed by doctor id. Doctors without a schedule are
+    left out. Two queries however many doctors.
+    """
+    availability = {
+        doctor: _expand(weekly, start_date, end_date)
+        for doctor, weekly in get_doctors_weekly_slots(doctors).items()
+    }
+    slots = [slot for doctor_slots in availability.values() for slot in doctor_slots]
+    if not slots:
+        return availability
+
+    rows = get_booked_rows(
+        list(availability),
+        min(slot.start for slot in slots),
+        max(slot.end for slot in slots),
+    )
+    booked_by_doctor = defaultdict(list)
+    for row in rows:
+        booked_by_doctor[row["doctor"]].append(
+            (row["date_of_appointment"], row["booked"])
+        )
+
+    for doctor, doctor_slots in availability.items():
+        counts = _count_windows(
+            booked_by_doctor[doctor], [(slot.start, slot.end) for slot in doctor_slots]
+        )
+        for slot, booked in zip(doctor_slots, counts):
+            slot.booked = booked
+
+    return availability
+
+
+def open_slots(slots):
+    """
+    Return the `slots` that still have capacity and can still be booked.
+    """
+    earliest = earliest_appointment_time()
+    return [slot for slot in slots if not slot.is_full and slot.end >= earliest]
+
+
+def find_open_slots(doctor, start_date, end_date, limit=None):
+    """
+    Return up to `limit` of the doctor's open time slots from `start_date`
+    to `end_date`.
+    """
+    return open_slots(get_range_availability(doctor, start_date, end_date))[:limit]
+
+
+def merge_open_slots(doctors, start_date, end_date):
+    """
+    Return an iterator over the open time slots of all `doctors`, ids, from
+    `start_date` to `end_date` in time order. The doctors' slots, each
+    already in time order, are merged lazily rather than sorted together.
+    Two queries however many doctors.
+    """
+    availability = get_doctors_availability(doctors, start_date, end_date)
+    return heapq.merge(
+        *[open_slots(slots) for doctor, slots in sorted(availability.items())],
+        key=lambda slot: (slot.start, slot.doctor),
+    )
+
+
+class DoctorOpenSlots(object):
+    """
+    A doctor with their open time slots, in time order.
+    """
+
+    def __init__(self, doctor, slots):
+        self.doctor = doctor
+        self.slots = slots
+
+    @property
+    def earliest(self):
+        return self.slots[0]
+
+    @property
+    def open_slots(self):
+        return len(self.slots)
+
+    @property
+    def remaining(self):
+        return sum(slot.remaining for slot in self.slots)
+
+
+def search_doctors(doctors, start_date, end_date, limit=None):
+    """
+    Rank `doctors` with open time slots from `start_date` to `end_date` by
+    their earliest one, then by price. Returns DoctorOpenSlots for up to
+    `limit` of them. Three queries however many doctors.
+    """
+    doctors = {doctor.id: doctor for doctor in doctors}
+
+    results = []
+    for doctor, slots in get_doctors_availability(
+        list(doctors), start_date, end_date
+    ).items():
+        slots = open_slots(slots)
+        if slots:
+            results.append(DoctorOpenSlots(doctors[doctor], slots))
+
+    results.sort(
+        key=lambda result: (
+            result.earliest.start,
+            result.doctor.pricing,
+            result.doctor.id,
+        )
+    )
+
+    return results[:limit]
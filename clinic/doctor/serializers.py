@@ -32,7 +32,6 @@ class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = MyUser
         exclude = (
-            "reset_code",
             "confirm_code",
             "changed_password",
             "user_permissions",
@@ -205,6 +204,26 @@ class DoctorScheduleSerializer(serializers.ModelSerializer):
         }
 
 
+class SlotAvailabilitySerializer(serializers.Serializer):
+    doctor = serializers.IntegerField(read_only=True)
+    time_slot = serializers.IntegerField(source="slot.id", read_only=True)
+    start = serializers.DateTimeField(read_only=True)
+    end = serializers.DateTimeField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
+    booked = serializers.IntegerField(read_only=True)
+    remaining = serializers.IntegerField(read_only=True)
+
+
+class DoctorOpenSlotsSerializer(serializers.Serializer):
+    doctor = serializers.IntegerField(source="doctor.id", read_only=True)
+    name = serializers.CharField(source="doctor", read_only=True)
+    speciality = serializers.CharField(source="doctor.speciality", read_only=True)
+    pricing = serializers.FloatField(source="doctor.pricing", read_only=True)
+    open_slots = serializers.IntegerField(read_only=True)
+    remaining = serializers.IntegerField(read_only=True)
+    earliest = SlotAvailabilitySerializer(read_only=True)
+
+
 class SocialMediaSerializer(serializers.ModelSerializer):
     class Meta:
         model = SocialMedia
@@ -20,8 +20,11 @@ from clinic.models import (
     LikedReview,
     Reply,
     LikedReply,
+    Clinic,
 )
 from administrator.models import Speciality
+from clinic.month_calendar import CALENDAR_CACHE
+from clinic.slot_holds import hold_slot
 from clinic.tests.utils import create_user
 
 import datetime as dt
@@ -1805,6 +1808,236 @@ class TimeSlotViewTests(APITestCase):
         self.client.logout()
 
 
+class DoctorAvailabilityViewTests(APITestCase):
+    def setUp(self):
+        """
+        Create a Doctor with a daily one-appointment timeslot
+        to be used through-out this Availability View Tests Case.
+        """
+        self.doctor = Doctor.objects.create(
+            user=create_user(role="DOCTOR"),
+            speciality=Speciality.objects.get_or_create(name="Test")[0],
+        )
+        self.timeslot = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=9, minute=30),
+            end_time=dt.time(hour=10, minute=30),
+            number_of_appointments=1,
+        )
+        for day in DoctorSchedule.DAY:
+            schedule = DoctorSchedule.objects.create(doctor=self.doctor, day=day[0])
+            schedule.time_slot.add(self.timeslot)
+
+    def test_doctor_availability(self):
+        """
+        Ensure any user can list a doctor's open timeslots.
+        """
+        url = reverse("doctor:doctor_availability", args=(self.doctor.id,))
+        start = dt.date.today() + dt.timedelta(days=7)
+        params = {"from": f"{start}", "to": f"{start + dt.timedelta(days=2)}"}
+        Appointment.objects.create(
+            doctor=self.doctor,
+            patient=Patient.objects.create(user=create_user(name="patient1")),
+            purpose="tooth replacement",
+            status="WAITING",
+            date_of_appointment=timezone.make_aware(
+                dt.datetime.combine(start, self.timeslot.start_time)
+            ),
+        )
+
+        # Test if unautheticated user cannot list
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Test if user can list open timeslots, fully booked ones left out
+        user = create_user()
+        self.client.login(username=user.username, password="Pass1234")
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            [result["start"][:10] for result in results],
+            [f"{start + dt.timedelta(days=1)}", f"{start + dt.timedelta(days=2)}"],
+        )
+        self.assertEqual(results[0]["time_slot"], self.timeslot.id)
+        self.assertEqual(results[0]["remaining"], 1)
+
+        # Test if limit is applied
+        response = self.client.get(url, dict(params, limit=1))
+        self.assertEqual(len(response.json()["results"]), 1)
+
+        # Test if invalid parameters are refused
+        for invalid in [
+            {"from": "tomorrow"},
+            {"limit": 0},
+            {"from": params["to"], "to": params["from"]},
+            {"to": f"{start + dt.timedelta(days=100)}"},
+        ]:
+            response = self.client.get(url, dict(params, **invalid))
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Test if unknown doctor is not found
+        url = reverse("doctor:doctor_availability", args=(0,))
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.logout()
+
+    def test_held_slot_not_available(self):
+        """
+        Ensure a timeslot fully held by a patient is not listed as open.
+        """
+        url = reverse("doctor:doctor_availability", args=(self.doctor.id,))
+        start = dt.date.today() + dt.timedelta(days=7)
+        params = {"from": f"{start}", "to": f"{start + dt.timedelta(days=1)}"}
+        hold_slot(
+            Patient.objects.create(user=create_user(name="patient1")),
+            self.doctor,
+            timezone.make_aware(dt.datetime.combine(start, self.timeslot.start_time)),
+        )
+
+        user = create_user()
+        self.client.login(username=user.username, password="Pass1234")
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["start"][:10] for result in response.json()["results"]],
+            [f"{start + dt.timedelta(days=1)}"],
+        )
+        self.client.logout()
+
+    def test_doctor_calendar(self):
+        """
+        Ensure any user can get a doctor's month calendar.
+        """
+        CALENDAR_CACHE.clear()
+        url = reverse("doctor:doctor_calendar", args=(self.doctor.id,))
+        Appointment.objects.create(
+            doctor=self.doctor,
+            patient=Patient.objects.create(user=create_user(name="patient1")),
+            purpose="tooth replacement",
+            status="WAITING",
+            date_of_appointment=timezone.make_aware(dt.datetime(2026, 2, 10, hour=10)),
+        )
+
+        # Test if unautheticated user cannot get it
+        response = self.client.get(url, {"month": "2026-02"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Test if user can get a day per date of the month
+        user = create_user()
+        self.client.login(username=user.username, password="Pass1234")
+        response = self.client.get(url, {"month": "2026-02"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["month"], "2026-02")
+        days = response.json()["days"]
+        self.assertEqual(len(days), 28)
+        self.assertEqual(
+            days[9],
+            {
+                "date": "2026-02-10",
+                "capacity": 1,
+                "booked": 1,
+                "held": 0,
+                "statuses": {"WAITING": 1},
+            },
+        )
+
+        # Test if the current month is the default one
+        response = self.client.get(url)
+        self.assertEqual(response.json()["month"], f"{timezone.localdate():%Y-%m}")
+
+        # Test if invalid month is refused
+        response = self.client.get(url, {"month": "2026-13"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Test if unknown doctor is not found
+        url = reverse("doctor:doctor_calendar", args=(0,))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.logout()
+
+
+class SearchDoctorAvailabilityViewTests(APITestCase):
+    def setUp(self):
+        """
+        Create Doctors with a daily timeslot, one in a Nairobi clinic,
+        to be used through-out this Availability Search View Tests Case.
+        """
+        speciality = Speciality.objects.get_or_create(name="Cardiology")[0]
+        self.doctors = []
+        for pricing in [2000, 1000]:
+            doctor = Doctor.objects.create(
+                user=create_user(role="DOCTOR"), speciality=speciality, pricing=pricing
+            )
+            timeslot = TimeSlot.objects.create(
+                doctor=doctor,
+                start_time=dt.time(hour=9, minute=30),
+                end_time=dt.time(hour=10, minute=30),
+            )
+            for day in DoctorSchedule.DAY:
+                schedule = DoctorSchedule.objects.create(doctor=doctor, day=day[0])
+                schedule.time_slot.add(timeslot)
+            self.doctors.append(doctor)
+
+        clinic = Clinic.objects.create(
+            user=create_user(),
+            name="test clinic",
+            phone="0798976234",
+            email="heart@myapp.com",
+            town="Nairobi",
+        )
+        clinic.doctors.add(self.doctors[0])
+
+        start = dt.date.today() + dt.timedelta(days=7)
+        self.params = {
+            "speciality": speciality.id,
+            "from": f"{start}",
+            "to": f"{start + dt.timedelta(days=2)}",
+        }
+
+    def test_search_doctor_availability(self):
+        """
+        Ensure any user can search available doctors.
+        """
+        url = reverse("doctor:doctor_availability_search")
+
+        # Test if unautheticated user cannot search
+        response = self.client.get(url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Test if user can search, cheaper doctor first on a tie
+        user = create_user()
+        self.client.login(username=user.username, password="Pass1234")
+        response = self.client.get(url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["doctor"] for result in results],
+            [self.doctors[1].id, self.doctors[0].id],
+        )
+        self.assertEqual(results[0]["open_slots"], 3)
+        self.assertEqual(results[0]["earliest"]["start"][:10], self.params["from"])
+
+        # Test if location and price filters are applied
+        response = self.client.get(url, dict(self.params, town="nairobi"))
+        self.assertEqual(
+            [result["doctor"] for result in response.json()["results"]],
+            [self.doctors[0].id],
+        )
+        response = self.client.get(url, dict(self.params, max_price=1500))
+        self.assertEqual(
+            [result["doctor"] for result in response.json()["results"]],
+            [self.doctors[1].id],
+        )
+
+        # Test if speciality is required
+        params = {"from": self.params["from"]}
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
+
+
 class SocialMediaViewTests(APITestCase):
     def setUp(self):
         pass
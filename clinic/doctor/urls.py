@@ -24,11 +24,26 @@ app_name = "doctor"
 
 urlpatterns = [
     path("", views.ListCreateDoctor.as_view(), name="doctor_list_create"),
+    path(
+        "availability/",
+        views.SearchDoctorAvailability.as_view(),
+        name="doctor_availability_search",
+    ),
     path(
         "<int:pk>/",
         views.RetrieveUpdateDestroyDoctor.as_view(),
         name="doctor_retrieve_update",
     ),
+    path(
+        "<int:doctor_pk>/availability/",
+        views.DoctorAvailability.as_view(),
+        name="doctor_availability",
+    ),
+    path(
+        "<int:doctor_pk>/calendar/",
+        views.DoctorCalendar.as_view(),
+        name="doctor_calendar",
+    ),
     path("<int:doctor_pk>/", include(router.urls)),
     path("<int:doctor_pk>/reviews/<int:review_pk>/", include(router2.urls)),
 ]
@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from rest_framework import generics, viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
@@ -27,7 +29,7 @@ from clinic.models import (
     LikedReply,
     Patient,
 )
-from clinic.viewsets import CreateListRetrieveViewSet
+from clinic.viewsets import AvailabilityQueryMixin, CreateListRetrieveViewSet
 from clinic.doctor.serializers import (
     DoctorSerializer,
     EducationSerializer,
@@ -36,7 +38,9 @@ from clinic.doctor.serializers import (
     MembershipSerializer,
     RegistrationSerializer,
     DoctorScheduleSerializer,
+    DoctorOpenSlotsSerializer,
     TimeSlotSerializer,
+    SlotAvailabilitySerializer,
     SocialMediaSerializer,
     ReviewSerializer,
     AppointmentSerializer,
@@ -45,10 +49,18 @@ from clinic.doctor.serializers import (
     LikedReviewSerializer,
     LikedReplySerializer,
 )
-from clinic.utils import validate_appointment_date
+from clinic.availability import find_open_slots, search_doctors
+from clinic.month_calendar import get_month_calendar
+from clinic.slot_inventory import release_slot
+from clinic.utils import reserve_appointment_slot
 
 from mylib.common import MyCustomException
 
+import logging
+
+
+logger = logging.getLogger(__name__)
+
 
 class ListCreateDoctor(generics.ListCreateAPIView):
     queryset = Doctor.objects.all()
@@ -179,7 +191,7 @@ class DoctorScheduleViewSet(viewsets.ModelViewSet):
 
         # Validate only the timeslot belongs to the doctor
         time_slots = serializer.validated_data.get("time_slot")
-        print(time_slots)
+        logger.debug("Schedule time slots: %s", time_slots)
         my_time_slots = TimeSlot.objects.filter(doctor=doctor[0].id)
         for slot in time_slots:
             if slot not in my_time_slots:
@@ -217,6 +229,93 @@ class TimeSlotViewSet(viewsets.ModelViewSet):
         serializer.save(doctor=doctor[0])
 
 
+class DoctorAvailability(AvailabilityQueryMixin, generics.GenericAPIView):
+    """
+    The doctor's time slots with capacity left from ?from= to ?to=
+    (YYYY-MM-DD, both included), the first ?limit= of them.
+    """
+
+    serializer_class = SlotAvailabilitySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        if not Doctor.objects.filter(id=self.kwargs["doctor_pk"]).exists():
+            raise MyCustomException("Error: Doctor not Found", code=404)
+
+        start_date, end_date = self.get_date_range()
+        slots = find_open_slots(
+            self.kwargs["doctor_pk"], start_date, end_date, limit=self.get_limit()
+        )
+        serializer = self.get_serializer(slots, many=True)
+
+        return Response(
+            {"from": start_date, "to": end_date, "results": serializer.data}
+        )
+
+
+class DoctorCalendar(AvailabilityQueryMixin, generics.GenericAPIView):
+    """
+    Every date of the doctor's ?month= (YYYY-MM, the current one by default)
+    with the capacity scheduled, the appointments booked and the number of
+    appointments per status.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        if not Doctor.objects.filter(id=self.kwargs["doctor_pk"]).exists():
+            raise MyCustomException("Error: Doctor not Found", code=404)
+
+        month = self.get_month()
+        days = get_month_calendar(self.kwargs["doctor_pk"], month)
+
+        return Response({"month": f"{month:%Y-%m}", "days": days})
+
+
+class SearchDoctorAvailability(AvailabilityQueryMixin, generics.GenericAPIView):
+    """
+    Doctors of a ?speciality= with time slots open from ?from= to ?to=,
+    earliest available first, optionally only those in a clinic in a ?town=
+    or ?county= and priced from ?min_price= to ?max_price=.
+    """
+
+    serializer_class = DoctorOpenSlotsSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        speciality = self.get_number("speciality")
+        if speciality is None:
+            raise MyCustomException("Error: Choose a 'speciality'.")
+        doctors = Doctor.objects.filter(speciality=speciality)
+
+        town = self.request.query_params.get("town", None)
+        if town:
+            doctors = doctors.filter(clinic__town__iexact=town)
+        county = self.request.query_params.get("county", None)
+        if county:
+            doctors = doctors.filter(clinic__county__iexact=county)
+
+        min_price = self.get_number("min_price", cast=float)
+        if min_price is not None:
+            doctors = doctors.filter(pricing__gte=min_price)
+        max_price = self.get_number("max_price", cast=float)
+        if max_price is not None:
+            doctors = doctors.filter(pricing__lte=max_price)
+
+        return doctors.distinct().select_related("user", "speciality")
+
+    def get(self, request, *args, **kwargs):
+        start_date, end_date = self.get_date_range()
+        results = search_doctors(
+            self.get_queryset(), start_date, end_date, limit=self.get_limit()
+        )
+        serializer = self.get_serializer(results, many=True)
+
+        return Response(
+            {"from": start_date, "to": end_date, "results": serializer.data}
+        )
+
+
 class SocialMediaViewSet(viewsets.ModelViewSet):
     queryset = SocialMedia.objects.all()
     serializer_class = SocialMediaSerializer
@@ -267,13 +366,19 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
             if doctor.count() < 1:
                 raise MyCustomException("Error: Doctor does not Exist.")
             date_time = serializer.validated_data.get("date_of_appointment", None)
-            if date_time is not None:
-                valid_date = validate_appointment_date(doctor[0].id, date_time)
-                if valid_date["validated"] is False:
-                    raise MyCustomException(valid_date["message"])
-            serializer.save(
-                doctor=doctor[0], status="WAITING", amount=doctor[0].pricing
-            )
+            with transaction.atomic():
+                slot = None
+                if date_time is not None:
+                    valid_date = reserve_appointment_slot(doctor[0].id, date_time)
+                    if valid_date["validated"] is False:
+                        raise MyCustomException(valid_date["message"])
+                    slot = valid_date["slot"]
+                serializer.save(
+                    doctor=doctor[0],
+                    status="WAITING",
+                    amount=doctor[0].pricing,
+                    slot=slot,
+                )
         elif user.role.name == "PATIENT":
             patients = Patient.objects.filter(user=user.id)
             if patients.count() < 1:
@@ -283,16 +388,20 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
             if doctors.count() < 1:
                 raise MyCustomException("Error: Doctor not Found")
             date_time = serializer.validated_data.get("date_of_appointment", None)
-            if date_time is not None:
-                valid_date = validate_appointment_date(doctors[0].id, date_time)
-                if valid_date["validated"] is False:
-                    raise MyCustomException(valid_date["message"])
-            serializer.save(
-                patient=patients[0],
-                doctor=doctors[0],
-                status="WAITING",
-                amount=doctors[0].pricing,
-            )
+            with transaction.atomic():
+                slot = None
+                if date_time is not None:
+                    valid_date = reserve_appointment_slot(doctors[0].id, date_time)
+                    if valid_date["validated"] is False:
+                        raise MyCustomException(valid_date["message"])
+                    slot = valid_date["slot"]
+                serializer.save(
+                    patient=patients[0],
+                    doctor=doctors[0],
+                    status="WAITING",
+                    amount=doctors[0].pricing,
+                    slot=slot,
+                )
         else:
             raise MyCustomException(
                 "Error: You don't have permissions to create Appointments."
@@ -342,8 +451,10 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
                     f"Error: This appointments has already been {instance.status}."
                 )
 
-            instance.status = "CANCELED"
-            instance.save()
+            with transaction.atomic():
+                release_slot(instance)
+                instance.status = "CANCELED"
+                instance.save()
             # TODO
             # Notify doc change in date of appointment
 
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from clinic.models import DoctorSchedule
+from clinic.slot_inventory import regenerate_slots
+
+
+class Command(BaseCommand):
+    help = "Generate every doctor's bookable slots for the next --days days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.SLOT_INVENTORY_DAYS)
+
+    def handle(self, *args, **options):
+        doctors = (
+            DoctorSchedule.objects.order_by("doctor_id")
+            .values_list("doctor", flat=True)
+            .distinct()
+        )
+        created = sum(
+            regenerate_slots(doctor, days=options["days"]) for doctor in doctors
+        )
+        self.stdout.write(self.style.SUCCESS(f"Generated {created} slots."))
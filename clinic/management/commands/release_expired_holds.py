@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from clinic.slot_inventory import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Delete expired slot holds and give their places back to their slots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.SLOT_HOLD_SWEEP_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        released = release_expired_holds(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Released {released} expired holds."))
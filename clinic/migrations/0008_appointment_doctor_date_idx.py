@@ -0,0 +1,20 @@
+# Generated by Django 3.2.18 on 2026-10-16 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0007_auto_20230303_1111"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["doctor", "date_of_appointment"],
+                name="appointment_doctor_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 3.2.18 on 2026-10-16 21:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0008_appointment_doctor_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlotInstance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("start", models.DateTimeField(verbose_name="Start")),
+                ("end", models.DateTimeField(verbose_name="End")),
+                ("capacity", models.IntegerField(default=0, verbose_name="Capacity")),
+                ("booked", models.IntegerField(default=0, verbose_name="Booked")),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="clinic.doctor",
+                    ),
+                ),
+                (
+                    "time_slot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="clinic.timeslot",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("start", "id"),
+            },
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="slot",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="appointments",
+                to="clinic.slotinstance",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="slotinstance",
+            index=models.Index(
+                fields=["doctor", "start"], name="slotinstance_doctor_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="slotinstance",
+            constraint=models.UniqueConstraint(
+                fields=("time_slot", "date"), name="slotinstance_slot_date_uniq"
+            ),
+        ),
+    ]
@@ -176,6 +176,52 @@ class TimeSlot(models.Model):
         ordering = ("id",)
 
 
+class SlotInstance(models.Model):
+    """
+    A doctor's time slot on one date, generated from the doctor's schedule
+    by clinic.slot_inventory, counting the appointments booked in it.
+    """
+
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE)
+    time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
+    date = models.DateField("Date")
+    start = models.DateTimeField("Start")
+    end = models.DateTimeField("End")
+    capacity = models.IntegerField("Capacity", default=0)
+    booked = models.IntegerField("Booked", default=0)
+
+    def __str__(self):
+        return "{} {}".format(self.date, self.time_slot)
+
+    class Meta:
+        ordering = ("start", "id")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["time_slot", "date"], name="slotinstance_slot_date_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["doctor", "start"], name="slotinstance_doctor_idx"),
+        ]
+
+
+class SlotHold(models.Model):
+    """
+    A place in a SlotInstance held for a patient until `expires_at`,
+    counted in its booked places, see clinic.slot_holds.
+    """
+
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE)
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE)
+    slot = models.ForeignKey(SlotInstance, on_delete=models.CASCADE)
+    date_of_appointment = models.DateTimeField("Date Of Appointment")
+    expires_at = models.DateTimeField("Expires At", db_index=True)
+    date_created = models.DateTimeField("Date Created", auto_now_add=True)
+
+    class Meta:
+        ordering = ("id",)
+
+
 class SocialMedia(models.Model):
     doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE)
     name = models.CharField("Name", max_length=30)
@@ -269,6 +315,14 @@ class Appointment(models.Model):
     follow_up_appointment = models.ForeignKey(
         "self", on_delete=models.CASCADE, null=True
     )
+    slot = models.ForeignKey(
+        SlotInstance,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="appointments",
+    )
 
     def __str__(self):
         return self.purpose
@@ -282,6 +336,13 @@ class Appointment(models.Model):
 
     class Meta:
         ordering = ("id",)
+        indexes = [
+            # Booked counts per time slot (clinic.availability)
+            models.Index(
+                fields=["doctor", "date_of_appointment"],
+                name="appointment_doctor_date_idx",
+            ),
+        ]
 
 
 class Bill(models.Model):
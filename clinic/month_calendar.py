@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from clinic.availability import expand_schedule
+from clinic.models import Appointment, DoctorSchedule, SlotHold, TimeSlot
+from mylib.cache import LRUCache
+
+from collections import defaultdict
+import datetime as dt
+
+
+# (doctor id, first date of the month) -> (doctor id, the days of that month)
+CALENDAR_CACHE = LRUCache(
+    max_size=settings.CALENDAR_CACHE_SIZE, ttl=settings.CALENDAR_CACHE_TTL
+)
+
+
+def month_dates(month):
+    """
+    The first and last dates of the month of the date `month`.
+    """
+    first = month.replace(day=1)
+    last = (first + dt.timedelta(days=31)).replace(day=1) - dt.timedelta(days=1)
+    return first, last
+
+
+def day_bounds(start_date, end_date):
+    """
+    The start of `start_date` and of the day after `end_date`, in the
+    current time zone.
+    """
+    return (
+        timezone.make_aware(dt.datetime.combine(start_date, dt.time.min)),
+        timezone.make_aware(
+            dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time.min)
+        ),
+    )
+
+
+def get_status_counts(doctor, start_date, end_date):
+    """
+    The doctor's appointments from `start_date` to `end_date`, both included,
+    counted per date and status: {date: {status: count}}. Dates are in the
+    current time zone. One GROUP BY query.
+    """
+    start, end = day_bounds(start_date, end_date)
+    rows = (
+        Appointment.objects.filter(
+            doctor=doctor, date_of_appointment__gte=start, date_of_appointment__lt=end
+        )
+        .annotate(day=TruncDate("date_of_appointment"))
+        .values("day", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    counts = defaultdict(dict)
+    for row in rows:
+        counts[row["day"]][row["status"]] = row["count"]
+    return counts
+
+
+def get_held_counts(doctor, start_date, end_date):
+    """
+    The doctor's unexpired slot holds from `start_date` to `end_date`, both
+    included, counted per date: {date: count}. One GROUP BY query.
+    """
+    start, end = day_bounds(start_date, end_date)
+    rows = (
+        SlotHold.objects.filter(
+            doctor=doctor,
+            date_of_appointment__gte=start,
+            date_of_appointment__lt=end,
+            expires_at__gt=timezone.now(),
+        )
+        .annotate(day=TruncDate("date_of_appointment"))
+        .values("day")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    return {row["day"]: row["count"] for row in rows}
+
+
+def build_month_calendar(doctor, month):
+    """
+    Every date of the month `month` is in, with the doctor's scheduled
+    capacity, the appointments booked (not canceled), the places held by
+    slot holds and the appointments per status. Three queries.
+    """
+    start_date, end_date = month_dates(month)
+
+    capacity = defaultdict(int)
+    for slot in expand_schedule(doctor, start_date, end_date):
+        capacity[slot.start.date()] += slot.capacity
+    counts = get_status_counts(doctor, start_date, end_date)
+    held = get_held_counts(doctor, start_date, end_date)
+
+    days = []
+    date = start_date
+    while date <= end_date:
+        statuses = counts.get(date, {})
+        days.append(
+            {
+                "date": date,
+                "capacity": capacity[date],
+                "booked": sum(
+                    count for status, count in statuses.items() if status != "CANCELED"
+                ),
+                "held": held.get(date, 0),
+                "statuses": statuses,
+            }
+        )
+        date += dt.timedelta(days=1)
+
+    return days
+
+
+def get_month_calendar(doctor, month):
+    """
+    build_month_calendar() from CALENDAR_CACHE, until the doctor's
+    appointments, slot holds or schedule change. Holds expiring are only
+    seen once swept or after CALENDAR_CACHE_TTL.
+    """
+    doctor = getattr(doctor, "pk", doctor)
+    first, last = month_dates(month)
+    cached = CALENDAR_CACHE.get_or_set(
+        (doctor, first), lambda: (doctor, build_month_calendar(doctor, first))
+    )
+    return cached[1]
+
+
+def invalidate_on_commit(doctor):
+    # Once committed, so a concurrent request does not cache the old counts
+    transaction.on_commit(
+        lambda: CALENDAR_CACHE.pop_matching(lambda cached: cached[0] == doctor)
+    )
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_save, sender=SlotHold)
+@receiver(post_delete, sender=SlotHold)
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+@receiver(post_save, sender=DoctorSchedule)
+@receiver(post_delete, sender=DoctorSchedule)
+def calendar_changed(sender, instance, **kwargs):
+    invalidate_on_commit(instance.doctor_id)
+
+
+@receiver(m2m_changed, sender=DoctorSchedule.time_slot.through)
+def calendar_slots_changed(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_on_commit(instance.doctor_id)
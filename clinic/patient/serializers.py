@@ -11,6 +11,7 @@ from clinic.models import (
     Appointment,
     Invoice,
     Bill,
+    SlotHold,
 )
 from clinic.utils import get_roles
 
@@ -29,7 +30,6 @@ class ClientSerializer(serializers.ModelSerializer):
     class Meta:
         model = MyUser
         exclude = (
-            "reset_code",
             "confirm_code",
             "changed_password",
             "user_permissions",
@@ -169,3 +169,19 @@ class InvoiceSerializer(serializers.ModelSerializer):
 
 class AppointmentRescheduleSerializer(serializers.Serializer):
     date_of_appointment = serializers.DateTimeField(required=True)
+
+
+class SlotHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SlotHold
+        fields = "__all__"
+
+        extra_kwargs = {
+            "patient": {"read_only": True},
+            "slot": {"read_only": True},
+            "expires_at": {"read_only": True},
+        }
+
+
+class SlotHoldConfirmSerializer(serializers.Serializer):
+    purpose = serializers.CharField(required=True, max_length=50)
@@ -15,6 +15,7 @@ from clinic.models import (
     Bill,
     DoctorSchedule,
     TimeSlot,
+    SlotHold,
 )
 from administrator.models import Speciality
 from clinic.tests.utils import create_default_doctor, create_user
@@ -1471,6 +1472,121 @@ class AppointmentViewTests(APITestCase):
         self.client.logout()
 
 
+class SlotHoldViewTests(APITestCase):
+    def setUp(self):
+        """
+        Create a Patient and a Doctor with a daily one-appointment
+        timeslot to be used through-out this Slot Hold View Tests Case.
+        """
+        self.patient = Patient.objects.create(user=create_user(name="patient1"))
+        self.doctor = Doctor.objects.create(
+            user=create_user(role="DOCTOR"),
+            speciality=Speciality.objects.get_or_create(name="Test")[0],
+        )
+        timeslot = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=9, minute=30),
+            end_time=dt.time(hour=10, minute=30),
+            number_of_appointments=1,
+        )
+        for day in DoctorSchedule.DAY:
+            schedule = DoctorSchedule.objects.create(doctor=self.doctor, day=day[0])
+            schedule.time_slot.add(timeslot)
+
+        self.data = {
+            "doctor": self.doctor.id,
+            "date_of_appointment": timezone.make_aware(
+                dt.datetime.combine(
+                    dt.date.today() + dt.timedelta(days=7), timeslot.start_time
+                )
+            ),
+        }
+
+    def test_hold_and_confirm_slot(self):
+        """
+        Ensure patients can hold a slot, keeping others out of it,
+        and confirm the hold into an appointment.
+        """
+        url = reverse("patient:slothold-list", args=(self.patient.id,))
+
+        # Test if unautheticated user cannot hold
+        response = self.client.post(url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Test if owner patient can hold
+        self.client.login(username=self.patient.user.username, password="Pass1234")
+        response = self.client.post(url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hold = SlotHold.objects.get(id=response.json()["id"])
+        self.assertEqual(hold.slot.booked, 1)
+        self.client.logout()
+
+        # Test if other patients cannot hold or book the held slot
+        patient2 = Patient.objects.create(user=create_user(name="patient2"))
+        self.client.login(username=patient2.user.username, password="Pass1234")
+        url2 = reverse("patient:slothold-list", args=(patient2.id,))
+        response = self.client.post(url2, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["detail"], "Timeslot is Fully Booked.")
+        url2 = reverse("patient:appointment-list", args=(patient2.id,))
+        data = dict(self.data, purpose="checkup", status="WAITING", patient=patient2.id)
+        response = self.client.post(url2, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.logout()
+
+        # Test if owner patient can confirm the hold
+        self.client.login(username=self.patient.user.username, password="Pass1234")
+        url = reverse("patient:slothold-confirm", args=(self.patient.id, hold.id))
+        response = self.client.post(url, {"purpose": "checkup"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        appointment = Appointment.objects.get(id=response.json()["id"])
+        self.assertEqual(appointment.slot, hold.slot)
+        self.assertFalse(SlotHold.objects.filter(id=hold.id).exists())
+        hold.slot.refresh_from_db()
+        self.assertEqual(hold.slot.booked, 1)
+
+        # Test if a hold cannot be confirmed twice
+        response = self.client.post(url, {"purpose": "checkup"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.logout()
+
+    def test_release_and_expire_hold(self):
+        """
+        Ensure released and expired holds give their place back.
+        """
+        url = reverse("patient:slothold-list", args=(self.patient.id,))
+        self.client.login(username=self.patient.user.username, password="Pass1234")
+        response = self.client.post(url, self.data, format="json")
+        hold = SlotHold.objects.get(id=response.json()["id"])
+
+        # Test if owner patient can release the hold
+        url = reverse("patient:slothold-detail", args=(self.patient.id, hold.id))
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        hold.slot.refresh_from_db()
+        self.assertEqual(hold.slot.booked, 0)
+
+        # Test if an expired hold cannot be confirmed, and its place is reused
+        url = reverse("patient:slothold-list", args=(self.patient.id,))
+        response = self.client.post(url, self.data, format="json")
+        SlotHold.objects.update(expires_at=timezone.now())
+        hold = SlotHold.objects.get(id=response.json()["id"])
+        url = reverse("patient:slothold-confirm", args=(self.patient.id, hold.id))
+        response = self.client.post(url, {"purpose": "checkup"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse("patient:appointment-list", args=(self.patient.id,))
+        data = dict(
+            self.data, purpose="checkup", status="WAITING", patient=self.patient.id
+        )
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SlotHold.objects.exists())
+        hold.slot.refresh_from_db()
+        self.assertEqual(hold.slot.booked, 1)
+        self.client.logout()
+
+
 class InvoiceViewTests(APITestCase):
     def setUp(self):
         """
@@ -10,6 +10,7 @@ router.register(r"prescription", views.PrescriptionViewSet)
 router.register(r"medical-record", views.MedicalRecordViewSet)
 router.register(r"appointments", views.AppointmentViewSet)
 router.register(r"invoices", views.InvoiceViewSet)
+router.register(r"holds", views.SlotHoldViewSet)
 
 app_name = "patient"
 
@@ -1,4 +1,8 @@
+from django.db import transaction
+
 from rest_framework import generics
+from rest_framework import mixins
+from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -20,6 +24,7 @@ from clinic.models import (
     FavouriteDoctor,
     Appointment,
     Invoice,
+    SlotHold,
 )
 from clinic.viewsets import CreateListRetrieveViewSet
 from clinic.patient.serializers import (
@@ -30,8 +35,12 @@ from clinic.patient.serializers import (
     AppointmentSerializer,
     InvoiceSerializer,
     AppointmentRescheduleSerializer,
+    SlotHoldSerializer,
+    SlotHoldConfirmSerializer,
 )
-from clinic.utils import validate_appointment_date
+from clinic.slot_holds import confirm_hold, get_active_holds, hold_slot, release_hold
+from clinic.slot_inventory import release_slot
+from clinic.utils import reserve_appointment_slot
 
 from mylib.common import MyCustomException
 
@@ -158,11 +167,16 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
             raise MyCustomException("Error: You are not a Patient", code=403)
         date_time = serializer.validated_data.get("date_of_appointment", None)
         doctor = serializer.validated_data.get("doctor", 0)
-        if date_time is not None:
-            valid_date = validate_appointment_date(int(doctor.id), date_time)
-            if valid_date["validated"] is False:
-                raise MyCustomException(valid_date["message"])
-        serializer.save(patient=patients[0], status="WAITING", amount=doctor.pricing)
+        with transaction.atomic():
+            slot = None
+            if date_time is not None:
+                valid_date = reserve_appointment_slot(int(doctor.id), date_time)
+                if valid_date["validated"] is False:
+                    raise MyCustomException(valid_date["message"])
+                slot = valid_date["slot"]
+            serializer.save(
+                patient=patients[0], status="WAITING", amount=doctor.pricing, slot=slot
+            )
 
     @action(detail=True, methods=["patch"])
     def reschedule(self, request, pk=None, **kwargs):
@@ -183,14 +197,20 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
                     "Error: Enter new 'date_of_appointment' when rescheduling appointments."
                 )
 
-            # Check change in date of appontment is valid
-            valid_date = validate_appointment_date(instance.doctor.id, date_time)
-            if valid_date["validated"] is False:
-                raise MyCustomException(valid_date["message"])
+            with transaction.atomic():
+                # Move the appointment's place to the new date's slot,
+                # both undone if the new date is not valid
+                release_slot(instance)
+                valid_date = reserve_appointment_slot(
+                    instance.doctor.id, date_time, exclude=instance.id
+                )
+                if valid_date["validated"] is False:
+                    raise MyCustomException(valid_date["message"])
 
-            instance.date_of_appointment = date_time
-            instance.status = "RESCHEDULED"
-            instance.save()
+                instance.date_of_appointment = date_time
+                instance.status = "RESCHEDULED"
+                instance.slot = valid_date["slot"]
+                instance.save()
             # TODO
             # Notify doc change in date of appointment
 
@@ -208,8 +228,10 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
                     f"Error: This appointments has already been {instance.status}."
                 )
 
-            instance.status = "CANCELED"
-            instance.save()
+            with transaction.atomic():
+                release_slot(instance)
+                instance.status = "CANCELED"
+                instance.save()
             # TODO
             # Notify doc change in appointment status
 
@@ -218,6 +240,53 @@ class AppointmentViewSet(CreateListRetrieveViewSet):
             raise MyCustomException("Appointment Patient Only", code=403)
 
 
+class SlotHoldViewSet(mixins.DestroyModelMixin, CreateListRetrieveViewSet):
+    """
+    Places held in doctors' slots for a few minutes while the patient
+    books. Confirming a hold books its appointment, deleting it gives the
+    place back.
+    """
+
+    queryset = SlotHold.objects.all()
+    serializer_class = SlotHoldSerializer
+    permission_classes = [IsAuthenticated, IsOwnerPatient]
+
+    def get_patient(self):
+        patients = Patient.objects.filter(id=self.kwargs["patient_pk"])
+        if not patients.exists():
+            raise MyCustomException("Error: Patient not Found", code=404)
+        return patients[0]
+
+    def get_queryset(self):
+        return get_active_holds(self.get_patient())
+
+    def perform_create(self, serializer):
+        patient = self.get_patient()
+        if patient.user.id != self.request.user.id:
+            raise MyCustomException("Error: You are not this Patient", code=403)
+        serializer.instance = hold_slot(
+            patient,
+            serializer.validated_data["doctor"],
+            serializer.validated_data["date_of_appointment"],
+        )
+
+    def perform_destroy(self, instance):
+        release_hold(instance)
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None, **kwargs):
+        instance = self.get_object()
+
+        serializer = SlotHoldConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        appointment = confirm_hold(instance, serializer.validated_data["purpose"])
+
+        return Response(
+            AppointmentSerializer(appointment).data, status=status.HTTP_201_CREATED
+        )
+
+
 class InvoiceViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Invoice.objects.all()
     serializer_class = InvoiceSerializer
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from clinic.models import Appointment, SlotHold
+from clinic.slot_inventory import give_back
+from clinic.utils import reserve_appointment_slot
+
+from mylib.common import MyCustomException
+
+import datetime as dt
+
+
+def get_active_holds(patient):
+    return SlotHold.objects.filter(patient=patient, expires_at__gt=timezone.now())
+
+
+def hold_slot(patient, doctor, date_time):
+    """
+    Hold a place for `patient` in the doctor's slot at `date_time` for
+    SLOT_HOLD_LIFETIME seconds. The place is taken from the slot like a
+    booking, so it cannot be booked by anyone else meanwhile.
+    """
+    if get_active_holds(patient).count() >= settings.SLOT_HOLD_MAX_PER_PATIENT:
+        raise MyCustomException(
+            f"Error: You can hold at most {settings.SLOT_HOLD_MAX_PER_PATIENT} "
+            "slots at a time."
+        )
+
+    lifetime = dt.timedelta(seconds=settings.SLOT_HOLD_LIFETIME)
+    with transaction.atomic():
+        valid_date = reserve_appointment_slot(doctor.id, date_time)
+        if valid_date["validated"] is False:
+            raise MyCustomException(valid_date["message"])
+
+        return SlotHold.objects.create(
+            doctor=doctor,
+            patient=patient,
+            slot=valid_date["slot"],
+            date_of_appointment=date_time,
+            expires_at=timezone.now() + lifetime,
+        )
+
+
+def confirm_hold(hold, purpose):
+    """
+    Book the appointment `hold` was held for, with the held place.
+    """
+    with transaction.atomic():
+        # Claimed by deleting it, unless it has expired or is being released
+        claimed, deleted = SlotHold.objects.filter(
+            id=hold.id, expires_at__gt=timezone.now()
+        ).delete()
+        if not claimed:
+            raise MyCustomException("Error: This hold has expired.")
+
+        return Appointment.objects.create(
+            doctor=hold.doctor,
+            patient=hold.patient,
+            slot=hold.slot,
+            purpose=purpose,
+            status="WAITING",
+            amount=hold.doctor.pricing,
+            date_of_appointment=hold.date_of_appointment,
+        )
+
+
+def release_hold(hold):
+    """
+    Give the place held by `hold` back to its slot.
+    """
+    with transaction.atomic():
+        released, deleted = SlotHold.objects.filter(id=hold.id).delete()
+        if released:
+            give_back({hold.slot_id: 1})
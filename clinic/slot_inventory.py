@@ -0,0 +1,278 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from clinic.availability import expand_schedule
+from clinic.models import (
+    Appointment,
+    DoctorSchedule,
+    SlotHold,
+    SlotInstance,
+    TimeSlot,
+)
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import datetime as dt
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def _create_slots(doctor, slots, exclude=None):
+    """
+    Insert new SlotInstance rows. Appointments not linked to a slot yet,
+    e.g. booked before the inventory existed, are counted in and linked to
+    the first new slot they fall in, except the appointment `exclude`.
+    """
+    appointments = (
+        Appointment.objects.filter(
+            doctor=doctor,
+            slot=None,
+            date_of_appointment__gte=min(slot.start for slot in slots),
+            date_of_appointment__lte=max(slot.end for slot in slots),
+        )
+        .exclude(status="CANCELED")
+        .order_by("date_of_appointment")
+    )
+    if exclude is not None:
+        appointments = appointments.exclude(id=exclude)
+    appointments = list(appointments.values_list("date_of_appointment", "id"))
+    dates = [date for date, id in appointments]
+
+    linked = {}
+    taken = set()
+    for slot in sorted(slots, key=lambda slot: (slot.start, slot.time_slot_id)):
+        first = bisect_left(dates, slot.start)
+        last = bisect_right(dates, slot.end)
+        ids = [id for date, id in appointments[first:last] if id not in taken]
+        taken.update(ids)
+        slot.booked = len(ids)
+        if ids:
+            linked[(slot.time_slot_id, slot.date)] = ids
+
+    # Another request may have generated some of them meanwhile
+    SlotInstance.objects.bulk_create(slots, ignore_conflicts=True)
+
+    if linked:
+        slot_ids = {
+            (slot.time_slot_id, slot.date): slot.id
+            for slot in SlotInstance.objects.filter(
+                doctor=doctor, date__in={date for slot_id, date in linked}
+            )
+        }
+        for key, ids in linked.items():
+            Appointment.objects.filter(id__in=ids, slot=None).update(slot=slot_ids[key])
+
+
+def _plan_slots(doctor, scheduled, start_date, end_date):
+    """
+    Compare the doctor's SlotInstance rows from `start_date` to `end_date`
+    with the `scheduled` slots, keyed by (time slot id, date). Returns the
+    rows to create, the rows changed and the ids of the rows to delete.
+    """
+    changed = []
+    dropped = []
+    existing = set()
+    for row in SlotInstance.objects.filter(
+        doctor=doctor, date__gte=start_date, date__lte=end_date
+    ):
+        key = (row.time_slot_id, row.date)
+        existing.add(key)
+        slot = scheduled.get(key)
+
+        if slot is None:
+            if row.booked == 0:
+                dropped.append(row.id)
+            elif row.capacity != 0:
+                row.capacity = 0
+                changed.append(row)
+        elif (row.start, row.end, row.capacity) != (
+            slot.start,
+            slot.end,
+            slot.capacity,
+        ):
+            row.start, row.end, row.capacity = slot.start, slot.end, slot.capacity
+            changed.append(row)
+
+    created = [
+        SlotInstance(
+            doctor_id=doctor,
+            time_slot=slot.slot,
+            date=date,
+            start=slot.start,
+            end=slot.end,
+            capacity=slot.capacity,
+        )
+        for (slot_id, date), slot in scheduled.items()
+        if (slot_id, date) not in existing
+    ]
+
+    return created, changed, dropped
+
+
+def regenerate_slots(doctor, start_date=None, days=None, exclude=None):
+    """
+    Bring the doctor's SlotInstance rows for `days` days (SLOT_INVENTORY_DAYS
+    by default) from `start_date` (today by default) in line with the
+    doctor's schedule. Missing slots are created, changed ones get their new
+    times and capacity, and slots no longer scheduled are deleted, or closed
+    with no capacity if they have bookings. Returns the number created.
+    `exclude` is an appointment not to link, e.g. one being rescheduled.
+    """
+    doctor = getattr(doctor, "pk", doctor)
+    if start_date is None:
+        start_date = timezone.localdate()
+    if days is None:
+        days = settings.SLOT_INVENTORY_DAYS
+    end_date = start_date + dt.timedelta(days=days - 1)
+
+    scheduled = {
+        (slot.slot.id, slot.start.date()): slot
+        for slot in expand_schedule(doctor, start_date, end_date)
+    }
+    created, changed, dropped = _plan_slots(doctor, scheduled, start_date, end_date)
+
+    with transaction.atomic():
+        if dropped:
+            # Unless booked since they were read
+            SlotInstance.objects.filter(id__in=dropped, booked=0).delete()
+        if changed:
+            SlotInstance.objects.bulk_update(changed, ["start", "end", "capacity"])
+        if created:
+            _create_slots(doctor, created, exclude=exclude)
+
+    logger.debug(
+        "Regenerated slots for doctor %s: %s created, %s changed, %s dropped.",
+        doctor,
+        len(created),
+        len(changed),
+        len(dropped),
+    )
+
+    return len(created)
+
+
+def find_slot(doctor, date_time, exclude=None):
+    """
+    Return the open SlotInstance of the doctor's first time slot containing
+    `date_time`, generating the slots of that date if there are none, or None
+    if it is outside the doctor's schedule. Seconds are ignored.
+    """
+    date_time = date_time.replace(second=0, microsecond=0)
+    slots = SlotInstance.objects.filter(
+        doctor=doctor, start__lte=date_time, end__gte=date_time, capacity__gt=0
+    ).order_by("start", "time_slot_id")
+
+    slot = slots.first()
+    if slot is None:
+        regenerate_slots(
+            doctor, start_date=timezone.localdate(date_time), days=1, exclude=exclude
+        )
+        slot = slots.first()
+
+    return slot
+
+
+def take_slot(slot):
+    """
+    Book one place in `slot` with a single conditional UPDATE, so concurrent
+    bookings cannot overbook it. Returns False if it is full.
+    """
+    return bool(
+        SlotInstance.objects.filter(id=slot.id, booked__lt=F("capacity")).update(
+            booked=F("booked") + 1
+        )
+    )
+
+
+def release_slot(appointment):
+    """
+    Give back the place `appointment` holds in its slot, once however many
+    times it is called. The caller saves the appointment.
+    """
+    if appointment.slot_id is None:
+        return False
+
+    released = Appointment.objects.filter(
+        id=appointment.id, slot=appointment.slot_id
+    ).update(slot=None)
+    if released:
+        give_back({appointment.slot_id: 1})
+    appointment.slot = None
+
+    return bool(released)
+
+
+def give_back(places):
+    """
+    Take the places back off the booked counters of their slots in one
+    UPDATE. `places` maps slot ids to the number of places to give back.
+    """
+    if places:
+        whens = [When(id=slot, then=F("booked") - n) for slot, n in places.items()]
+        SlotInstance.objects.filter(id__in=places).update(
+            booked=Greatest(Case(*whens, default=F("booked")), 0)
+        )
+
+
+def release_expired_holds(slot=None, batch_size=None, now=None):
+    """
+    Delete expired SlotHolds, of `slot` only if given, and give their places
+    back, `batch_size` holds per transaction. Returns the number released.
+    """
+    if batch_size is None:
+        batch_size = settings.SLOT_HOLD_SWEEP_BATCH_SIZE
+    if now is None:
+        now = timezone.now()
+
+    holds = SlotHold.objects.filter(expires_at__lte=now).order_by("id")
+    if slot is not None:
+        holds = holds.filter(slot=slot)
+
+    released = 0
+    while True:
+        with transaction.atomic():
+            # Locked so a hold cancelled meanwhile is not given back twice
+            expired = list(
+                holds.select_for_update().values_list("id", "slot")[:batch_size]
+            )
+            if not expired:
+                break
+            SlotHold.objects.filter(id__in=[id for id, slot_id in expired]).delete()
+            give_back(Counter(slot_id for id, slot_id in expired))
+
+        released += len(expired)
+        if len(expired) < batch_size:
+            break
+
+    return released
+
+
+def regenerate_on_commit(doctor):
+    transaction.on_commit(lambda: regenerate_slots(doctor))
+
+
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+@receiver(post_save, sender=DoctorSchedule)
+@receiver(post_delete, sender=DoctorSchedule)
+def schedule_changed(sender, instance, **kwargs):
+    regenerate_on_commit(instance.doctor_id)
+
+
+@receiver(m2m_changed, sender=DoctorSchedule.time_slot.through)
+def schedule_slots_changed(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        regenerate_on_commit(instance.doctor_id)
+
+
+@receiver(post_delete, sender=Appointment)
+def appointment_deleted(sender, instance, **kwargs):
+    if instance.slot_id is not None:
+        give_back({instance.slot_id: 1})
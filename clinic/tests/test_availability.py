@@ -0,0 +1,122 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from clinic.availability import find_open_slots, get_range_availability, search_doctors
+from clinic.models import Appointment, Doctor, DoctorSchedule, Patient, TimeSlot
+from clinic.tests.utils import create_user
+from administrator.models import Speciality
+
+import datetime as dt
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        """
+        Create a doctor with two time slots every day
+        to be used through-out this Availability Tests Case.
+        """
+        self.doctor = Doctor.objects.create(
+            user=create_user(role="DOCTOR"),
+            speciality=Speciality.objects.get_or_create(name="Test")[0],
+        )
+        self.patient = Patient.objects.create(user=create_user(name="patient1"))
+        self.morning = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=9, minute=30),
+            end_time=dt.time(hour=10, minute=30),
+            number_of_appointments=2,
+        )
+        self.evening = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=16),
+            end_time=dt.time(hour=17),
+            number_of_appointments=1,
+        )
+        for day in DoctorSchedule.DAY:
+            schedule = DoctorSchedule.objects.create(doctor=self.doctor, day=day[0])
+            schedule.time_slot.add(self.evening, self.morning)
+
+        self.date = dt.date.today() + dt.timedelta(days=7)
+
+    def at(self, hour, minute=0):
+        return timezone.make_aware(
+            dt.datetime.combine(self.date, dt.time(hour, minute))
+        )
+
+    def book(self, date_time, status="WAITING"):
+        return Appointment.objects.create(
+            doctor=self.doctor,
+            patient=self.patient,
+            purpose="checkup",
+            status=status,
+            date_of_appointment=date_time,
+        )
+
+    def test_range_availability(self):
+        """
+        Ensure the schedule is expanded over every date in the
+        range with booked counts, using two queries however long
+        """
+        end_date = self.date + dt.timedelta(days=13)
+        self.book(self.at(10))
+        self.book(self.at(16))
+        self.book(timezone.make_aware(dt.datetime.combine(end_date, dt.time(hour=16))))
+
+        with self.assertNumQueries(2):
+            slots = get_range_availability(self.doctor.id, self.date, end_date)
+
+        self.assertEqual(len(slots), 28)
+        self.assertEqual([slot.start for slot in slots], sorted(s.start for s in slots))
+        self.assertEqual([slot.booked for slot in slots[:2]], [1, 1])
+        self.assertEqual(sum(slot.booked for slot in slots), 3)
+        self.assertTrue(slots[-1].is_full)
+
+        open_slots = find_open_slots(self.doctor.id, self.date, end_date, limit=5)
+        self.assertEqual(len(open_slots), 5)
+        self.assertEqual(open_slots[0].remaining, 1)
+        self.assertEqual(open_slots[1].start.date(), self.date + dt.timedelta(days=1))
+
+    def test_search_doctors(self):
+        """
+        Ensure doctors are ranked by their earliest open slot then
+        price, using three queries however many doctors
+        """
+        doctors = []
+        for pricing, start in [(300, 9), (100, 9), (200, 8)]:
+            doctor = Doctor.objects.create(
+                user=create_user(role="DOCTOR"),
+                speciality=self.doctor.speciality,
+                pricing=pricing,
+            )
+            timeslot = TimeSlot.objects.create(
+                doctor=doctor,
+                start_time=dt.time(hour=start),
+                end_time=dt.time(hour=start + 1),
+            )
+            schedule = DoctorSchedule.objects.create(
+                doctor=doctor, day=f"{self.date:%A}"
+            )
+            schedule.time_slot.add(timeslot)
+            doctors.append(doctor)
+
+        # The earliest doctor is fully booked
+        Appointment.objects.create(
+            doctor=doctors[2],
+            patient=self.patient,
+            purpose="checkup",
+            status="WAITING",
+            date_of_appointment=self.at(8, 30),
+        )
+
+        doctors_ids = [doctor.id for doctor in doctors] + [self.doctor.id]
+        with self.assertNumQueries(3):
+            results = search_doctors(
+                Doctor.objects.filter(id__in=doctors_ids), self.date, self.date
+            )
+
+        self.assertEqual(
+            [result.doctor for result in results],
+            [doctors[1], doctors[0], self.doctor],
+        )
+        self.assertEqual(results[0].earliest.start, self.at(9))
+        self.assertEqual((results[2].open_slots, results[2].remaining), (2, 3))
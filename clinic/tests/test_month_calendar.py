@@ -0,0 +1,111 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from clinic.models import (
+    Appointment,
+    Doctor,
+    DoctorSchedule,
+    Patient,
+    SlotHold,
+    TimeSlot,
+)
+from clinic.month_calendar import CALENDAR_CACHE, get_month_calendar
+from clinic.slot_inventory import find_slot
+from clinic.tests.utils import create_user
+from administrator.models import Speciality
+
+import datetime as dt
+
+
+class MonthCalendarTests(TestCase):
+    def setUp(self):
+        """
+        Create a doctor with a two-appointment time slot on Mondays
+        to be used through-out this Month Calendar Tests Case.
+        """
+        CALENDAR_CACHE.clear()
+        self.doctor = Doctor.objects.create(
+            user=create_user(role="DOCTOR"),
+            speciality=Speciality.objects.get_or_create(name="Test")[0],
+        )
+        self.patient = Patient.objects.create(user=create_user(name="patient1"))
+        self.timeslot = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=9, minute=30),
+            end_time=dt.time(hour=10, minute=30),
+            number_of_appointments=2,
+        )
+        schedule = DoctorSchedule.objects.create(doctor=self.doctor, day="monday")
+        schedule.time_slot.add(self.timeslot)
+
+        # Monday 2 and Tuesday 3 March 2026
+        self.monday = dt.date(2026, 3, 2)
+
+    def book(self, date, status="WAITING"):
+        return Appointment.objects.create(
+            doctor=self.doctor,
+            patient=self.patient,
+            purpose="checkup",
+            status=status,
+            date_of_appointment=timezone.make_aware(
+                dt.datetime.combine(date, dt.time(hour=10))
+            ),
+        )
+
+    def test_month_calendar(self):
+        """
+        Ensure every date of the month comes with its capacity, bookings
+        holds and counts per status, using three queries however many
+        appointments
+        """
+        self.book(self.monday)
+        self.book(self.monday, status="CANCELED")
+        self.book(self.monday + dt.timedelta(days=1), status="CONFIRMED")
+        self.book(dt.date(2026, 4, 6))
+        date_time = timezone.make_aware(dt.datetime.combine(self.monday, dt.time(10)))
+        SlotHold.objects.create(
+            doctor=self.doctor,
+            patient=self.patient,
+            slot=find_slot(self.doctor.id, date_time),
+            date_of_appointment=date_time,
+            expires_at=timezone.now() + dt.timedelta(minutes=5),
+        )
+
+        with self.assertNumQueries(3):
+            days = get_month_calendar(self.doctor.id, dt.date(2026, 3, 15))
+
+        self.assertEqual(len(days), 31)
+        self.assertEqual(days[0]["date"], dt.date(2026, 3, 1))
+        self.assertEqual(
+            days[1],
+            {
+                "date": self.monday,
+                "capacity": 2,
+                "booked": 1,
+                "held": 1,
+                "statuses": {"WAITING": 1, "CANCELED": 1},
+            },
+        )
+        self.assertEqual((days[2]["capacity"], days[2]["booked"]), (0, 1))
+        self.assertEqual(sum(day["capacity"] for day in days), 10)
+
+    def test_month_calendar_cache(self):
+        """
+        Ensure calendars are served from the cache until the
+        doctor's appointments or schedule change
+        """
+        get_month_calendar(self.doctor.id, self.monday)
+        with self.assertNumQueries(0):
+            days = get_month_calendar(self.doctor.id, self.monday)
+        self.assertEqual(days[1]["booked"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book(self.monday)
+        days = get_month_calendar(self.doctor.id, self.monday)
+        self.assertEqual(days[1]["booked"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.timeslot.number_of_appointments = 4
+            self.timeslot.save()
+        days = get_month_calendar(self.doctor.id, self.monday)
+        self.assertEqual(days[1]["capacity"], 4)
@@ -0,0 +1,180 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from clinic.models import (
+    Appointment,
+    Doctor,
+    DoctorSchedule,
+    Patient,
+    SlotHold,
+    SlotInstance,
+    TimeSlot,
+)
+from clinic.slot_inventory import (
+    find_slot,
+    regenerate_slots,
+    release_expired_holds,
+    release_slot,
+    take_slot,
+)
+from clinic.tests.utils import create_user
+from clinic.utils import reserve_appointment_slot
+from administrator.models import Speciality
+
+import datetime as dt
+
+
+class SlotInventoryTests(TestCase):
+    def setUp(self):
+        """
+        Create a doctor with a two-appointment time slot every day
+        to be used through-out this Slot Inventory Tests Case.
+        """
+        self.doctor = Doctor.objects.create(
+            user=create_user(role="DOCTOR"),
+            speciality=Speciality.objects.get_or_create(name="Test")[0],
+        )
+        self.patient = Patient.objects.create(user=create_user(name="patient1"))
+        self.timeslot = TimeSlot.objects.create(
+            doctor=self.doctor,
+            start_time=dt.time(hour=9, minute=30),
+            end_time=dt.time(hour=10, minute=30),
+            number_of_appointments=2,
+        )
+        for day in DoctorSchedule.DAY:
+            schedule = DoctorSchedule.objects.create(doctor=self.doctor, day=day[0])
+            schedule.time_slot.add(self.timeslot)
+
+        self.date = dt.date.today() + dt.timedelta(days=7)
+        self.date_time = timezone.make_aware(
+            dt.datetime.combine(self.date, dt.time(hour=10))
+        )
+
+    def book(self, status="WAITING"):
+        return Appointment.objects.create(
+            doctor=self.doctor,
+            patient=self.patient,
+            purpose="checkup",
+            status=status,
+            date_of_appointment=self.date_time,
+        )
+
+    def test_regenerate_slots(self):
+        """
+        Ensure slots are generated from the schedule, counting and
+        linking appointments booked before, and follow its changes
+        """
+        appointment = self.book()
+        self.book(status="CANCELED")
+
+        self.assertEqual(regenerate_slots(self.doctor, self.date, days=3), 3)
+        self.assertEqual(regenerate_slots(self.doctor, self.date, days=3), 0)
+
+        slot = SlotInstance.objects.get(date=self.date)
+        self.assertEqual((slot.capacity, slot.booked), (2, 1))
+        self.assertEqual(Appointment.objects.get(id=appointment.id).slot, slot)
+
+        # Capacity follows the time slot
+        self.timeslot.number_of_appointments = 5
+        self.timeslot.save()
+        regenerate_slots(self.doctor, self.date, days=3)
+        self.assertEqual(SlotInstance.objects.get(date=self.date).capacity, 5)
+
+        # Slots dropped from the schedule are deleted, or closed if booked
+        DoctorSchedule.objects.filter(doctor=self.doctor).delete()
+        regenerate_slots(self.doctor, self.date, days=3)
+        self.assertEqual(SlotInstance.objects.count(), 1)
+        self.assertEqual(SlotInstance.objects.get(date=self.date).capacity, 0)
+
+    def test_schedule_change_regenerates_slots(self):
+        """
+        Ensure slots are regenerated once a schedule change is committed
+        """
+        regenerate_slots(self.doctor, self.date, days=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.timeslot.number_of_appointments = 4
+            self.timeslot.save()
+
+        self.assertEqual(SlotInstance.objects.get(date=self.date).capacity, 4)
+
+    def test_take_and_release_slot(self):
+        """
+        Ensure places are taken up to the capacity and
+        released once per appointment
+        """
+        slot = find_slot(self.doctor.id, self.date_time)
+        self.assertEqual(slot.date, self.date)
+
+        self.assertTrue(take_slot(slot))
+        self.assertTrue(take_slot(slot))
+        self.assertFalse(take_slot(slot))
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 2)
+
+        appointment = self.book()
+        appointment.slot = slot
+        appointment.save()
+        self.assertTrue(release_slot(appointment))
+        appointment.slot = slot
+        self.assertFalse(release_slot(appointment))
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 1)
+
+        self.assertIsNone(
+            find_slot(self.doctor.id, self.date_time + dt.timedelta(hours=2))
+        )
+
+    def test_reserve_appointment_slot(self):
+        """
+        Ensure reserving gives back the slot, and reports full slots,
+        dates too soon or outside the schedule and doctors without one
+        """
+        for i in range(2):
+            valid_date = reserve_appointment_slot(self.doctor.id, self.date_time)
+            self.assertTrue(valid_date["validated"])
+            self.assertEqual(valid_date["slot"].date, self.date)
+
+        valid_date = reserve_appointment_slot(self.doctor.id, self.date_time)
+        self.assertEqual(valid_date["message"], "Timeslot is Fully Booked.")
+        self.assertEqual(SlotInstance.objects.get(date=self.date).booked, 2)
+
+        self.assertEqual(
+            reserve_appointment_slot(self.doctor.id, timezone.now())["message"],
+            "The earliest appointment date and time should be 3 hours from now.",
+        )
+        self.assertEqual(
+            reserve_appointment_slot(
+                self.doctor.id, self.date_time + dt.timedelta(hours=2)
+            )["message"],
+            "Invalid Date: Check the Doctor Appointment Schedule before booking.",
+        )
+
+        DoctorSchedule.objects.filter(doctor=self.doctor).delete()
+        SlotInstance.objects.all().delete()
+        self.assertEqual(
+            reserve_appointment_slot(self.doctor.id, self.date_time)["message"],
+            "Doctor has not created a schedule.",
+        )
+
+    def test_release_expired_holds(self):
+        """
+        Ensure only expired holds are released, in batches,
+        giving their places back to their slots
+        """
+        slot = find_slot(self.doctor.id, self.date_time)
+        SlotInstance.objects.filter(id=slot.id).update(capacity=5, booked=4)
+        now = timezone.now()
+        for minutes in [-2, -1, -1, 5]:
+            SlotHold.objects.create(
+                doctor=self.doctor,
+                patient=self.patient,
+                slot=slot,
+                date_of_appointment=self.date_time,
+                expires_at=now + dt.timedelta(minutes=minutes),
+            )
+
+        self.assertEqual(release_expired_holds(batch_size=2, now=now), 3)
+        self.assertEqual(SlotHold.objects.count(), 1)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 1)
@@ -1,15 +1,18 @@
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from client.models import MyUser
-from clinic.models import Clinic, Doctor
+from clinic.models import Appointment, Clinic, Doctor, DoctorSchedule, Patient, TimeSlot
 from administrator.models import Speciality
 from clinic.tests.utils import create_default_doctor, create_user
 
 from mylib import token
 
+import datetime as dt
+
 
 class ListCreateRetrieveUpdateDestroyClinicViewTests(APITestCase):
     def setUp(self):
@@ -158,6 +161,91 @@ class ListCreateRetrieveUpdateDestroyClinicViewTests(APITestCase):
         self.client.logout()
 
 
+class ClinicAvailabilityViewTests(APITestCase):
+    def setUp(self):
+        """
+        Create a Clinic with two Doctors, and a Doctor outside it, with
+        daily timeslots to be used through-out this Clinic Availability
+        Tests Case.
+        """
+        self.clinic = Clinic.objects.create(
+            user=create_user(),
+            name="test clinic",
+            phone="0798976234",
+            email="tvirus@myapp.com",
+        )
+        self.doctors = []
+        for start in [10, 9, 9]:
+            doctor = Doctor.objects.create(
+                user=create_user(role="DOCTOR"),
+                speciality=Speciality.objects.get_or_create(name="Test")[0],
+            )
+            timeslot = TimeSlot.objects.create(
+                doctor=doctor,
+                start_time=dt.time(hour=start),
+                end_time=dt.time(hour=start, minute=30),
+            )
+            for day in DoctorSchedule.DAY:
+                schedule = DoctorSchedule.objects.create(doctor=doctor, day=day[0])
+                schedule.time_slot.add(timeslot)
+            self.doctors.append(doctor)
+        self.clinic.doctors.add(self.doctors[0], self.doctors[1])
+
+        self.start = dt.date.today() + dt.timedelta(days=7)
+        self.params = {
+            "from": f"{self.start}",
+            "to": f"{self.start + dt.timedelta(days=1)}",
+        }
+
+    def test_clinic_availability(self):
+        """
+        Ensure any user can list the clinic doctors' open slots in time order.
+        """
+        url = reverse("clinic_availability", args=(self.clinic.id,))
+        Appointment.objects.create(
+            doctor=self.doctors[1],
+            patient=Patient.objects.create(user=create_user()),
+            purpose="checkup",
+            status="WAITING",
+            date_of_appointment=timezone.make_aware(
+                dt.datetime.combine(self.start, dt.time(hour=9))
+            ),
+        )
+
+        # Test if unautheticated user cannot list
+        response = self.client.get(url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Test if user can list, fully booked slots and other doctors left out
+        user = create_user()
+        self.client.login(username=user.username, password="Pass1234")
+        response = self.client.get(url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["doctor"] for result in results],
+            [self.doctors[0].id, self.doctors[1].id, self.doctors[0].id],
+        )
+        self.assertEqual(
+            [result["start"] for result in results],
+            sorted(result["start"] for result in results),
+        )
+
+        # Test if the slots are paginated
+        response = self.client.get(url, dict(self.params, page_size=2))
+        self.assertEqual(len(response.json()["results"]), 2)
+        self.assertIsNotNone(response.json()["next"])
+        response = self.client.get(url, dict(self.params, page_size=2, page=2))
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertIsNone(response.json()["next"])
+
+        # Test if unknown clinic is not found
+        url = reverse("clinic_availability", args=(0,))
+        response = self.client.get(url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.logout()
+
+
 class ClinicInviteDoctorViewTests(APITestCase):
     def setUp(self):
         """
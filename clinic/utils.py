@@ -1,75 +1,35 @@
 from django.contrib.auth.models import Group
-from django.utils import timezone
 
-from clinic.models import DoctorSchedule, Appointment
+from clinic.availability import earliest_appointment_time, has_schedule
+from clinic.slot_inventory import find_slot, release_expired_holds, take_slot
 
-import datetime as dt
 
-
-def validate_appointment_date(doctor, date_time):
+def reserve_appointment_slot(doctor, date_time, exclude=None):
     """
-    A function to check if appointment date
-    is inline with doctor schedule dates and
-    the timeslot is not fully booked
+    A function to check if appointment date is inline with doctor schedule
+    dates and take a place in its slot of the slot inventory, unless it is
+    fully booked. On success the result also holds the "slot", to be saved
+    on the appointment in the same transaction.
+    `exclude` is an appointment being rescheduled, its place released first.
     """
 
-    if date_time < timezone.make_aware(
-        dt.datetime.now() + dt.timedelta(hours=3), timezone=date_time.tzinfo
-    ):
+    if date_time < earliest_appointment_time():
         return {
             "validated": False,
             "message": "The earliest appointment date and time should be 3 hours from now.",
         }
 
-    schedules = DoctorSchedule.objects.filter(doctor=doctor)
-
-    for schdl in schedules:
-        if str(schdl.day).title() == str(f"{date_time:%A}").title():
-
-            for time_slot in schdl.time_slot.all():
-                start_hour = int(time_slot.start_time.hour)
-                end_hour = int(time_slot.end_time.hour)
+    slot = find_slot(doctor, date_time, exclude=exclude)
 
-                if (
-                    int(date_time.hour) >= start_hour
-                    and int(date_time.hour) <= end_hour
-                ):
-                    if not (
-                        int(date_time.hour) == end_hour
-                        and date_time.minute > time_slot.end_time.minute
-                    ):
-                        # if date_time.minute <= time_slot.end_time.minute:
-                        start_date = dt.datetime(
-                            year=date_time.year,
-                            month=date_time.month,
-                            day=date_time.day,
-                            hour=time_slot.start_time.hour,
-                            minute=time_slot.start_time.minute,
-                            tzinfo=date_time.tzinfo,
-                        )
-                        end_date = dt.datetime(
-                            year=date_time.year,
-                            month=date_time.month,
-                            day=date_time.day,
-                            hour=time_slot.end_time.hour,
-                            minute=time_slot.end_time.minute,
-                            tzinfo=date_time.tzinfo,
-                        )
-                        appointments = (
-                            Appointment.objects.filter(doctor=doctor)
-                            .exclude(date_of_appointment__lt=start_date)
-                            .exclude(date_of_appointment__gt=end_date)
-                            .exclude(status="CANCELED")
-                        )
-                        if appointments.count() >= time_slot.number_of_appointments:
-                            return {
-                                "validated": False,
-                                "message": "Timeslot is Fully Booked.",
-                            }
-                        else:
-                            return {"validated": True, "message": None}
+    if slot is not None:
+        # Places held by expired holds not swept yet are taken back first
+        if not take_slot(slot) and not (
+            release_expired_holds(slot=slot) and take_slot(slot)
+        ):
+            return {"validated": False, "message": "Timeslot is Fully Booked."}
+        return {"validated": True, "message": None, "slot": slot}
 
-    if schedules.count() == 0:
+    if not has_schedule(doctor):
         return {"validated": False, "message": "Doctor has not created a schedule."}
 
     return {
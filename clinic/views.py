@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.reverse import reverse
@@ -7,15 +9,24 @@ from rest_framework.permissions import IsAuthenticated
 from client.permissions import IsOwner
 from clinic.permissions import IsOwnerOrReadOnly
 from client.models import MyUser
+from client.outbox.sender import queue_email
+from client.reset_codes import issue_reset_code
 from administrator.models import Speciality
+from clinic.availability import merge_open_slots
 from clinic.models import Clinic, Doctor
 from clinic.serializers import ClinicSerializer, ClinicInviteDoctorSerializer
+from clinic.doctor.serializers import SlotAvailabilitySerializer
 from clinic.utils import get_roles
+from clinic.viewsets import AvailabilityQueryMixin
 
 from mylib import token
-from mylib.common import MySendEmail
+from mylib.common import MyCustomException
+from mylib.pagination import StreamPagination
+
+import logging
 
-from random import randint
+
+logger = logging.getLogger(__name__)
 
 
 class ListCreateClinic(generics.ListCreateAPIView):
@@ -41,6 +52,28 @@ class RetrieveUpdateDestroyClinic(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
 
 
+class ClinicAvailability(AvailabilityQueryMixin, generics.GenericAPIView):
+    """
+    The open time slots of all the clinic's doctors from ?from= to ?to=
+    (YYYY-MM-DD, both included), in time order, a page at a time.
+    """
+
+    serializer_class = SlotAvailabilitySerializer
+    pagination_class = StreamPagination
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, format=None):
+        if not Clinic.objects.filter(pk=pk).exists():
+            raise MyCustomException("Error: Clinic not Found", code=404)
+
+        start_date, end_date = self.get_date_range()
+        doctors = Doctor.objects.filter(clinic=pk).values("id")
+        page = self.paginate_queryset(merge_open_slots(doctors, start_date, end_date))
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+
 class ClinicInviteDoctor(APIView):
     permission_classes = [IsAuthenticated, IsOwner]
 
@@ -48,7 +81,7 @@ class ClinicInviteDoctor(APIView):
         try:
             return Clinic.objects.get(pk=pk, user=user_id)
         except Exception as e:
-            print(e)
+            logger.debug("Clinic %s not found: %s", pk, e)
             return None
 
     def post(self, request, pk, format=None):
@@ -103,9 +136,9 @@ class ClinicInviteDoctor(APIView):
 
             Good DAY.
             """
-            MySendEmail("Clinic Invite", message, [email])
-        except Exception as e:
-            print(e)
+            queue_email("Clinic Invite", message, [email])
+        except Exception:
+            logger.exception("Failed to queue the clinic invite email.")
 
             # doctor.clinic_invites.remove(self.get_object(pk))
 
@@ -184,10 +217,7 @@ class DoctorAcceptInvite(APIView):
         # Check if its a new user
         if user.password in ["", None]:
             # redirect if to set a new password if a new user
-            reset_code = randint(111111, 999999)
-
-            user.reset_code = reset_code
-            user.save()
+            reset_code = issue_reset_code(user, lifetime=settings.SETUP_CODE_LIFETIME)
 
             message = f"""
             Hey Doc, \n
@@ -200,9 +230,9 @@ class DoctorAcceptInvite(APIView):
             """
 
             try:
-                MySendEmail("Password Reset Code", message, [user.email])
-            except Exception as e:
-                print(e)
+                queue_email("Password Reset Code", message, [user.email])
+            except Exception:
+                logger.exception("Failed to queue the reset code email.")
 
             return "Invite Accepted. Code to setup your account has been sent to your email."
 
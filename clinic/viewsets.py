@@ -1,5 +1,13 @@
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
 from rest_framework import mixins, viewsets
 
+from mylib.common import MyCustomException
+
+import datetime as dt
+
 
 class CreateListRetrieveViewSet(
     mixins.CreateModelMixin,
@@ -15,3 +23,67 @@ class CreateListRetrieveViewSet(
     """
 
     pass
+
+
+class AvailabilityQueryMixin(object):
+    """
+    Reads the ?from=, ?to= (YYYY-MM-DD, both included), ?month= (YYYY-MM) and
+    ?limit= query parameters of the availability views, within the
+    AVAILABILITY_* settings.
+    """
+
+    def get_date(self, name, default):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return default
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise MyCustomException(f"Error: '{name}' should be a date, YYYY-MM-DD.")
+        return date
+
+    def get_date_range(self):
+        start_date = self.get_date("from", timezone.localdate())
+        end_date = self.get_date(
+            "to",
+            start_date + dt.timedelta(days=settings.AVAILABILITY_DEFAULT_DAYS - 1),
+        )
+        if end_date < start_date:
+            raise MyCustomException("Error: 'to' should not be before 'from'.")
+        if (end_date - start_date).days >= settings.AVAILABILITY_MAX_DAYS:
+            raise MyCustomException(
+                f"Error: Search at most {settings.AVAILABILITY_MAX_DAYS} days at a time."
+            )
+        return start_date, end_date
+
+    def get_month(self):
+        """
+        The first date of the ?month=, the current month by default.
+        """
+        value = self.request.query_params.get("month", None)
+        if value is None:
+            return timezone.localdate().replace(day=1)
+        try:
+            return dt.datetime.strptime(value, "%Y-%m").date()
+        except ValueError:
+            raise MyCustomException("Error: 'month' should be a month, YYYY-MM.")
+
+    def get_number(self, name, default=None, cast=int):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return default
+        try:
+            number = cast(value)
+        except ValueError:
+            number = -1
+        if number < 0:
+            raise MyCustomException(f"Error: '{name}' should be a positive number.")
+        return number
+
+    def get_limit(self):
+        limit = self.get_number("limit", settings.AVAILABILITY_DEFAULT_LIMIT)
+        if limit < 1:
+            raise MyCustomException("Error: 'limit' should be a positive number.")
+        return min(limit, settings.AVAILABILITY_MAX_LIMIT)
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+import threading
+import time
+
+
+class LRUCache(object):
+    """
+    A thread-safe, size bounded, least recently used cache
+    that counts hits and misses.
+    Entries older than ttl seconds are treated as missing, when ttl is set.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (value, expiry time or None)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry):
+        return entry[1] is not None and entry[1] <= time.monotonic()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                entry = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if self._expired(entry):
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, default):
+        """
+        Return the cached value for key, or call default(),
+        cache and return its result.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            value = default()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value, expires = self._data.pop(key, (default, None))
+            return value
+
+    def pop_matching(self, predicate):
+        """
+        Remove every entry whose value matches predicate(value).
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+_missing = object()
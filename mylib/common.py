@@ -1,24 +1,29 @@
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 
 from rest_framework.exceptions import APIException
 
 from dotenv import load_dotenv
+from smtplib import SMTPServerDisconnected
+import logging
 import os
 
 
 load_dotenv(os.path.join(settings.BASE_DIR, '.env'))
 
+logger = logging.getLogger(__name__)
+
 
 def MySendEmail(subject, message, recipients, from_email=None):
     if from_email is None:
         from_email = settings.DEFAULT_FROM_EMAIL
 
-    print("Sending email...\n\n")
-    print(f"From: <{from_email}>")
-    print(f"To: <{recipients}>\n")
-    print(f"Subject: {subject}\n")
-    print(message)
+    logger.info(
+        "Sending email: %s",
+        subject,
+        extra={"from_email": from_email, "recipients": recipients},
+    )
+    logger.debug(message)
 
     email = send_mail(
         subject=subject,
@@ -32,6 +37,73 @@ def MySendEmail(subject, message, recipients, from_email=None):
     return email
 
 
+# Errors after which the connection cannot be used any more
+RECONNECT_ERRORS = (SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def _send_over(connection, email):
+    """
+    Send one email over an open connection, opening it again once if it
+    has dropped. Returns None or the exception the email failed with.
+    """
+    error = None
+    for attempt in range(2):
+        try:
+            # Opened here, send_messages() would close it after each email
+            connection.open()
+            if not connection.send_messages([email]):
+                return ValueError("Email has no recipients.")
+            return None
+        except RECONNECT_ERRORS as e:
+            error = e
+            connection.close()
+        except Exception as e:
+            return e
+
+    return error
+
+
+def MySendBulkEmail(messages, from_email=None, connection=None):
+    """
+    Send many emails over a single connection to the email server, instead
+    of one connection per email as MySendEmail does.
+
+    `messages` are EmailMessage objects or (subject, message, recipients)
+    tuples. Returns, for each message in order, None if it was sent or the
+    exception it failed with. When the connection drops, it is opened again
+    and the message retried once; if that fails too, the remaining messages
+    fail with the same error.
+    """
+    if from_email is None:
+        from_email = settings.DEFAULT_FROM_EMAIL
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+
+    emails = []
+    for message in messages:
+        if not isinstance(message, EmailMessage):
+            subject, body, recipients = message
+            message = EmailMessage(subject, body, from_email, recipients)
+        emails.append(message)
+
+    logger.info("Sending %s emails.", len(emails))
+
+    results = []
+    try:
+        for email in emails:
+            error = _send_over(connection, email)
+            results.append(error)
+            if isinstance(error, RECONNECT_ERRORS):
+                break
+    finally:
+        connection.close()
+
+    # Emails left after the connection was lost
+    results.extend(results[-1:] * (len(emails) - len(results)))
+
+    return results
+
+
 class MyCustomException(APIException):
     status_code = 503
     detail = "Service temporarily unavailable, try again later."
@@ -0,0 +1,68 @@
+from django.db import connection
+
+import atexit
+import threading
+
+
+class PeriodicFlusher(object):
+    """
+    Base class for in-process write buffers.
+    Runs `flush()` from a daemon thread every flush_interval seconds,
+    or sooner when `wakeup()` is called, and once more on shutdown.
+    Subclasses implement `flush()`.
+    """
+
+    thread_name = "periodic-flusher"
+
+    def __init__(self, flush_interval=5):
+        self.flush_interval = flush_interval
+
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def flush(self):
+        raise NotImplementedError("Subclasses must implement flush().")
+
+    def start(self):
+        """
+        Start the background flush thread and register a final
+        flush for interpreter shutdown.
+        """
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=self.thread_name, daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def wakeup(self):
+        self._wakeup.set()
+
+    def close(self, timeout=None):
+        """
+        Stop the background thread and flush whatever is left.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+        return self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            try:
+                self.flush()
+            finally:
+                # The thread owns its own connection, don't leave it open between flushes
+                connection.close()
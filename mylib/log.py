@@ -0,0 +1,81 @@
+from logging.handlers import QueueHandler, QueueListener
+
+import datetime as dt
+import json
+import logging
+import queue
+
+
+# Attributes every LogRecord has, anything else was passed in `extra`
+RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the values passed
+    in `extra` as fields of their own.
+    """
+
+    def format(self, record):
+        data = {
+            "time": dt.datetime.fromtimestamp(
+                record.created, dt.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS:
+                data[key] = value
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(data, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Puts records on an in-process queue, from which a QueueListener thread
+    passes them to `handlers`. Formatting and I/O then happen on that
+    thread instead of the thread that logged.
+
+    For use in LOGGING, with `handlers` as "cfg://handlers.<name>" entries
+    naming handlers configured before this one.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        self._listening = False
+
+        handlers = [handlers[i] for i in range(len(handlers))]
+        if not all(isinstance(handler, logging.Handler) for handler in handlers):
+            # dictConfig configures handlers in name order
+            raise ValueError(
+                "Handlers must be configured first, "
+                "give this handler a name that sorts after theirs."
+            )
+
+        self.listener = QueueListener(
+            self.queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self.listener.start()
+        self._listening = True
+
+    def close(self):
+        # Called by logging.shutdown() at exit, writes what is still queued
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        super().close()
+
+    def prepare(self, record):
+        # The queue never leaves the process, so the record is passed as is
+        # and its message only built by the listener.
+        return record
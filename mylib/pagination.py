@@ -0,0 +1,236 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from itertools import islice
+import json
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a unique, composite ordering such as
+    ("-datetime", "-id").
+
+    Each page is fetched with a WHERE on the (datetime, id) of the row it
+    starts after, instead of an OFFSET, and no COUNT(*) is run, so every page
+    costs the same however deep it is. Back the ordering with an index.
+    """
+
+    ordering = ("-id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = bool(cursor and cursor["reverse"])
+        ordering = self.get_ordering(reverse=self.reverse)
+
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, cursor["position"])
+            )
+
+        # Fetch one extra row to know whether there is a page after this one
+        limit = self.page_size + 1
+        results = list(queryset[:limit])
+        has_more = len(results) > self.page_size
+        self.page = results[:-1] if has_more else results
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        if not reverse:
+            return self.ordering
+
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Rows after `position` in `ordering`, e.g. for ("-datetime", "-id"):
+        datetime < d OR (datetime = d AND id < i)
+        """
+        keyset = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+
+        return keyset
+
+    def get_position(self, instance):
+        return [str(getattr(instance, field.lstrip("-"))) for field in self.ordering]
+
+    def decode_cursor(self, request, model):
+        """
+        The cursor of the request, its position converted to the types of
+        `model`'s ordering fields, or None on the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = cursor["position"]
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError("Cursor does not match the ordering.")
+            cursor["position"] = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+            if None in cursor["position"]:
+                raise ValueError("Cursor position is incomplete.")
+            cursor["reverse"] = bool(cursor.get("reverse", False))
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor
+
+    def encode_cursor(self, position, reverse=False):
+        cursor = json.dumps({"position": position, "reverse": reverse})
+        encoded = urlsafe_b64encode(cursor.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty page reached backwards, restart from the first page
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+
+class StreamPagination(BasePagination):
+    """
+    Page number pagination over any iterable, e.g. a generator of merged
+    results, without counting it: only the rows up to the end of the
+    requested page, plus one, are consumed.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    page_query_param = "page"
+    invalid_page_message = "Invalid page."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        start = (self.page_number - 1) * self.page_size
+        results = list(islice(queryset, start, start + self.page_size + 1))
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        return replace_query_param(
+            self.base_url, self.page_query_param, self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        if self.page_number == 2:
+            return remove_query_param(self.base_url, self.page_query_param)
+
+        return replace_query_param(
+            self.base_url, self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
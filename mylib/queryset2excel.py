@@ -1,65 +1,75 @@
-import copy
 import csv
+import datetime as dt
+import tempfile
 import openpyxl
 from openpyxl.utils import get_column_letter
 
 
+# Bytes of an XLSX export kept in memory before spilling to disk
+SPOOL_SIZE = 10 * 1024 * 1024
+
+
+class Echo(object):
+    """
+    A file-like object whose write() returns the value written,
+    so csv.writer rows can be yielded instead of stored.
+    """
+
+    def write(self, value):
+        return value
+
+
 def generate_model_template(model):
     return [f for f in model._meta.get_fields() if f.name and not f.null and f.get_internal_type()]
 
 
-def exportcsv(headers=[], title="Sheet", filename=None, queryset=[], export_csv=False, request=None):
-    # Get the totals
-    headers_length = len(headers)
-
-    # New workbook
-    wb = openpyxl.Workbook()
-
-    # Create a sheet
-    sheet = wb.active
-    sheet.title = title
-
-    # Set the headers
-    for k, col in enumerate(headers):
-        cell = sheet.cell(row=1, column=k + 1)
-        cell.value = col["name"]
-
-        # Set the size
-        if k + 1 <= headers_length:
-            sheet.column_dimensions[get_column_letter(k + 1)].width = 20
-
-    # Copy the headers to match the number of fields in data
-    fields_length = len([k for k in queryset[0]])
-    myheaders = copy.deepcopy(headers[:fields_length])
-
-    # Writing the data
-    for i, data in enumerate(queryset):
-        # Loop through all the headers
-        for j, col in enumerate(myheaders):
-            dt = data[col["value"]]
-            dat = ",".join(list(dt)) if type(dt) in [list, set] else dt
-            sheet.cell(row=i+2, column=j+1).value = dat
-
-    # The output filename
-    myfilename = "%s.%s" % (filename, "csv" if export_csv else ".xlsx")
-
-    # Temporary filename for openxl
-    temp_filename = "temp_%s" % (myfilename)
-
-    # Temporarily save the file
-    if export_csv:
-        with open(temp_filename, 'w') as f:
-            c = csv.writer(f)
-            for r in sheet.rows:
-                row_data = []
-                for cell in r:
-                    row_data.append(cell.value)
-                print(row_data)
-                c.writerow(row_data)
-    else:
-        wb.save(temp_filename)
-
-    return temp_filename
+def format_value(value):
+    if type(value) in [list, set]:
+        return ",".join(list(value))
+    if isinstance(value, dt.datetime):
+        return value.isoformat()
+    return value
+
+
+def streamcsv(headers=[], queryset=None, chunk_size=2000):
+    """
+    Yield a CSV export of queryset one line at a time.
+    Each header's "value" is a values_list lookup, so rows are read in chunks
+    of chunk_size without building model instances, and memory use does not
+    grow with the number of rows.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow([col["name"] for col in headers])
+
+    rows = queryset.values_list(*[col["value"] for col in headers])
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield writer.writerow([format_value(value) for value in row])
+
+
+def exportxlsx(headers=[], title="Sheet", queryset=None, chunk_size=2000, spool_size=SPOOL_SIZE):
+    """
+    Write an XLSX export of queryset with a write-only workbook, appending
+    rows straight from a chunked values_list iterator.
+    Returns a spooled temporary file positioned at the start; it lives in
+    memory up to spool_size bytes, then on disk, and is deleted when closed.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet(title=title)
+
+    for k in range(len(headers)):
+        sheet.column_dimensions[get_column_letter(k + 1)].width = 20
+
+    sheet.append([col["name"] for col in headers])
+
+    rows = queryset.values_list(*[col["value"] for col in headers])
+    for row in rows.iterator(chunk_size=chunk_size):
+        sheet.append([format_value(value) for value in row])
+
+    output = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    wb.save(output)
+    output.seek(0)
+
+    return output
 
 
 if __name__ == '__main__':